@@ -0,0 +1,64 @@
+"""
+Compression of the Dash responses, every response gzipped at level 6 like
+`flask_compress`, or with the `Compressor` policy of the route.
+
+    python benchmarks/compression.py
+"""
+import json
+import timeit
+
+from flask import Response
+from werkzeug.http import parse_accept_header
+
+import dash_html_components as html
+
+from dash import _compress
+from dash import _serialization
+
+ACCEPT = parse_accept_header('gzip, deflate, br')
+
+
+def layout_json(rows=20000):
+    return _serialization.Serializer().dumps(html.Table([
+        html.Tr([html.Td('r{}c{}'.format(r, c)) for c in range(5)])
+        for r in range(rows)
+    ])).encode('utf-8')
+
+
+def dispatch_json(points):
+    return json.dumps({'response': {'props': {'figure': {'data': [{
+        'x': list(range(points)),
+        'y': [float(x) / 7 for x in range(points)]}]}}}}).encode('utf-8')
+
+
+def fixed_gzip(data, route_class):  # pylint: disable=unused-argument
+    response = Response(data, mimetype='application/json')
+    response.set_data(_compress._gzip(data, 6))
+    return response
+
+
+def make_policy():
+    compressor = _compress.Compressor()
+
+    def policy(data, route_class):
+        return compressor.compress(
+            Response(data, mimetype='application/json'), route_class, ACCEPT)
+    return policy
+
+
+def best_of(func, number=5, repeat=3):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+if __name__ == '__main__':
+    cases = (
+        ('small dispatch', dispatch_json(2), 'dispatch'),
+        ('dispatch 20k', dispatch_json(20000), 'dispatch'),
+        ('layout', layout_json(), 'layout'),
+    )
+    for name, data, route_class in cases:
+        for compress in (fixed_gzip, make_policy()):
+            elapsed = best_of(lambda: compress(data, route_class))
+            size = len(compress(data, route_class).get_data())
+            print('{:<15} {:<10} {:9.3f}ms {:>9} -> {:>8} bytes'.format(
+                name, compress.__name__, elapsed * 1000, len(data), size))
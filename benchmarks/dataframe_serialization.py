@@ -0,0 +1,55 @@
+"""
+Serialization of a DataFrame returned by a callback, converted to records
+first, written by column by the serializer or by the pandas JSON writer
+with `fast_data_frames`. Every case runs in its own process to measure its
+peak memory.
+
+    python benchmarks/dataframe_serialization.py
+"""
+import multiprocessing
+import resource
+import time
+
+import numpy
+import pandas
+
+from dash import _serialization
+
+
+def make_frame(rows=1000000, columns=10):
+    return pandas.DataFrame(
+        numpy.random.RandomState(0).rand(rows, columns),
+        columns=['c{}'.format(c) for c in range(columns)])
+
+
+def to_records(df):
+    return _serialization.Serializer().dumps(df.to_dict('records'))
+
+
+def direct(df):
+    return _serialization.Serializer().dumps(df)
+
+
+def fast(df):
+    return _serialization.Serializer(fast_data_frames=True).dumps(df)
+
+
+def run(func, queue):
+    df = make_frame()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.time()
+    size = len(func(df))
+    elapsed = time.time() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, size, (peak - baseline) / 1024.0))
+
+
+if __name__ == '__main__':
+    for func in (to_records, direct, fast):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run, args=(func, queue))
+        process.start()
+        elapsed, size, memory = queue.get()
+        process.join()
+        print('{:<12} {:6.2f}s {:8.1f}MB output {:8.1f}MB peak'.format(
+            func.__name__, elapsed, size / 1024.0 / 1024, memory))
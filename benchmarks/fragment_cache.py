@@ -0,0 +1,77 @@
+"""
+Serialization of layouts rebuilt from the same data, with and without a
+`FragmentCache`.
+
+    python benchmarks/fragment_cache.py
+"""
+import timeit
+
+import dash_html_components as html
+import dash_core_components as dcc
+
+from dash import _serialization
+
+
+def make_table(rows=2000, columns=10):
+    return html.Table([
+        html.Tr([
+            html.Td('r{}c{}'.format(r, c), className='cell')
+            for c in range(columns)
+        ], id='row-{}'.format(r))
+        for r in range(rows)
+    ])
+
+
+def make_graphs(count=5, points=20000):
+    return html.Div([
+        dcc.Graph(id='graph-{}'.format(i), figure={
+            'data': [{'x': list(range(points)),
+                      'y': [float(x) / (i + 1) for x in range(points)]}]
+        })
+        for i in range(count)
+    ])
+
+
+def median_of(funcs, number=3, rounds=9):
+    """The median time of each function, the rounds interleaved."""
+    times = [[] for _ in funcs]
+    for _ in range(rounds):
+        for func, func_times in zip(funcs, times):
+            func_times.append(timeit.timeit(func, number=number) / number)
+    return [sorted(func_times)[rounds // 2] for func_times in times]
+
+
+def compare(name, make_layout):
+    plain = _serialization.Serializer()
+    cached = _serialization.Serializer(
+        _serialization.FragmentCache(100 * 1024 * 1024))
+
+    layout = make_layout()
+    assert cached.dumps(layout) == plain.dumps(layout)
+
+    def miss():
+        cached.fragment_cache.clear()
+        cached.dumps(make_layout())
+
+    build, uncached, missed, hit = median_of([
+        make_layout,
+        lambda: plain.dumps(make_layout()),
+        miss,
+        lambda: cached.dumps(make_layout())
+    ])
+
+    print(name)
+    print('  build:      {:.1f} ms'.format(build * 1000))
+    print('  build and serialize')
+    print('    uncached:   {:.1f} ms'.format(uncached * 1000))
+    print('    cache miss: {:.1f} ms'.format(missed * 1000))
+    print('    cache hit:  {:.1f} ms'.format(hit * 1000))
+
+
+def main():
+    compare('table', make_table)
+    compare('graphs', make_graphs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Time to load the index page and all its scripts and stylesheets over a
+throttled connection, discovering the resources in the HTML or starting
+them from the preload `Link` header.
+
+The app is served locally, the client adds `RTT` seconds to every request
+and reads the bodies at `BANDWIDTH` bytes per second per connection. The
+preload gains the time to receive the page, the index is padded to
+`padding` bytes to show it on bigger pages.
+
+    python benchmarks/index_preload.py [padding]
+"""
+import re
+import sys
+import threading
+import time
+
+from six.moves.urllib.request import urlopen
+from werkzeug.serving import make_server
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+
+RTT = 0.1
+BANDWIDTH = 1024 * 1024
+CHUNK = 16 * 1024
+
+_re_resource = re.compile(
+    r'<(?:script src|link rel="stylesheet" href)="([^"]+)"')
+_re_link = re.compile(r'<([^>]+)>; rel=preload')
+
+
+def make_app(padding=0):
+    app = dash.Dash(__name__)
+    app.index_string = app.index_string.replace(
+        '{%app_entry%}', '{%app_entry%}<!--' + 'x' * padding + '-->')
+    app.css.config.serve_locally = True
+    app.scripts.config.serve_locally = True
+    app.layout = html.Div([dcc.Input(id='input'), dcc.Graph(id='graph')])
+    return app
+
+
+def fetch(url):
+    time.sleep(RTT)
+    response = urlopen(url)
+    return response
+
+
+def read(response):
+    chunks = []
+    while True:
+        chunk = response.read(CHUNK)
+        if not chunk:
+            break
+        time.sleep(float(len(chunk)) / BANDWIDTH)
+        chunks.append(chunk)
+    response.close()
+    return b''.join(chunks)
+
+
+def load_all(base, urls):
+    threads = [
+        threading.Thread(target=lambda u=u: read(fetch(base + u)))
+        for u in urls
+    ]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def discover(base):
+    html_page = read(fetch(base + '/'))
+    urls = _re_resource.findall(html_page.decode('utf-8'))
+    for t in load_all(base, urls):
+        t.join()
+    return len(urls)
+
+
+def preload(base):
+    response = fetch(base + '/')
+    urls = _re_link.findall(response.headers.get('Link', ''))
+    threads = load_all(base, urls)
+    read(response)
+    for t in threads:
+        t.join()
+    return len(urls)
+
+
+def best_of(func, base, repeat=5):
+    times = []
+    for _ in range(repeat):
+        started = time.time()
+        count = func(base)
+        times.append(time.time() - started)
+    return min(times), count
+
+
+if __name__ == '__main__':
+    padding = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    server = make_server(
+        '127.0.0.1', 0, make_app(padding).server, threaded=True)
+    threading.Thread(target=server.serve_forever).start()
+    base = 'http://127.0.0.1:{}'.format(server.server_port)
+    try:
+        for func in (discover, preload):
+            elapsed, count = best_of(func, base)
+            print('{:<10} {:6.3f}s {} resources'.format(
+                func.__name__, elapsed, count))
+    finally:
+        server.shutdown()
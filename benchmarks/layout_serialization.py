@@ -0,0 +1,64 @@
+"""
+Serialization throughput of a large layout.
+
+Compares the `PlotlyJSONEncoder` used by dash up to 0.37 with the compiled
+component serializers of `dash._serialization`.
+
+    python benchmarks/layout_serialization.py
+"""
+import json
+import timeit
+
+import plotly
+import dash_html_components as html
+import dash_core_components as dcc
+
+from dash import _serialization
+
+
+def make_layout(rows=2000, columns=10):
+    return html.Div([
+        html.Table([
+            html.Tr([
+                html.Td('r{}c{}'.format(r, c), className='cell',
+                        style={'color': 'red'})
+                for c in range(columns)
+            ], id='row-{}'.format(r))
+            for r in range(rows)
+        ]),
+        dcc.Graph(id='graph', figure={
+            'data': [{'x': list(range(1000)), 'y': list(range(1000))}]
+        })
+    ], id='root')
+
+
+def median_of(funcs, number=3, rounds=9):
+    """The median time of each function, the rounds interleaved."""
+    times = [[] for _ in funcs]
+    for _ in range(rounds):
+        for func, func_times in zip(funcs, times):
+            func_times.append(timeit.timeit(func, number=number) / number)
+    return [sorted(func_times)[rounds // 2] for func_times in times]
+
+
+def main():
+    layout = make_layout()
+    assert _serialization.dumps(layout) == json.dumps(
+        layout, cls=plotly.utils.PlotlyJSONEncoder)
+
+    size = len(_serialization.dumps(layout))
+    baseline, compiled = median_of([
+        lambda: json.dumps(layout, cls=plotly.utils.PlotlyJSONEncoder),
+        lambda: _serialization.dumps(layout)
+    ])
+
+    print('layout size: {:.1f} MB'.format(size / 1e6))
+    print('PlotlyJSONEncoder: {:.1f} ms ({:.1f} MB/s)'.format(
+        baseline * 1000, size / baseline / 1e6))
+    print('compiled:          {:.1f} ms ({:.1f} MB/s)'.format(
+        compiled * 1000, size / compiled / 1e6))
+    print('speedup: {:.2f}x'.format(baseline / compiled))
+
+
+if __name__ == '__main__':
+    main()
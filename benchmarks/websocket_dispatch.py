@@ -0,0 +1,116 @@
+"""
+Round trips of small callbacks, like the values of a dragged slider, sent
+one after the other as `_dash-update-component` POSTs on a keep-alive HTTP
+connection or as messages of the WebSocket transport.
+
+    python benchmarks/websocket_dispatch.py [count]
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+from six.moves import http_client
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import dash
+import dash_core_components as dcc
+import dash_html_components as html
+from dash.dependencies import Input, Output
+from dash._websocket import OP_TEXT, encode_frame
+
+# The browsers send the cookies and headers of the page.
+HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/72.0.3626.121 Safari/537.36',
+    'Cookie': 'session=' + 'x' * 200,
+}
+
+
+def make_app():
+    app = dash.Dash(__name__, compress=False)
+    app.layout = html.Div([dcc.Slider(id='slider'), html.Div(id='out')])
+
+    @app.callback(Output('out', 'children'), [Input('slider', 'value')])
+    def update(value):
+        return 'Value {}'.format(value)
+
+    return app
+
+
+def body(value):
+    return {
+        'output': {'id': 'out', 'property': 'children'},
+        'inputs': [{'id': 'slider', 'property': 'value', 'value': value}],
+    }
+
+
+class KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def http_dispatch(port, count):
+    connection = http_client.HTTPConnection('127.0.0.1', port)
+    for i in range(count):
+        connection.request('POST', '/_dash-update-component',
+                           json.dumps(body(i)), HEADERS)
+        connection.getresponse().read()
+    connection.close()
+
+
+def websocket_dispatch(port, count):
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.sendall((
+        'GET /_dash-ws HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+        'Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n'
+        'Sec-WebSocket-Version: 13\r\nCookie: {}\r\n\r\n'.format(
+            HEADERS['Cookie'])).encode('latin-1'))
+    buf = b''
+    while b'\r\n\r\n' not in buf:
+        buf += sock.recv(4096)
+    buf = buf.split(b'\r\n\r\n', 1)[1]
+    for i in range(count):
+        sock.sendall(encode_frame(OP_TEXT, json.dumps(
+            {'id': i, 'request': body(i)}).encode('utf-8'), os.urandom(4)))
+        # The answers are small, their length fits in the second byte.
+        while len(buf) < 2 or len(buf) < 2 + (bytearray(buf)[1] & 0x7F):
+            buf += sock.recv(4096)
+        buf = buf[2 + (bytearray(buf)[1] & 0x7F):]
+    sock.close()
+
+
+def best_of(func, port, count, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.time()
+        func(port, count)
+        times.append(time.time() - started)
+    return min(times)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = make_app()
+    http_server = make_server('127.0.0.1', 0, app.server, threaded=True,
+                              request_handler=KeepAliveHandler)
+    threading.Thread(target=http_server.serve_forever).start()
+    ws_server = app.start_websocket_server(port=0)
+    try:
+        for func, port in ((http_dispatch, http_server.server_port),
+                           (websocket_dispatch, ws_server.port)):
+            elapsed = best_of(func, port, count)
+            print('{:<20} {:7.3f}s {:7.3f}ms per callback'.format(
+                func.__name__, elapsed, elapsed * 1000 / count))
+    finally:
+        http_server.shutdown()
+        ws_server.stop()
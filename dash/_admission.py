@@ -0,0 +1,126 @@
+import collections
+import contextlib
+import math
+import threading
+import time
+
+from . import exceptions
+
+
+# pylint: disable=too-many-instance-attributes
+class AdmissionController(object):
+    """
+    Bound the callbacks running at once, globally and per callback.
+
+    A request over the limits waits in a bounded queue until `queue_timeout`
+    seconds, then it's rejected with `DispatchOverloaded`. A callback can't
+    run or queue more than `max_per_callback` requests, so the slow
+    callbacks can't hold all the slots and the queue of the others.
+    """
+
+    def __init__(self, max_in_flight=None, max_per_callback=None,
+                 max_queue=0, queue_timeout=1.0):
+        self.max_in_flight = max_in_flight
+        self.max_per_callback = max_per_callback
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._queued = 0
+        self._callback_in_flight = collections.Counter()
+        self._callback_queued = collections.Counter()
+        self._condition = threading.Condition()
+
+        self.admitted = 0
+        self.rejected = collections.Counter()
+        self.queue_time = 0.0
+        self.max_queue_time = 0.0
+
+    @property
+    def retry_after(self):
+        return max(1, int(math.ceil(self.queue_timeout)))
+
+    def _has_slot(self, callback_id):
+        return (
+            (self.max_in_flight is None or
+             self._in_flight < self.max_in_flight) and
+            (self.max_per_callback is None or
+             self._callback_in_flight[callback_id] < self.max_per_callback)
+        )
+
+    def _can_queue(self, callback_id):
+        return (
+            self._queued < self.max_queue and
+            (self.max_per_callback is None or
+             self._callback_queued[callback_id] < self.max_per_callback)
+        )
+
+    def _reject(self, callback_id):
+        self.rejected[callback_id] += 1
+        raise exceptions.DispatchOverloaded(
+            'Too many requests for the callback `{}`.'.format(callback_id),
+            self.retry_after)
+
+    @contextlib.contextmanager
+    def admit(self, callback_id, token=None):
+        """
+        Hold a slot of `callback_id` while the callback runs. A queued
+        request leaves the queue with `CallbackCancelled` when its
+        cancellation `token` is cancelled.
+        """
+        with self._condition:
+            if not self._has_slot(callback_id):
+                if not self._can_queue(callback_id):
+                    self._reject(callback_id)
+                self._wait(callback_id, token)
+
+            self._in_flight += 1
+            self._callback_in_flight[callback_id] += 1
+            self.admitted += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._callback_in_flight[callback_id] -= 1
+                self._condition.notify_all()
+
+    def _notify(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def _wait(self, callback_id, token):
+        self._queued += 1
+        self._callback_queued[callback_id] += 1
+        started = time.time()
+        deadline = started + self.queue_timeout
+        if token is not None:
+            token.add_callback(self._notify)
+        try:
+            while not self._has_slot(callback_id):
+                if token is not None:
+                    token.raise_if_cancelled()
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._reject(callback_id)
+                self._condition.wait(remaining)
+        finally:
+            if token is not None:
+                token.remove_callback(self._notify)
+            self._queued -= 1
+            self._callback_queued[callback_id] -= 1
+            waited = time.time() - started
+            self.queue_time += waited
+            self.max_queue_time = max(self.max_queue_time, waited)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected),
+                'queue_time': self.queue_time,
+                'max_queue_time': self.max_queue_time,
+            }
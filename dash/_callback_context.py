@@ -2,6 +2,7 @@ import functools
 import flask
 
 from . import exceptions
+from ._supersede import CancellationToken
 
 
 def has_context(func):
@@ -33,3 +34,15 @@ class CallbackContext:
     @has_context
     def triggered(self):
         return getattr(flask.g, 'triggered_inputs', [])
+
+    @property
+    @has_context
+    def cancellation(self):
+        """
+        Cancelled when a newer request for the same output arrives, long
+        callbacks can check `cancelled` or call `raise_if_cancelled()`.
+        """
+        token = getattr(flask.g, 'cancellation_token', None)
+        if token is None:
+            token = flask.g.cancellation_token = CancellationToken()
+        return token
@@ -0,0 +1,231 @@
+import gzip
+import hashlib
+import io
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from werkzeug.exceptions import (
+    BadRequest, RequestEntityTooLarge, UnsupportedMediaType)
+
+from ._utils import LRUCache
+
+_mimetypes = frozenset((
+    'application/javascript',
+    'application/json',
+    'text/css',
+    'text/html',
+    'text/javascript',
+    'text/xml',
+))
+
+# The compression level of each route class, by encoding. The callbacks
+# responses are compressed quickly, the component suites are static and
+# compressed once.
+_default_levels = {
+    'layout': {'br': 5, 'gzip': 6},
+    'dispatch': {'br': 1, 'gzip': 1},
+    'suites': {'br': 11, 'gzip': 9},
+    'default': {'br': 4, 'gzip': 6},
+}
+
+
+def _gzip(data, level):
+    buf = io.BytesIO()
+    # No timestamp, the same data is always compressed to the same bytes.
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=level,
+                       mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def _brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+_compressors = {'br': _brotli, 'gzip': _gzip}
+
+
+class Compressor(object):
+    """
+    Compression policy of the Dash responses.
+
+    The responses of less than `min_size` bytes are sent as is, the others
+    are compressed with brotli if it's installed and accepted, else gzip,
+    at the level of their route class. `levels` maps the route classes to
+    a level or a `{encoding: level}` dict.
+
+    Except for the callbacks, the compressed bytes are kept in a LRU of
+    `cache_size` bytes, keyed by the ETag of the response or the sha1 of
+    its data, the same layout or file is only compressed once.
+
+    The files sent by the `wsgi.file_wrapper` of the server, the direct
+    passthrough responses, are left to it and sent as is.
+    """
+
+    def __init__(self, min_size=1024, levels=None, cache_size=32 * 1024 * 1024,
+                 uncached_classes=('dispatch',)):
+        self.min_size = min_size
+        self.levels = {k: dict(v) for k, v in _default_levels.items()}
+        for route_class, level in (levels or {}).items():
+            if not isinstance(level, dict):
+                level = {'br': level, 'gzip': level}
+            self.levels.setdefault(
+                route_class, dict(_default_levels['default'])).update(level)
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+        self.uncached_classes = uncached_classes
+        self._cache = LRUCache(cache_size)
+
+    def _compressible(self, response):
+        return (
+            response.status_code == 200 and
+            response.mimetype.lower() in _mimetypes and
+            'Content-Encoding' not in response.headers and
+            not response.is_streamed and
+            not response.direct_passthrough and
+            (response.content_length is None or
+             response.content_length >= self.min_size)
+        )
+
+    def compress(self, response, route_class, accept_encodings):
+        """
+        Compress `response` in place with the best of `accept_encodings`,
+        the `Accept-Encoding` of the request.
+        """
+        if not self._compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        encoding = accept_encodings.best_match(self.encodings)
+        if encoding is None:
+            return response
+
+        etag, _ = response.get_etag()
+        levels = self.levels.get(route_class, self.levels['default'])
+        level = levels[encoding]
+        cached = route_class not in self.uncached_classes
+
+        key = None
+        compressed = None
+        if cached and etag:
+            key = '{}:{}:{}'.format(etag, encoding, level)
+            compressed = self._cache.get(key)
+
+        if compressed is None:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+
+            if cached and key is None:
+                key = '{}:{}:{}'.format(
+                    hashlib.sha1(data).hexdigest(), encoding, level)
+                compressed = self._cache.get(key)
+            if compressed is None:
+                compressed = _compressors[encoding](data, level)
+                if cached:
+                    self._cache.put(key, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # Not the same bytes as the uncompressed response.
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self):
+        return self._cache.stats()
+
+
+def _zlib_ended(decompressor):
+    """Whether `decompressor` reached the end of the compressed stream."""
+    eof = getattr(decompressor, 'eof', None)
+    if eof is not None:
+        return eof
+    # No `eof` in Python 2, the bytes after the end of the stream are kept
+    # in `unused_data` while they are decoded in a truncated stream.
+    probe = decompressor.copy()
+    try:
+        probe.decompress(b'\x00')
+    except zlib.error:
+        return False
+    return probe.unused_data == b'\x00'
+
+
+def _zlib_chunks(chunks, wbits, limit):
+    decompressor = zlib.decompressobj(wbits)
+    for chunk in chunks:
+        while chunk:
+            yield decompressor.decompress(chunk, limit)
+            chunk = decompressor.unconsumed_tail
+    ended = _zlib_ended(decompressor)
+    yield decompressor.flush()
+    if not ended:
+        raise zlib.error('Truncated data.')
+
+
+def _gzip_chunks(chunks, limit):
+    return _zlib_chunks(chunks, 16 + zlib.MAX_WBITS, limit)
+
+
+def _deflate_chunks(chunks, limit):
+    return _zlib_chunks(chunks, zlib.MAX_WBITS, limit)
+
+
+def _brotli_chunks(chunks, limit):
+    decompressor = brotli.Decompressor()
+    bounded = hasattr(decompressor, 'can_accept_more_data')
+    for chunk in chunks:
+        if not bounded:
+            # Older brotli can't bound the output of a step, it's only
+            # checked after.
+            yield decompressor.process(chunk)
+            continue
+        yield decompressor.process(chunk, output_buffer_limit=limit)
+        while not decompressor.can_accept_more_data():
+            yield decompressor.process(b'', output_buffer_limit=limit)
+    if not decompressor.is_finished():
+        raise brotli.error('Truncated data.')
+
+
+_decompressors = {'gzip': _gzip_chunks, 'deflate': _deflate_chunks}
+if brotli is not None:
+    _decompressors['br'] = _brotli_chunks
+
+
+def request_encodings():
+    """The `Content-Encoding` of the request bodies that can be decoded."""
+    return sorted(_decompressors)
+
+
+def decompress_body(stream, encoding, max_size, chunk_size=16 * 1024):
+    """
+    Decode a request body compressed with `encoding` while reading it from
+    `stream` by chunks, the compressed body isn't buffered.
+
+    :raises UnsupportedMediaType: for an unknown encoding.
+    :raises RequestEntityTooLarge: if the decoded body is over `max_size`.
+    :raises BadRequest: if the body can't be decoded.
+    """
+    decompress = _decompressors.get(encoding)
+    if decompress is None:
+        raise UnsupportedMediaType(
+            'Unsupported request Content-Encoding `{}`.'.format(encoding))
+
+    errors = (zlib.error, brotli.error) if brotli is not None else zlib.error
+    decoded = []
+    size = 0
+    try:
+        for data in decompress(
+                iter(lambda: stream.read(chunk_size), b''), max_size + 1):
+            size += len(data)
+            if size > max_size:
+                raise RequestEntityTooLarge(
+                    'The decoded request body is over {} bytes.'.format(
+                        max_size))
+            decoded.append(data)
+    except errors as e:
+        raise BadRequest('Invalid {} request body: {}'.format(encoding, e))
+    return b''.join(decoded)
@@ -19,7 +19,32 @@ def env_configs():
         'DASH_SUPPRESS_CALLBACK_EXCEPTIONS',
         'DASH_ASSETS_EXTERNAL_PATH',
         'DASH_INCLUDE_ASSETS_FILES',
+        'DASH_COMPRESS_MIN_SIZE',
+        'DASH_COMPRESS_CACHE_SIZE',
+        'DASH_MAX_REQUEST_BODY_SIZE',
+        'DASH_PRELOAD_HEADERS',
+        'DASH_EARLY_HINTS',
         'DASH_COMPONENTS_CACHE_MAX_AGE',
+        'DASH_COMPONENTS_SENDFILE',
+        'DASH_COMPONENTS_ACCEL_REDIRECT_PREFIX',
+        'DASH_FRAGMENT_CACHE_SIZE',
+        'DASH_PRERENDER_CALLBACKS',
+        'DASH_PRERENDER_WORKERS',
+        'DASH_SINGLE_FLIGHT_DIR',
+        'DASH_MAX_DISPATCHES',
+        'DASH_MAX_DISPATCHES_PER_CALLBACK',
+        'DASH_DISPATCH_QUEUE_SIZE',
+        'DASH_DISPATCH_QUEUE_TIMEOUT',
+        'DASH_CALLBACK_TIMEOUT_WORKERS',
+        'DASH_VALUE_STORE_SIZE',
+        'DASH_VALUE_STORE_DIR',
+        'DASH_VALUE_STORE_DISK_SIZE',
+        'DASH_VALUE_HASHES_SIZE',
+        'DASH_BINARY_ARRAYS',
+        'DASH_FAST_DATA_FRAMES',
+        'DASH_ENABLE_PUSH',
+        'DASH_PUSH_QUEUE_SIZE',
+        'DASH_WEBSOCKET_URL',
         'DASH_INCLUDE_ASSETS_FILES',
         'DASH_SERVE_DEV_BUNDLES',
         'DASH_DEBUG',
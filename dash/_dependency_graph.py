@@ -0,0 +1,170 @@
+import collections
+
+from . import exceptions
+
+
+class DependencyGraph(object):
+    """
+    Callbacks dependency graph.
+
+    The nodes are the component properties (`id.property`), each callback
+    is an edge from its inputs to its outputs. The states are not edges, a
+    state change doesn't fire the callbacks.
+    """
+
+    def __init__(self):
+        # callback_id -> (outputs, inputs)
+        self._callbacks = collections.OrderedDict()
+        # prop_id -> callbacks with that prop as input
+        self._observers = collections.defaultdict(list)
+        # prop_id -> callback with that prop as output
+        self._controllers = {}
+        self._layers = None
+        self._depth = None
+
+    def __contains__(self, callback_id):
+        return callback_id in self._callbacks
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def add_callback(self, callback_id, outputs, inputs):
+        """
+        Add the callback updating the `outputs` prop ids from the `inputs`.
+
+        :raises CircularDependencyException: if an output reaches back one
+            of the inputs, the graph is left unchanged.
+        """
+        outputs = list(outputs)
+        inputs = list(inputs)
+
+        cycle = self._find_path(outputs, set(inputs))
+        if cycle is not None:
+            raise exceptions.CircularDependencyException('''
+                The callback for `{}` has a circular dependency,
+                its output reaches back to its input:
+                {}
+            '''.format(callback_id, ' -> '.join(cycle)).replace('    ', ''))
+
+        self._callbacks[callback_id] = (outputs, inputs)
+        for prop_id in inputs:
+            self._observers[prop_id].append(callback_id)
+        for prop_id in outputs:
+            self._controllers[prop_id] = callback_id
+        self._layers = None
+        self._depth = None
+
+    def _find_path(self, sources, targets):
+        """Shortest path of prop ids from one of `sources` to `targets`."""
+        parents = dict.fromkeys(sources)
+        queue = collections.deque(sources)
+        while queue:
+            prop_id = queue.popleft()
+            if prop_id in targets:
+                path = [prop_id]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            for callback_id in self._observers.get(prop_id, ()):
+                for output in self._callbacks[callback_id][0]:
+                    if output not in parents:
+                        parents[output] = prop_id
+                        queue.append(output)
+        return None
+
+    def outputs(self, callback_id):
+        return self._callbacks[callback_id][0]
+
+    def inputs(self, callback_id):
+        return self._callbacks[callback_id][1]
+
+    def observers(self, prop_id):
+        """The callbacks fired by a change of `prop_id`."""
+        return list(self._observers.get(prop_id, ()))
+
+    def controller(self, prop_id):
+        """The callback updating `prop_id`, if any."""
+        return self._controllers.get(prop_id)
+
+    @property
+    def layers(self):
+        """
+        The callbacks in topological layers, every callback only has inputs
+        updated by callbacks of the previous layers, so the callbacks of the
+        same layer don't depend on each other.
+        """
+        if self._layers is None:
+            self._compute_layers()
+        return self._layers
+
+    def layer(self, callback_id):
+        """The index of the layer of `callback_id`."""
+        if self._depth is None:
+            self._compute_layers()
+        return self._depth[callback_id]
+
+    def _compute_layers(self):
+        depth = {}
+        for callback_id in self._topological_order(self._callbacks):
+            controllers = [
+                self._controllers[prop_id]
+                for prop_id in self._callbacks[callback_id][1]
+                if prop_id in self._controllers
+            ]
+            depth[callback_id] = 1 + max(
+                [depth[c] for c in controllers] or [-1])
+
+        layers = [[] for _ in range(1 + max(depth.values() or [-1]))]
+        for callback_id in self._callbacks:
+            layers[depth[callback_id]].append(callback_id)
+        self._layers = layers
+        self._depth = depth
+
+    def _topological_order(self, callback_ids):
+        """Kahn's algorithm restricted to `callback_ids`."""
+        callback_ids = [c for c in self._callbacks if c in callback_ids]
+        selected = set(callback_ids)
+        pending = {}
+        for callback_id in callback_ids:
+            pending[callback_id] = len(set(
+                self._controllers[prop_id]
+                for prop_id in self._callbacks[callback_id][1]
+                if self._controllers.get(prop_id) in selected
+            ))
+
+        queue = collections.deque(c for c in callback_ids if not pending[c])
+        order = []
+        while queue:
+            callback_id = queue.popleft()
+            order.append(callback_id)
+            for observer in self._downstream_callbacks(callback_id):
+                if observer in selected:
+                    pending[observer] -= 1
+                    if not pending[observer]:
+                        queue.append(observer)
+        return order
+
+    def _downstream_callbacks(self, callback_id):
+        observers = []
+        for prop_id in self._callbacks[callback_id][0]:
+            for observer in self._observers.get(prop_id, ()):
+                if observer not in observers:
+                    observers.append(observer)
+        return observers
+
+    def downstream(self, prop_ids):
+        """
+        The callbacks a change of `prop_ids` can reach, directly or through
+        the outputs of other callbacks, in an order where every callback
+        comes after the callbacks updating its inputs.
+        """
+        reached = set()
+        queue = collections.deque(
+            c for prop_id in prop_ids
+            for c in self._observers.get(prop_id, ()))
+        while queue:
+            callback_id = queue.popleft()
+            if callback_id not in reached:
+                reached.add(callback_id)
+                queue.extend(self._downstream_callbacks(callback_id))
+        return self._topological_order(reached)
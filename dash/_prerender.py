@@ -0,0 +1,73 @@
+import copy
+import hashlib
+import json
+
+from ._utils import LRUCache
+from .development.base_component import Component
+
+# The cookie of the renderer that loaded a prerendered layout.
+COOKIE = '_dash_prerendered'
+
+
+def components_by_id(layout):
+    """The components of the `layout` tree that have an id."""
+    components = {}
+    if not isinstance(layout, Component):
+        return components
+
+    for component in [layout] + list(layout.traverse()):
+        component_id = getattr(component, 'id', None)
+        if component_id is not None:
+            components[component_id] = component
+    return components
+
+
+def apply_updates(value, updates):
+    """
+    Copy of the layout `value` with the props of `updates`,
+    `{component_id: {prop: value}}`, set.
+
+    Only the components on the path to an updated component are copied,
+    the rest of the tree is shared with `value`.
+    """
+    if isinstance(value, Component):
+        children = getattr(value, 'children', None)
+        new_children = apply_updates(children, updates)
+        props = updates.get(getattr(value, 'id', None))
+        if new_children is children and not props:
+            return value
+
+        value = copy.copy(value)
+        if new_children is not children:
+            value.children = new_children
+        for prop, prop_value in (props or {}).items():
+            setattr(value, prop, prop_value)
+        return value
+
+    if isinstance(value, (list, tuple)):
+        new_value = [apply_updates(v, updates) for v in value]
+        if all(a is b for a, b in zip(new_value, value)):
+            return value
+        return tuple(new_value) if isinstance(value, tuple) else new_value
+
+    return value
+
+
+class PrerenderedResponses(LRUCache):
+    """
+    The responses of the prerendered callbacks, for the initial requests of
+    the renderer that loaded the layout so the callbacks don't run twice.
+    Each response is used once.
+    """
+
+    def __init__(self, max_size=32 * 1024 * 1024):
+        super(PrerenderedResponses, self).__init__(max_size)
+
+    @staticmethod
+    def key(client, callback_id, values):
+        """
+        The key of a response for the `client` cookie, `values` are the
+        JSON values of the inputs and state of the callback by prop id.
+        """
+        return (client, callback_id, hashlib.sha1(
+            json.dumps(values, sort_keys=True).encode('utf-8')).digest())
@@ -0,0 +1,104 @@
+import collections
+import json
+import threading
+
+
+class Subscription(object):
+    """
+    The pending updates of a client, the latest value of every prop.
+
+    A new value of a prop not sent yet replaces the previous one, a slow
+    client only gets the last values. At most `max_size` props are pending,
+    the oldest are dropped.
+    """
+
+    def __init__(self, prop_ids=None, max_size=1000):
+        self.prop_ids = prop_ids
+        self.max_size = max_size
+        self.dropped = 0
+        self._pending = collections.OrderedDict()
+        self._condition = threading.Condition()
+
+    def put(self, prop_id, value_json):
+        if self.prop_ids is not None and prop_id not in self.prop_ids:
+            return
+        with self._condition:
+            if self._pending.pop(prop_id, None) is not None:
+                self.dropped += 1
+            self._pending[prop_id] = value_json
+            while len(self._pending) > self.max_size:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._condition.notify()
+
+    def get(self, timeout):
+        """
+        The pending `(prop_id, value_json)` updates, waits up to `timeout`
+        seconds for one.
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            updates = list(self._pending.items())
+            self._pending.clear()
+        return updates
+
+
+class PushChannel(object):
+    """
+    Send the values pushed by the app to the subscribed clients.
+
+    The channel lives in the memory of a process, a value pushed in a
+    process only reaches the clients connected to that process. With
+    several workers, every process must push the values.
+    """
+
+    def __init__(self, max_queue=1000):
+        self.max_queue = max_queue
+        self.published = 0
+        self._dropped = 0
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, prop_ids=None):
+        subscription = Subscription(prop_ids, self.max_queue)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            self._dropped += subscription.dropped
+
+    def publish(self, prop_id, value_json):
+        """Queue the JSON of a prop value for all the subscriptions."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            self.published += 1
+        for subscription in subscriptions:
+            subscription.put(prop_id, value_json)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscriptions),
+                'published': self.published,
+                'dropped': self._dropped + sum(
+                    s.dropped for s in self._subscriptions),
+            }
+
+
+def updates_json(updates):
+    """
+    The `multi` response of the updates, from the JSON of their values so
+    a pushed value is only serialized once for all the clients.
+    """
+    props = collections.OrderedDict()
+    for prop_id, value_json in updates:
+        component_id, component_property = prop_id.split('.', 1)
+        props.setdefault(component_id, []).append(
+            '{}: {}'.format(json.dumps(component_property), value_json))
+    return '{{"multi": true, "response": {{{}}}}}'.format(', '.join(
+        '{}: {{{}}}'.format(json.dumps(component_id), ', '.join(values))
+        for component_id, values in props.items()))
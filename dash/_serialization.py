@@ -0,0 +1,448 @@
+import base64
+import binascii
+import hashlib
+import json
+import math
+import os
+import pickle
+import re
+import sys
+
+try:
+    from json.encoder import c_make_encoder as _c_make_encoder
+except ImportError:
+    _c_make_encoder = None
+
+import plotly
+import six
+
+from . import exceptions
+from ._utils import LRUCache
+from .development.base_component import (
+    Component, ComponentMeta, _get_serializer)
+
+
+_encode_string = json.encoder.encode_basestring_ascii
+_string_types = frozenset(six.string_types + (type(None),))
+_component_to_plotly_json = six.get_unbound_function(Component.to_plotly_json)
+
+# The values written by the encoder, after `[`, `, ` or `: `.
+_non_finite_values = ('NaN', 'Infinity', '-Infinity')
+_non_finite_tokens = tuple(
+    prefix + value for prefix in ('[', ' ') for value in _non_finite_values)
+
+
+def _has_non_finite(encoded):
+    """Whether the JSON has `NaN` values, the typed arrays base64 may."""
+    if 'NaN' not in encoded and 'Infinity' not in encoded:
+        return False
+    return (encoded.startswith(_non_finite_values) or
+            any(token in encoded for token in _non_finite_tokens))
+
+
+def _has_custom_json(component):
+    return (six.get_unbound_function(type(component).to_plotly_json) is not
+            _component_to_plotly_json)
+
+
+def _column_cells(column):
+    """
+    The JSON of the values of a DataFrame column, None if they aren't
+    numbers, booleans or strings. The integers and booleans are written by
+    pandas, the floats by `repr` as pandas would round them.
+    """
+    dtype = column.dtype
+    if isinstance(dtype, sys.modules['numpy'].dtype):
+        if dtype.kind in 'bi':
+            return column.to_json(orient='values')[1:-1].split(',')
+        if dtype.kind in 'uf':
+            return json.dumps(column.tolist())[1:-1].split(', ')
+
+    # The strings, of object, string or categorical columns.
+    values = column.tolist()
+    if not set(map(type, values)).issubset(_string_types):
+        return None
+    return [u'null' if v is None else _encode_string(v) for v in values]
+
+
+def _data_frame_records(df, fast):
+    """
+    The JSON of the records of `df` written by column, or the records if
+    one of its columns can't be. With `fast`, the JSON is written by pandas,
+    the floats then have 15 significant digits.
+    """
+    if not df.columns.is_unique:
+        raise exceptions.InvalidCallbackReturnValue(
+            'The DataFrame columns {} are not unique, it can\'t be '
+            'written as records.'.format(
+                list(df.columns[df.columns.duplicated()])))
+    if not fast:
+        return _columns_records(df)
+
+    naive = [k for k, dtype in df.dtypes.items()
+             if dtype.kind == 'M' and getattr(dtype, 'tz', None) is None]
+    if naive:
+        # The pandas ISO dates of the naive datetimes end with a `Z`.
+        numpy = sys.modules['numpy']
+        df = df.copy(deep=False)
+        for k in naive:
+            values = df[k].values
+            dates = numpy.datetime_as_string(values, unit='ms').astype(object)
+            dates[numpy.isnat(values)] = None
+            df[k] = dates
+    try:
+        # NaN and NaT are null.
+        return df.to_json(orient='records', date_format='iso',
+                          double_precision=15)
+    except ValueError as e:
+        raise exceptions.InvalidCallbackReturnValue(
+            'The DataFrame can\'t be written as records: {}'.format(e))
+
+
+_records_chunk = 10000
+
+
+def _columns_records(df):
+    """
+    The JSON of the records of `df`, the same as the one of
+    `df.to_dict('records')` without a dict per row.
+    """
+    if df.empty or not all(
+            isinstance(k, six.string_types) for k in df.columns):
+        return df.to_dict('records')
+
+    row = u'{{{}}}'.format(u', '.join(
+        u'{}: %s'.format(_encode_string(k).replace('%', '%%'))
+        for k in df.columns))
+    chunks = []
+    # By chunk of rows, the JSON of the cells is a string per value.
+    for start in range(0, len(df), _records_chunk):
+        columns = []
+        for _, column in df.iloc[start:start + _records_chunk].items():
+            cells = _column_cells(column)
+            if cells is None:
+                return df.to_dict('records')
+            columns.append(cells)
+        chunks.append(u', '.join([row % cells for cells in zip(*columns)]))
+    return u'[{}]'.format(u', '.join(chunks))
+
+
+def _arrow_table_records(table, fast):
+    return _data_frame_records(table.to_pandas(), fast)
+
+
+# table type -> function returning its records or their JSON
+_table_writers = {}
+
+
+def _register_table_types():
+    """Add the table types of the imported pandas and pyarrow modules."""
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and hasattr(pandas, 'DataFrame'):
+        _table_writers.setdefault(pandas.DataFrame, _data_frame_records)
+
+    pyarrow = sys.modules.get('pyarrow')
+    if pyarrow is not None and hasattr(pyarrow, 'Table'):
+        _table_writers.setdefault(pyarrow.Table, _arrow_table_records)
+        _table_writers.setdefault(pyarrow.RecordBatch, _arrow_table_records)
+
+
+# pylint: disable=protected-access
+def _make_encoder(default):
+    """
+    Build a reusable encoder, `default` converting the values it can't write.
+
+    Equivalent to `JSONEncoder.iterencode` without the per call setup, the
+    `NaN` and `Infinity` values are coerced once on the whole output.
+    """
+    if _c_make_encoder is not None:
+        return _c_make_encoder(
+            None, default, _encode_string, None,
+            ': ', ', ', False, False, True)
+
+    def floatstr(o):
+        if math.isnan(o):
+            return 'NaN'
+        if math.isinf(o):
+            return 'Infinity' if o > 0 else '-Infinity'
+        return float.__repr__(o)
+
+    return json.encoder._make_iterencode(
+        None, default, _encode_string, None, floatstr,
+        ': ', ', ', False, False, True)
+
+
+class DashJSONEncoder(plotly.utils.PlotlyJSONEncoder):
+    def default(self, obj):  # pylint: disable=method-hidden
+        if isinstance(obj, Component):
+            return obj.to_plotly_json()
+        return super(DashJSONEncoder, self).default(obj)
+
+
+# numpy dtype -> plotly.js typed array dtype
+_binary_dtypes = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+_int32_range = (-2 ** 31, 2 ** 31 - 1)
+
+
+def encode_binary_array(obj):
+    """
+    The plotly.js typed array of a numeric numpy array, its bytes in base64
+    `bdata` with its `dtype` and the `shape` of multi dimensional arrays.
+    `None` for the arrays without a typed array equivalent.
+    """
+    numpy = sys.modules.get('numpy')
+    if numpy is None or not isinstance(obj, numpy.ndarray):
+        return None
+
+    name = obj.dtype.name
+    if name == 'int64' and obj.size and (
+            _int32_range[0] <= obj.min() and obj.max() <= _int32_range[1]):
+        # No 64 bits typed arrays in the browsers.
+        name = 'int32'
+    dtype = _binary_dtypes.get(name)
+    if dtype is None:
+        return None
+
+    data = numpy.ascontiguousarray(
+        obj, dtype=numpy.dtype(name).newbyteorder('<'))
+    encoded = {
+        'dtype': dtype,
+        'bdata': base64.b64encode(data.tobytes()).decode('ascii'),
+    }
+    if obj.ndim > 1:
+        encoded['shape'] = ', '.join(str(d) for d in obj.shape)
+    return encoded
+
+
+class BinaryArrayEncoder(DashJSONEncoder):
+    """
+    Encode the numeric numpy arrays as typed arrays instead of lists, only
+    decoded by plotly.js 2.28 and later in the traces of the figures.
+    """
+
+    def default(self, obj):  # pylint: disable=method-hidden
+        encoded = encode_binary_array(obj)
+        if encoded is not None:
+            return encoded
+        return super(BinaryArrayEncoder, self).default(obj)
+
+
+class Figure(object):  # pylint: disable=too-few-public-methods
+    """
+    A `figure` prop value in a callback response, its traces are written
+    with typed arrays when the serializer has `binary_arrays`.
+    """
+    __slots__ = ('figure',)
+
+    def __init__(self, figure):
+        self.figure = figure
+
+
+class FragmentCache(LRUCache):
+    """
+    Bounded LRU cache of the JSON of the components holding large values.
+
+    Only the components without child components and holding a long list,
+    an array or an object, the figures and the data of the tables, are
+    cached: a subtree of small components is cheaper to encode than to hash.
+    The fragments are keyed by a digest of the pickled props, so a component
+    rebuilt with the same props reuses the JSON of the previous one.
+    `max_size` is the total length of the cached fragments, the fragments
+    shorter than `min_fragment_size` are not cached.
+    """
+
+    def __init__(self, max_size, min_fragment_size=4096):
+        super(FragmentCache, self).__init__(max_size)
+        self.min_fragment_size = min_fragment_size
+
+
+_scalar_types = six.string_types + six.integer_types + (float, type(None))
+# The lists at least this long are worth caching the JSON of.
+_large_length = 100
+
+
+def _is_large(value, depth=3):
+    """
+    Whether `value` holds a long list or an object, the small lists and
+    dicts are searched `depth` levels deep.
+    """
+    value_type = type(value)
+    if value_type in _scalar_types:
+        return False
+    if value_type is dict:
+        values = value.values()
+    elif value_type is list or value_type is tuple:
+        if len(value) >= _large_length:
+            return True
+        values = value
+    else:
+        return not isinstance(value_type, ComponentMeta)
+    return depth > 0 and any(_is_large(v, depth - 1) for v in values)
+
+
+def _fragment_key(plotly_json, generation):
+    """
+    The key of the JSON of a component, None if it's not worth caching or
+    can't be pickled. `generation` is the one of the class serializer.
+    """
+    props = plotly_json['props']
+    large = False
+    for v in props.values():
+        v_type = type(v)
+        if v_type in _scalar_types:
+            continue
+        if isinstance(v_type, ComponentMeta) or (
+                (v_type is list or v_type is tuple) and
+                any(isinstance(type(x), ComponentMeta) for x in v)):
+            return None
+        large = large or _is_large(v)
+    if not large:
+        return None
+
+    try:
+        pickled = pickle.dumps(
+            (generation, plotly_json['type'], plotly_json['namespace'],
+             list(props.items())),
+            pickle.HIGHEST_PROTOCOL)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return hashlib.sha1(pickled).digest()
+
+
+class Serializer(object):  # pylint: disable=too-few-public-methods
+    """
+    Serialize component trees to JSON.
+
+    A tree goes through a single pass of a C encoder, the components
+    converted by their class compiled `to_plotly_json`. The JSON of the
+    values it can't write is spliced in its output.
+    With a `FragmentCache`, the JSON of the unchanged large components is
+    reused.
+    With `binary_arrays`, the numeric numpy arrays in the `data` of the
+    `figure` props are typed arrays.
+    The pandas DataFrames and pyarrow tables are written as records, by
+    column, and by the pandas JSON writer with `fast_data_frames`.
+    """
+    def __init__(self, fragment_cache=None, binary_arrays=False,
+                 fast_data_frames=False):
+        self.fragment_cache = fragment_cache
+        self.binary_arrays = binary_arrays
+        self.fast_data_frames = fast_data_frames
+        self.encoder = DashJSONEncoder()
+        self.figure_encoder = _make_encoder(
+            BinaryArrayEncoder().default) if binary_arrays else None
+
+    def dumps(self, obj):
+        if len(_table_writers) < 3:
+            _register_table_types()
+
+        encoded = _Encoding(self).encode(obj)
+        if _has_non_finite(encoded):
+            # Same coercion as the `PlotlyJSONEncoder`.
+            return json.dumps(json.loads(
+                encoded, parse_constant=self.encoder.coerce_to_strict))
+        return encoded
+
+
+class _Encoding(object):
+    """
+    A serialization by a `Serializer`. The values written apart are
+    replaced by a placeholder string in the output of the C encoder, the
+    placeholders are substituted by their JSON at the end.
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self._fragments = []
+        # A random prefix that the strings of the values won't have.
+        self._placeholder = u'\x00{}:'.format(
+            binascii.hexlify(os.urandom(8)).decode('ascii'))
+        encoded_placeholder = _encode_string(self._placeholder)[:-1]
+        self._encoded_placeholder = encoded_placeholder
+        self._placeholders = re.compile(
+            re.escape(encoded_placeholder) + r'(\d+)"')
+        self._encoder = _make_encoder(self.default)
+
+    def encode(self, value):
+        encoded = ''.join(self._encoder(value, 0))
+        if self._fragments and self._encoded_placeholder in encoded:
+            return self._placeholders.sub(
+                lambda match: self._fragments[int(match.group(1))], encoded)
+        return encoded
+
+    def fragment(self, encoded):
+        """A placeholder for the JSON `encoded`."""
+        self._fragments.append(encoded)
+        return u'{}{}'.format(self._placeholder, len(self._fragments) - 1)
+
+    def default(self, obj):
+        # Checking the metaclass avoids the slow abc `isinstance`.
+        obj_type = type(obj)
+        if isinstance(obj_type, ComponentMeta):
+            return self.component(obj)
+        if obj_type is Figure:
+            if self.serializer.figure_encoder is None:
+                return obj.figure
+            return self.fragment(self.figure(obj.figure))
+        if obj_type in _table_writers:
+            records = _table_writers[obj_type](
+                obj, self.serializer.fast_data_frames)
+            if isinstance(records, six.string_types):
+                return self.fragment(records)
+            return records
+        return self.serializer.encoder.default(obj)
+
+    def component(self, component):
+        if _has_custom_json(component):
+            # Custom serialization, defer to the overridden method.
+            return component.to_plotly_json()
+
+        serializer = _get_serializer(component)
+        plotly_json = serializer.to_plotly_json(component)
+        cache = self.serializer.fragment_cache
+        key = None if cache is None else _fragment_key(
+            plotly_json, serializer.generation)
+
+        if self.serializer.figure_encoder is not None and \
+                'figure' in plotly_json['props']:
+            plotly_json['props']['figure'] = Figure(
+                plotly_json['props']['figure'])
+        if key is None:
+            return plotly_json
+
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.encode(plotly_json)
+            if len(fragment) >= cache.min_fragment_size:
+                cache.put(key, fragment)
+        return self.fragment(fragment)
+
+    def figure(self, figure):
+        """The JSON of a figure, the arrays of its traces as typed arrays."""
+        if not isinstance(figure, dict) and \
+                not isinstance(type(figure), ComponentMeta) and \
+                hasattr(figure, 'to_plotly_json'):
+            # A `plotly.graph_objs.Figure`.
+            figure = figure.to_plotly_json()
+        if not isinstance(figure, dict) or \
+                not all(isinstance(k, six.string_types) for k in figure):
+            return self.encode(figure)
+
+        figure_encoder = self.serializer.figure_encoder
+        return u'{{{}}}'.format(u', '.join(
+            u'{}: {}'.format(
+                _encode_string(k),
+                ''.join(figure_encoder(v, 0)) if k == 'data'
+                else self.encode(v))
+            for k, v in figure.items()))
+
+
+_serializer = Serializer()
+
+
+def dumps(obj):
+    """Serialize `obj` to JSON, components included."""
+    return _serializer.dumps(obj)
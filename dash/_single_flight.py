@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from . import exceptions
+
+
+# Identify the client, not the computation.
+_client_fields = ('sessionId', 'sequence')
+
+
+def request_key(body, scope=None):
+    """
+    Key of a `_dash-update-component` request, from its whole body and the
+    `scope` of the callback, like the user the response is for.
+    """
+    body = {k: v for k, v in body.items() if k not in _client_fields}
+    return hashlib.sha1(json.dumps(
+        [body, None if scope is None else str(scope)],
+        sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _dump_result(f, written, result):
+    # A JSON header and the response body, the files of a shared directory
+    # are not unpickled.
+    header = {'written': written}
+    if result is not None:
+        data, header['status'], header['mimetype'] = result
+    f.write(json.dumps(header).encode('utf-8') + b'\n')
+    if result is not None:
+        f.write(data)
+
+
+def _load_result(f):
+    header = json.loads(f.readline().decode('utf-8'))
+    if 'status' not in header:
+        return float(header['written']), None
+    return float(header['written']), (
+        f.read(), int(header['status']), str(header['mimetype']))
+
+
+class _Call(object):  # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+        self.result = None
+
+
+class SingleFlight(object):  # pylint: disable=too-few-public-methods
+    """
+    Share the result of a call with the identical calls made while it runs.
+
+    The first call of a key runs, the concurrent calls with the same key
+    wait for it and get its result. The results are only shared when the
+    call completes, if it raises the waiting calls run on their own.
+
+    With a `lock_dir`, the processes serving the app also share the
+    results through lock files in that directory, for gunicorn workers.
+    The results are then None or `(data, status, mimetype)` responses.
+    """
+
+    def __init__(self, lock_dir=None, max_age=60):
+        if lock_dir is not None and fcntl is None:
+            raise exceptions.InvalidConfig(
+                'Single flight lock files need `fcntl`, '
+                'they are not available on this platform.')
+        self.lock_dir = lock_dir
+        self.max_age = max_age
+        self.runs = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.failed:
+                return func()
+            with self._lock:
+                self.shared += 1
+            return call.result
+
+        try:
+            call.result = self._run_once(key, func)
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.runs += 1
+            call.done.set()
+        return call.result
+
+    def _run_once(self, key, func):
+        if self.lock_dir is None:
+            return func()
+
+        path = os.path.join(self.lock_dir, key)
+        started = time.time()
+        with open(path + '.lock', 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                owner = True
+            except (IOError, OSError):
+                # Running in another process, wait for its result.
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                owner = False
+            else:
+                # Keeps the lock file from being pruned.
+                os.utime(path + '.lock', None)
+
+            try:
+                if not owner:
+                    found, result = self._read_result(path, started)
+                    if found:
+                        with self._lock:
+                            self.shared += 1
+                        return result
+
+                result = func()
+                self._write_result(path, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                if owner and self.runs % 256 == 0:
+                    self._prune()
+
+    @staticmethod
+    def _read_result(path, started):
+        try:
+            with open(path + '.result', 'rb') as f:
+                written, result = _load_result(f)
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return False, None
+        # Only the result of the call that ran while this one waited.
+        return written >= started, result
+
+    def _write_result(self, path, result):
+        fd, temp_path = tempfile.mkstemp(dir=self.lock_dir)
+        with os.fdopen(fd, 'wb') as f:
+            _dump_result(f, time.time(), result)
+        os.rename(temp_path, path + '.result')
+
+    def _prune(self):
+        """Remove the lock and result files unused for `max_age`."""
+        expired = time.time() - self.max_age
+        for name in os.listdir(self.lock_dir):
+            path = os.path.join(self.lock_dir, name)
+            try:
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,80 @@
+import collections
+import threading
+
+from . import exceptions
+
+
+class CancellationToken(object):
+    """
+    Cooperative cancellation of a callback, set when a newer request for
+    the same output of the same client arrives.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        """Call `callback` when the token is cancelled, at once if it is."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        """Stop the callback without updating its output if cancelled."""
+        if self.cancelled:
+            raise exceptions.CallbackCancelled()
+
+
+class Supersede(object):  # pylint: disable=too-few-public-methods
+    """
+    Track the latest request sequence of every `(session, output)` key.
+
+    A request older than the latest one is cancelled at once, a newer
+    request cancels the token of the previous one. The keys are kept in a
+    LRU of `max_keys` entries.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._latest = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, key, sequence):
+        """The cancellation token of the request `sequence` of `key`."""
+        token = CancellationToken()
+        with self._lock:
+            latest = self._latest.pop(key, None)
+            if latest is not None and sequence < latest[0]:
+                # Arrived after a newer request.
+                token.cancel()
+                self._latest[key] = latest
+                return token
+
+            if latest is not None:
+                latest[1].cancel()
+            self._latest[key] = (sequence, token)
+            while len(self._latest) > self.max_keys:
+                self._latest.popitem(last=False)
+        return token
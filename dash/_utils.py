@@ -1,5 +1,7 @@
 import uuid
 import collections
+import re
+import threading
 import six
 
 
@@ -42,6 +44,11 @@ def get_asset_path(
     ])
 
 
+def version_tuple(version):
+    """The numbers of a version, `'1.44.3'` -> `(1, 44, 3)`."""
+    return tuple(int(x) for x in re.findall(r'\d+', version)[:3])
+
+
 # pylint: disable=no-member
 def patch_collections_abc(member):
     if six.PY2:
@@ -84,3 +91,65 @@ class AttributeDict(dict):
             value = self.get(name)
             if value:
                 return value
+
+
+class LRUCache(object):
+    """
+    Thread safe LRU of strings, bounded to `max_size` characters or bytes.
+    A value larger than `max_size` isn't stored.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._values = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key):
+        with self._lock:
+            value = self._values.pop(key, None)
+            if value is None:
+                self.misses += 1
+            else:
+                self._values[key] = value
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._values.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._values[key] = value
+            self.size += len(value)
+
+            while self.size > self.max_size:
+                _, evicted = self._values.popitem(last=False)
+                self.size -= len(evicted)
+
+    def pop(self, key):
+        """Remove and return the value of `key`, None if it's missing."""
+        with self._lock:
+            value = self._values.pop(key, None)
+            if value is None:
+                self.misses += 1
+            else:
+                self.size -= len(value)
+                self.hits += 1
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self.size = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': self.size}
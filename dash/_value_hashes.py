@@ -0,0 +1,86 @@
+import hashlib
+import json
+import re
+
+import six
+
+from . import exceptions
+from ._utils import LRUCache
+
+HASH_KEY = '_dash_hash'
+
+_re_hash = re.compile(r'^[0-9a-f]{40}$')
+
+
+def is_hash(value):
+    return isinstance(value, dict) and len(value) == 1 and HASH_KEY in value
+
+
+class ValueHashes(object):
+    """
+    Content addressed cache of the large inputs and state values.
+
+    The JSON of the values of at least `min_value_size` characters is kept
+    in a LRU of `max_size` characters, keyed by its sha1. The server sends
+    the hashes back to the client, which can then send `{'_dash_hash': h}`
+    instead of an unchanged value.
+
+    The values are cached by client, a client can only send the hashes of
+    the values it sent, not probe for the values of the other clients.
+    """
+
+    def __init__(self, max_size, min_value_size=16 * 1024):
+        self.min_value_size = min_value_size
+        self._cache = LRUCache(max_size)
+
+    def resolve(self, items, request_size, client):
+        """
+        Replace the hashes of the `{'id', 'property', 'value'}` items by
+        their values and store the large values of `client`. Without a
+        client, nothing is stored and all the hashes are unknown.
+
+        :return: The hashes of the stored values, by prop id.
+        :raises UnknownValueHash: if a hash is not in the cache, the client
+            must send the request again with the full values.
+        """
+        if not isinstance(client, six.string_types):
+            client = None
+        # Small requests can't have a value to store.
+        store = client is not None and request_size >= self.min_value_size
+        missing = []
+        hashes = {}
+
+        for item in items:
+            prop_id = '{}.{}'.format(item['id'], item['property'])
+            value = item.get('value')
+
+            if is_hash(value):
+                value_hash = value[HASH_KEY]
+                text = None
+                if (client is not None and
+                        isinstance(value_hash, six.string_types) and
+                        _re_hash.match(value_hash)):
+                    text = self._cache.get((client, value_hash))
+                if text is None:
+                    missing.append(prop_id)
+                else:
+                    item['value'] = json.loads(text)
+                    hashes[prop_id] = value_hash
+
+            elif store and isinstance(value, (dict, list, six.string_types)):
+                text = json.dumps(value)
+                if len(text) >= self.min_value_size:
+                    value_hash = hashlib.sha1(
+                        text.encode('utf-8')).hexdigest()
+                    self._cache.put((client, value_hash), text)
+                    hashes[prop_id] = value_hash
+
+        if missing:
+            raise exceptions.UnknownValueHash(
+                'Unknown value hashes for {}, send the full values.'.format(
+                    ', '.join(missing)),
+                missing)
+        return hashes
+
+    def stats(self):
+        return self._cache.stats()
@@ -0,0 +1,171 @@
+import hashlib
+import hmac
+import os
+import pickle
+import re
+import tempfile
+
+import six
+
+from . import exceptions
+from ._utils import LRUCache
+
+REF_KEY = '_dash_ref'
+
+_re_key = re.compile(r'^[0-9a-f]{64}$')
+# The key of a stored value and its signature.
+_re_reference = re.compile(r'^([0-9a-f]{64})\.([0-9a-f]{64})$')
+
+
+def is_reference(value):
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+
+class ValueStore(object):
+    """
+    Server side store of the large values, the callbacks return the
+    reference of a stored value, `{'_dash_ref': reference}`, instead of the
+    value. The references in the callbacks arguments are resolved before the
+    call, the values that look like a reference but weren't signed by the
+    store are left as they are.
+
+    The values are kept pickled in a LRU bounded to `max_size` bytes. With a
+    `directory`, they are also written there, the values evicted from the
+    memory are read back from the disk and the processes serving the app
+    share them. The directory is bounded to `max_disk_size` bytes.
+
+    The keys are the HMAC of the pickled values with `secret`, they can't
+    be guessed from a value and the files of the directory are only
+    unpickled if their key matches. `secret` can be a function, called
+    when a value is stored or read. The processes sharing a directory need
+    the same secret, a random one is used without it.
+    """
+
+    def __init__(self, max_size=256 * 1024 * 1024, directory=None,
+                 max_disk_size=1024 * 1024 * 1024, secret=None):
+        self.directory = directory
+        self.max_disk_size = max_disk_size
+        self._secret = secret
+        self._random_secret = os.urandom(32)
+        self._values = LRUCache(max_size)
+
+    def __len__(self):
+        return len(self._values)
+
+    def put(self, value):
+        """Store `value` and return its reference."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        secret = self._secret_bytes()
+        key = self._key(data, secret)
+        self._values.put(key, data)
+        if self.directory is not None:
+            self._put_disk(key, data)
+        return {REF_KEY: '{}.{}'.format(key, self._sign(key, secret))}
+
+    def get(self, reference):
+        """
+        The value of a reference.
+
+        :raises ExpiredValueReference: if the reference wasn't signed by
+            the store or its value isn't stored anymore.
+        """
+        secret = self._secret_bytes()
+        key = self._reference_key(reference, secret)
+        if key is None:
+            raise exceptions.ExpiredValueReference(
+                'Invalid value reference `{}`.'.format(reference[REF_KEY]))
+
+        data = self._values.get(key)
+        if data is None and self.directory is not None:
+            data = self._get_disk(key, secret)
+            if data is not None:
+                self._values.put(key, data)
+
+        if data is None:
+            raise exceptions.ExpiredValueReference(
+                'The value of the reference `{}` is not stored anymore, '
+                'it was evicted or stored by another process.'.format(key))
+        return pickle.loads(data)
+
+    def resolve(self, value):
+        """`value`, or the stored value if it's a reference of the store."""
+        if is_reference(value) and self._reference_key(
+                value, self._secret_bytes()) is not None:
+            return self.get(value)
+        return value
+
+    def _secret_bytes(self):
+        secret = self._secret() if callable(self._secret) else self._secret
+        if secret is None:
+            return self._random_secret
+        if isinstance(secret, six.text_type):
+            return secret.encode('utf-8')
+        return secret
+
+    @staticmethod
+    def _key(data, secret):
+        return hmac.new(secret, data, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _sign(key, secret):
+        return hmac.new(
+            secret, b'reference:' + key.encode('ascii'),
+            hashlib.sha256).hexdigest()
+
+    def _reference_key(self, reference, secret):
+        """The key of a reference, None if the store didn't sign it."""
+        value = reference[REF_KEY]
+        match = isinstance(value, six.string_types) and \
+            _re_reference.match(value)
+        if not match or not hmac.compare_digest(
+                str(match.group(2)), self._sign(match.group(1), secret)):
+            return None
+        return str(match.group(1))
+
+    def _get_disk(self, key, secret):
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Most recently used for the disk eviction.
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        if not hmac.compare_digest(self._key(data, secret), key):
+            # Not written with the secret of the app.
+            return None
+        return data
+
+    def _put_disk(self, key, data):
+        path = os.path.join(self.directory, key)
+        if os.path.exists(path):
+            os.utime(path, None)
+            return
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(temp_path, path)
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the least recently used files over `max_disk_size`."""
+        files = []
+        for name in os.listdir(self.directory):
+            if not _re_key.match(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+
+        disk_size = sum(f[1] for f in files)
+        for _, size, name in sorted(files):
+            if disk_size <= self.max_disk_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            disk_size -= size
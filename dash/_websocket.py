@@ -0,0 +1,510 @@
+"""
+WebSocket transport of the callbacks, Python 3 only.
+
+A client sends `{"id": request_id, "request": body}` text messages, `body`
+being the JSON of a `_dash-update-component` request. Every request is
+dispatched in a request context with the headers of the upgrade request,
+without going through the WSGI app, and its answer is a
+`{"id": request_id, "status": code, "headers": {...}, "response": json}`
+message. The requests of a connection run concurrently, the answers are
+sent as they complete, in any order.
+"""
+import base64
+import collections
+import functools
+import hashlib
+import io
+import json
+import struct
+import sys
+import threading
+
+try:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    asyncio = None
+
+from six.moves.urllib.parse import urlparse
+
+from . import exceptions
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Not in the requests contexts, the requests aren't sent with them.
+_upgrade_headers = frozenset((
+    'accept-encoding',
+    'connection',
+    'content-length',
+    'content-type',
+    'upgrade',
+))
+
+_reasons = {
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    426: 'Upgrade Required',
+}
+
+
+def accept_key(key):
+    """The `Sec-WebSocket-Accept` of a `Sec-WebSocket-Key`."""
+    return base64.b64encode(hashlib.sha1(
+        (key + _GUID).encode('ascii')).digest()).decode('ascii')
+
+
+def _apply_mask(data, mask):
+    length = len(data)
+    key = (bytes(mask) * (length // 4 + 1))[:length]
+    return (int.from_bytes(data, 'little') ^
+            int.from_bytes(key, 'little')).to_bytes(length, 'little')
+
+
+def encode_frame(opcode, payload, mask=None):
+    """
+    A final frame of `payload`, the frames of the clients are masked with
+    the 4 bytes of `mask`.
+    """
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack('!Q', length)
+    if mask:
+        header += mask
+        payload = _apply_mask(payload, mask)
+    return bytes(header) + bytes(payload)
+
+
+class FrameParser(object):  # pylint: disable=too-few-public-methods
+    """
+    Read the masked frames of a client, the fragmented messages are joined.
+
+    :raises WebSocketProtocolError: with the close code of an invalid frame,
+        or 1009 for a message over `max_size` bytes.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._buffer = bytearray()
+        self._fragments = None
+
+    def _too_large(self, size):
+        if size > self.max_size:
+            raise exceptions.WebSocketProtocolError(
+                'The message is over {} bytes.'.format(self.max_size), 1009)
+
+    def _read_frame(self):
+        buf = self._buffer
+        if len(buf) < 2:
+            return None
+        if buf[0] & 0x70:
+            raise exceptions.WebSocketProtocolError('Reserved bits are set.')
+        if not buf[1] & 0x80:
+            raise exceptions.WebSocketProtocolError(
+                'The client frames must be masked.')
+        fin = bool(buf[0] & 0x80)
+        opcode = buf[0] & 0x0F
+        length = buf[1] & 0x7F
+        offset = 2
+        if length == 126:
+            if len(buf) < 4:
+                return None
+            length, = struct.unpack('!H', bytes(buf[2:4]))
+            offset = 4
+        elif length == 127:
+            if len(buf) < 10:
+                return None
+            length, = struct.unpack('!Q', bytes(buf[2:10]))
+            offset = 10
+        if opcode >= OP_CLOSE and (not fin or length > 125):
+            raise exceptions.WebSocketProtocolError(
+                'Invalid control frame.')
+        # Checked before the payload is buffered.
+        self._too_large(length)
+
+        end = offset + 4 + length
+        if len(buf) < end:
+            return None
+        payload = _apply_mask(bytes(buf[offset + 4:end]),
+                              buf[offset:offset + 4])
+        del buf[:end]
+        return fin, opcode, payload
+
+    def feed(self, data):
+        """The `(opcode, payload)` of the messages completed by `data`."""
+        self._buffer += data
+        messages = []
+        while True:
+            frame = self._read_frame()
+            if frame is None:
+                return messages
+            fin, opcode, payload = frame
+
+            if opcode >= OP_CLOSE:
+                if opcode not in (OP_CLOSE, OP_PING, OP_PONG):
+                    raise exceptions.WebSocketProtocolError(
+                        'Unknown opcode {}.'.format(opcode))
+                # Can be sent between the fragments of a message.
+                messages.append((opcode, payload))
+            elif opcode == OP_CONTINUATION:
+                if self._fragments is None:
+                    raise exceptions.WebSocketProtocolError(
+                        'Continuation frame without a message.')
+                self._fragments[1].append(payload)
+                self._too_large(sum(len(p) for p in self._fragments[1]))
+                if fin:
+                    messages.append(
+                        (self._fragments[0], b''.join(self._fragments[1])))
+                    self._fragments = None
+            elif opcode in (OP_TEXT, OP_BINARY):
+                if self._fragments is not None:
+                    raise exceptions.WebSocketProtocolError(
+                        'New message before the end of the previous one.')
+                if fin:
+                    messages.append((opcode, payload))
+                else:
+                    self._fragments = (opcode, [payload])
+            else:
+                raise exceptions.WebSocketProtocolError(
+                    'Unknown opcode {}.'.format(opcode))
+
+
+def parse_request_head(data):
+    """
+    The method, path and `(name, value)` headers of the upgrade request.
+
+    :raises WebSocketProtocolError: with a 400 code if it's invalid.
+    """
+    lines = data.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ')
+        headers = [tuple(x.strip() for x in line.split(':', 1))
+                   for line in lines[1:] if line]
+    except ValueError:
+        raise exceptions.WebSocketProtocolError('Invalid request.', 400)
+    if any(len(header) != 2 for header in headers):
+        raise exceptions.WebSocketProtocolError('Invalid header.', 400)
+    return method, target.split('?', 1)[0], headers
+
+
+def dispatch_environ(headers, path, server_name, server_port, remote_addr):
+    """
+    The WSGI environ of the context of a request, a POST to `path` without
+    a body, the body of the message is dispatched as is.
+    """
+    environ = {
+        'REQUEST_METHOD': 'POST',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': remote_addr,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': '0',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers:
+        name = name.lower()
+        if name in _upgrade_headers or name.startswith('sec-websocket-'):
+            continue
+        key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = (
+            environ[key] + ', ' + value if key in environ else value)
+    return environ
+
+
+def response_message(request_id, status, headers, body):
+    """The answer to a request, its JSON body isn't decoded again."""
+    content_type = ''
+    sent_headers = {}
+    for name, value in headers:
+        if name.lower() == 'content-type':
+            content_type = value
+        elif name.lower() != 'content-length':
+            sent_headers[name] = value
+
+    if not body:
+        response = 'null'
+    elif content_type.startswith('application/json'):
+        response = body.decode('utf-8')
+    else:
+        response = json.dumps(body.decode('utf-8', 'replace'))
+    return '{{"id": {}, "status": {}, "headers": {}, "response": {}}}'.format(
+        json.dumps(request_id), status, json.dumps(sent_headers), response)
+
+
+# pylint: disable=too-many-instance-attributes
+class _Connection(asyncio.Protocol if asyncio is not None else object):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.headers = None
+        self.closing = False
+        # The requests running on the executor and the received messages
+        # waiting for one of them to complete.
+        self.in_flight = 0
+        self._pending = collections.deque()
+        self._paused = False
+        self._head = bytearray()
+        self._parser = FrameParser(server.max_message_size)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections.add(self)
+
+    def connection_lost(self, exc):  # pylint: disable=unused-argument
+        self.server.connections.discard(self)
+        self.transport = None
+
+    def data_received(self, data):
+        if self.headers is None:
+            self._head += data
+            end = self._head.find(b'\r\n\r\n')
+            if end < 0:
+                if len(self._head) > 16 * 1024:
+                    self._reject(400)
+                return
+            data = bytes(self._head[end + 4:])
+            self._handshake(bytes(self._head[:end]))
+            if self.headers is None or not data:
+                return
+
+        try:
+            self._pending.extend(self._parser.feed(data))
+        except exceptions.WebSocketProtocolError as e:
+            self.close(e.code, str(e))
+            return
+        self._process()
+
+    def _process(self):
+        """
+        Handle the pending messages while less than `max_in_flight`
+        requests run, the reading of the socket is paused at the limit.
+        """
+        while self._pending and \
+                self.in_flight < self.server.max_in_flight:
+            if self.closing:
+                return
+            self._message(*self._pending.popleft())
+
+        if self.transport is None or self.closing:
+            return
+        full = bool(self._pending)
+        if full and not self._paused:
+            self.transport.pause_reading()
+        elif not full and self._paused:
+            self.transport.resume_reading()
+        self._paused = full
+
+    def _reject(self, status, extra=''):
+        self.transport.write((
+            'HTTP/1.1 {} {}\r\n{}Content-Length: 0\r\n'
+            'Connection: close\r\n\r\n'.format(
+                status, _reasons[status], extra)).encode('latin-1'))
+        self.closing = True
+        self.transport.close()
+
+    def _handshake(self, head):
+        try:
+            method, path, headers = parse_request_head(head)
+        except exceptions.WebSocketProtocolError as e:
+            self._reject(e.code)
+            return
+        fields = {name.lower(): value for name, value in headers}
+        key = fields.get('sec-websocket-key')
+
+        if method != 'GET' or key is None or \
+                'websocket' not in fields.get('upgrade', '').lower() or \
+                'upgrade' not in fields.get('connection', '').lower():
+            self._reject(400)
+        elif path not in self.server.paths:
+            self._reject(404)
+        elif fields.get('sec-websocket-version') != '13':
+            self._reject(426, 'Sec-WebSocket-Version: 13\r\n')
+        elif not self.server.origin_allowed(
+                fields.get('origin'), fields.get('host', '')):
+            self._reject(403)
+        else:
+            self.headers = headers
+            self.transport.write((
+                'HTTP/1.1 101 Switching Protocols\r\n'
+                'Upgrade: websocket\r\n'
+                'Connection: Upgrade\r\n'
+                'Sec-WebSocket-Accept: {}\r\n\r\n'.format(
+                    accept_key(key))).encode('latin-1'))
+
+    def _message(self, opcode, payload):
+        if opcode == OP_PING:
+            self.transport.write(encode_frame(OP_PONG, payload))
+        elif opcode == OP_CLOSE:
+            code = struct.unpack('!H', payload[:2])[0] \
+                if len(payload) >= 2 else 1000
+            self.close(code)
+        elif opcode in (OP_TEXT, OP_BINARY):
+            self._request(payload)
+
+    def _request(self, payload):
+        request_id = None
+        try:
+            message = json.loads(payload.decode('utf-8'))
+            request_id = message['id']
+            body = message['request']
+            if not isinstance(body, dict):
+                raise TypeError('the request must be an object')
+        except (ValueError, KeyError, TypeError) as e:
+            self.send(response_message(request_id, 400, [], json.dumps(
+                'Invalid request message: {}'.format(e)).encode('utf-8')))
+            return
+
+        self.server.messages += 1
+        self.in_flight += 1
+        future = self.server.loop.run_in_executor(
+            self.server.executor, self.server.dispatch, self.headers, body,
+            len(payload), self.transport.get_extra_info('peername'))
+        future.add_done_callback(functools.partial(self._respond, request_id))
+
+    def _respond(self, request_id, future):
+        try:
+            status, headers, body = future.result()
+        except Exception:  # pylint: disable=broad-except
+            self.server.errors += 1
+            status, headers, body = 500, [], b''
+        self.send(response_message(request_id, status, headers, body))
+        self.in_flight -= 1
+        self._process()
+
+    def send(self, text):
+        if self.transport is not None and not self.closing:
+            self.transport.write(encode_frame(OP_TEXT, text.encode('utf-8')))
+
+    def close(self, code=1000, reason=''):
+        if self.transport is None or self.closing:
+            return
+        self.transport.write(encode_frame(
+            OP_CLOSE, struct.pack('!H', code) + reason.encode('utf-8')[:123]))
+        self.closing = True
+        self.transport.close()
+
+
+# pylint: disable=too-many-instance-attributes
+class WebSocketServer(object):
+    """
+    Serve the callbacks over WebSocket connections, on an asyncio loop
+    running in a thread. The requests run on a pool of `workers` threads,
+    in a context of the Flask `app` like a POST to `dispatch_path`.
+
+    The server listens on its own port in the process that starts it, the
+    requests are only dispatched by that process.
+
+    :param dispatch: Called with the JSON body of a request and its size
+        in the request context, returns its response.
+    :param paths: The paths of the upgrade requests.
+    :param max_message_size: Bound of a request message, a larger one
+        closes the connection with a 1009.
+    :param allowed_origins: The `Origin` of the pages allowed to connect,
+        by default the pages of the same host.
+    :param max_in_flight: The requests of a connection running at once,
+        the connection isn't read while it has as many.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, app, dispatch, dispatch_path, paths, host='127.0.0.1',
+                 port=8051, workers=16, max_message_size=64 * 1024 * 1024,
+                 allowed_origins=None, max_in_flight=8):
+        if asyncio is None:
+            raise exceptions.InvalidConfig(
+                'The WebSocket transport needs Python 3.')
+        self.app = app
+        self.dispatch_request = dispatch
+        self.dispatch_path = dispatch_path
+        self.paths = frozenset(paths)
+        self.host = host
+        self.port = port
+        self.max_message_size = max_message_size
+        self.allowed_origins = allowed_origins
+        self.max_in_flight = max_in_flight
+        self.executor = ThreadPoolExecutor(workers)
+        self.connections = set()
+        self.messages = 0
+        self.errors = 0
+        self.loop = None
+        self._server = None
+        self._thread = None
+
+    def origin_allowed(self, origin, host):
+        if origin is None:
+            # Not a browser.
+            return True
+        if self.allowed_origins is not None:
+            return origin in self.allowed_origins
+        return urlparse(origin).hostname == urlparse('//' + host).hostname
+
+    def dispatch(self, headers, body, size, peername):
+        """The status code, headers and body of the response of `body`."""
+        environ = dispatch_environ(
+            headers, self.dispatch_path, self.host, self.port,
+            peername[0] if peername else '')
+        with self.app.request_context(environ):
+            try:
+                response = self.app.make_response(
+                    self.dispatch_request(body, size))
+            except Exception as e:  # pylint: disable=broad-except
+                # The error handlers of the app, the other errors are 500.
+                response = self.app.make_response(
+                    self.app.handle_user_exception(e))
+            return (response.status_code, list(response.headers.items()),
+                    response.get_data())
+
+    def start(self):
+        """Listen on `host` and `port`, `port` can be 0 for any port."""
+        self.loop = asyncio.new_event_loop()
+        self._server = self.loop.run_until_complete(self.loop.create_server(
+            lambda: _Connection(self), self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self.loop.run_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        def close():
+            self._server.close()
+            for connection in list(self.connections):
+                connection.close(1001, 'Server shutdown')
+            self.loop.stop()
+
+        self.loop.call_soon_threadsafe(close)
+        self._thread.join()
+        self.loop.run_until_complete(self._server.wait_closed())
+        self.loop.close()
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            'connections': len(self.connections),
+            'messages': self.messages,
+            'errors': self.errors,
+        }
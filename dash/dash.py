@@ -5,6 +5,8 @@ import os
 import random
 import sys
 import collections
+import functools
+import hashlib
 import importlib
 import json
 import pkgutil
@@ -13,11 +15,13 @@ import warnings
 import re
 import logging
 
-from functools import wraps
+from multiprocessing import TimeoutError as _PoolTimeoutError
+from multiprocessing.pool import ThreadPool
 
 import flask
 from flask import Flask, Response
-from flask_compress import Compress
+from werkzeug.exceptions import BadRequest
+from werkzeug.wsgi import wrap_file
 
 import plotly
 import dash_renderer
@@ -32,8 +36,20 @@ from ._utils import format_tag as _format_tag
 from ._utils import generate_hash as _generate_hash
 from ._utils import get_asset_path as _get_asset_path
 from ._utils import patch_collections_abc as _patch_collections_abc
+from ._utils import version_tuple as _version_tuple
 from . import _watch
 from . import _configs
+from . import _serialization
+from . import _dependency_graph
+from . import _prerender
+from . import _single_flight
+from . import _supersede
+from . import _admission
+from . import _compress
+from . import _push
+from . import _websocket
+from . import _value_store
+from . import _value_hashes
 
 
 _default_index = '''<!DOCTYPE html>
@@ -70,6 +86,90 @@ _re_index_config_id = re.compile(r'id="_dash-config"')
 _re_index_scripts_id = re.compile(r'src=".*dash[-_]renderer.*"')
 
 
+# The first dash-renderer applying the `multi` responses.
+_multi_outputs_renderer = (0, 20, 0)
+
+
+# The first plotly.js decoding the `binary_arrays` typed arrays.
+_typed_arrays_plotly_js = (2, 28, 0)
+
+
+def _plotly_js_version():
+    """
+    The version of the plotly.js bundled with dash-core-components, None if
+    it isn't installed.
+    """
+    try:
+        # dash-core-components imports dash.
+        import dash_core_components  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    for resource in getattr(dash_core_components, '_js_dist', []):
+        match = re.match(
+            r'^plotly-(\d+\.\d+\.\d+)(\.min)?\.js$',
+            resource.get('relative_package_path', ''))
+        if match:
+            return match.group(1)
+    return None
+
+
+def _multi_output_id(output_ids):
+    """The callback id of multiple outputs, `..a.children...b.value..`."""
+    return '..{}..'.format('...'.join(output_ids))
+
+
+def _is_multi_output_id(callback_id):
+    return callback_id.startswith('..')
+
+
+def _optional_int(value):
+    return None if value is None else int(value)
+
+
+# How `_dash-component-suites` sends the files.
+_sendfile_modes = ('file', 'memory', 'x-sendfile', 'x-accel-redirect')
+
+
+def _package_file(package_name, path_in_package_dist):
+    """The path of a package file on the disk, None if it's zipped."""
+    module = sys.modules.get(package_name) or importlib.import_module(
+        package_name)
+    path = os.path.join(
+        os.path.dirname(os.path.abspath(module.__file__)),
+        *path_in_package_dist.split('/'))
+    return path if os.path.isfile(path) else None
+
+
+def _output_value(component_property, value):
+    """The value of an output in a response, the figures are marked."""
+    if component_property == 'figure':
+        return _serialization.Figure(value)
+    return value
+
+
+def _updates_response(updates, figures=True):
+    """
+    Group the `(prop_id, value)` updates by component id, the `figure`
+    values are marked for the serializer unless `figures` is False.
+    """
+    response = collections.OrderedDict()
+    for prop_id, value in updates:
+        component_id, component_property = prop_id.split('.', 1)
+        response.setdefault(component_id, {})[component_property] = (
+            _output_value(component_property, value) if figures else value)
+    return response
+
+
+def _callback_response(callback_id, updates):
+    """The `_dash-update-component` response of the updates of a callback."""
+    if _is_multi_output_id(callback_id):
+        return {'multi': True, 'response': _updates_response(updates)}
+    [(prop_id, value)] = updates
+    component_property = prop_id.split('.', 1)[1]
+    return {'response': {'props': {
+        component_property: _output_value(component_property, value)}}}
+
+
 # pylint: disable=too-many-instance-attributes
 # pylint: disable=too-many-arguments, too-many-locals
 class Dash(object):
@@ -87,12 +187,38 @@ class Dash(object):
             requests_pathname_prefix=None,
             routes_pathname_prefix=None,
             compress=True,
+            compress_min_size=None,
+            compress_levels=None,
+            compress_cache_size=None,
+            max_request_body_size=None,
             meta_tags=None,
             index_string=_default_index,
+            preload_headers=None,
+            early_hints=None,
             external_scripts=None,
             external_stylesheets=None,
             suppress_callback_exceptions=None,
             components_cache_max_age=None,
+            components_sendfile=None,
+            components_accel_redirect_prefix=None,
+            fragment_cache_size=None,
+            prerender_callbacks=None,
+            prerender_workers=None,
+            single_flight_dir=None,
+            max_dispatches=None,
+            max_dispatches_per_callback=None,
+            dispatch_queue_size=None,
+            dispatch_queue_timeout=None,
+            callback_timeout_workers=None,
+            value_store_size=None,
+            value_store_dir=None,
+            value_store_disk_size=None,
+            value_hashes_size=None,
+            binary_arrays=None,
+            fast_data_frames=None,
+            enable_push=None,
+            push_queue_size=None,
+            websocket_url=None,
             **kwargs):
 
         # pylint-disable: too-many-instance-attributes
@@ -139,9 +265,92 @@ class Dash(object):
                 'assets_external_path', assets_external_path, env_configs, ''),
             'components_cache_max_age': int(_configs.get_config(
                 'components_cache_max_age', components_cache_max_age,
-                env_configs, 2678400))
+                env_configs, 2678400)),
+            'compress_min_size': int(_configs.get_config(
+                'compress_min_size', compress_min_size, env_configs, 1024)),
+            'compress_cache_size': int(_configs.get_config(
+                'compress_cache_size', compress_cache_size, env_configs,
+                32 * 1024 * 1024)),
+            'max_request_body_size': int(_configs.get_config(
+                'max_request_body_size', max_request_body_size, env_configs,
+                64 * 1024 * 1024)),
+            'preload_headers': _configs.get_config(
+                'preload_headers', preload_headers, env_configs, True,
+                is_bool=True),
+            'early_hints': _configs.get_config(
+                'early_hints', early_hints, env_configs, False,
+                is_bool=True),
+            'components_sendfile': _configs.get_config(
+                'components_sendfile', components_sendfile, env_configs,
+                'file'),
+            'components_accel_redirect_prefix': _configs.get_config(
+                'components_accel_redirect_prefix',
+                components_accel_redirect_prefix, env_configs,
+                '/_dash-files'),
+            'fragment_cache_size': int(_configs.get_config(
+                'fragment_cache_size', fragment_cache_size,
+                env_configs, 0)),
+            'prerender_callbacks': _configs.get_config(
+                'prerender_callbacks', prerender_callbacks,
+                env_configs, False, is_bool=True),
+            'prerender_workers': int(_configs.get_config(
+                'prerender_workers', prerender_workers, env_configs, 4)),
+            'single_flight_dir': _configs.get_config(
+                'single_flight_dir', single_flight_dir, env_configs),
+            'max_dispatches': _configs.get_config(
+                'max_dispatches', max_dispatches, env_configs),
+            'max_dispatches_per_callback': _configs.get_config(
+                'max_dispatches_per_callback', max_dispatches_per_callback,
+                env_configs),
+            'dispatch_queue_size': int(_configs.get_config(
+                'dispatch_queue_size', dispatch_queue_size, env_configs, 0)),
+            'dispatch_queue_timeout': float(_configs.get_config(
+                'dispatch_queue_timeout', dispatch_queue_timeout,
+                env_configs, 1)),
+            'callback_timeout_workers': int(_configs.get_config(
+                'callback_timeout_workers', callback_timeout_workers,
+                env_configs, 16)),
+            'value_store_size': int(_configs.get_config(
+                'value_store_size', value_store_size, env_configs,
+                256 * 1024 * 1024)),
+            'value_store_dir': _configs.get_config(
+                'value_store_dir', value_store_dir, env_configs),
+            'value_store_disk_size': int(_configs.get_config(
+                'value_store_disk_size', value_store_disk_size, env_configs,
+                1024 * 1024 * 1024)),
+            'value_hashes_size': int(_configs.get_config(
+                'value_hashes_size', value_hashes_size, env_configs, 0)),
+            'binary_arrays': _configs.get_config(
+                'binary_arrays', binary_arrays, env_configs, False,
+                is_bool=True),
+            'fast_data_frames': _configs.get_config(
+                'fast_data_frames', fast_data_frames, env_configs, False,
+                is_bool=True),
+            'enable_push': _configs.get_config(
+                'enable_push', enable_push, env_configs, False,
+                is_bool=True),
+            'push_queue_size': int(_configs.get_config(
+                'push_queue_size', push_queue_size, env_configs, 1000)),
+            'websocket_url': _configs.get_config(
+                'websocket_url', websocket_url, env_configs)
         })
 
+        if self.config.components_sendfile not in _sendfile_modes:
+            raise exceptions.InvalidConfig(
+                '`components_sendfile` must be one of {}, not `{}`.'.format(
+                    ', '.join(_sendfile_modes),
+                    self.config.components_sendfile))
+
+        plotly_js = _plotly_js_version()
+        if self.config.binary_arrays and plotly_js and _version_tuple(
+                plotly_js) < _typed_arrays_plotly_js:
+            raise exceptions.InvalidConfig(
+                '`binary_arrays` needs plotly.js {} or later to decode the '
+                'typed arrays, dash-core-components bundles plotly.js '
+                '{}.'.format(
+                    '.'.join(str(x) for x in _typed_arrays_plotly_js),
+                    plotly_js))
+
         assets_blueprint_name = '{}{}'.format(
             self.config.routes_pathname_prefix.replace('/', '_'),
             'dash_assets'
@@ -160,21 +369,117 @@ class Dash(object):
 
         # list of dependencies
         self.callback_map = {}
+        self._dependency_graph = _dependency_graph.DependencyGraph()
+
+        # pool running the initial callbacks with `prerender_callbacks`,
+        # their responses for the initial requests of the renderer
+        self._prerender_pool = None
+        self._prerendered = _prerender.PrerenderedResponses() \
+            if self.config.prerender_callbacks else None
+
+        # identical concurrent requests of the `single_flight` callbacks
+        # run once
+        self._single_flight = _single_flight.SingleFlight(
+            self.config.single_flight_dir)
+
+        # limits of the callbacks running at once
+        self._admission = None
+        if (self.config.max_dispatches is not None or
+                self.config.max_dispatches_per_callback is not None):
+            self._admission = _admission.AdmissionController(
+                _optional_int(self.config.max_dispatches),
+                _optional_int(self.config.max_dispatches_per_callback),
+                self.config.dispatch_queue_size,
+                self.config.dispatch_queue_timeout)
+
+        # large values kept server side, the callbacks return references
+        self.value_store = _value_store.ValueStore(
+            self.config.value_store_size,
+            self.config.value_store_dir,
+            self.config.value_store_disk_size,
+            # Read when used, the apps set it after creating the Dash.
+            lambda: self.server.secret_key)
+
+        # large inputs values seen, the client can send their hash instead
+        self._value_hashes = _value_hashes.ValueHashes(
+            self.config.value_hashes_size
+        ) if self.config.value_hashes_size else None
+
+        # pool running the callbacks with a timeout, its busy threads and
+        # the timeouts count
+        self._timeout_pool = None
+        self._timeout_running = 0
+        self._callback_timeouts = collections.Counter()
+
+        # latest request of each client output, to cancel the older ones
+        self._supersede = _supersede.Supersede()
+
+        # values pushed by `app.push` to the `_dash-push` clients
+        self._push = _push.PushChannel(self.config.push_queue_size)
+
+        # server of the callbacks over WebSocket, `start_websocket_server`
+        self._websocket_server = None
+
+        # serialized `_dash-dependencies` and `_dash-routes` payloads,
+        # dropped when a callback or an url is added.
+        self._json_payloads = {}
+
+        # serialization of the layout and the callbacks responses
+        self._serializer = _serialization.Serializer(
+            _serialization.FragmentCache(self.config.fragment_cache_size)
+            if self.config.fragment_cache_size else None,
+            self.config.binary_arrays,
+            self.config.fast_data_frames)
 
         self._index_string = ''
         self.index_string = index_string
         self._meta_tags = meta_tags or []
         self._favicon = None
 
+        self._compressor = None
         if compress:
-            # gzip
-            Compress(self.server)
+            self._compressor = _compress.Compressor(
+                self.config.compress_min_size, compress_levels,
+                self.config.compress_cache_size)
+            self.server.after_request(self._compress_response)
 
         @self.server.errorhandler(exceptions.PreventUpdate)
         def _handle_error(_):
             """Handle a halted callback and return an empty 204 response"""
             return '', 204
 
+        @self.server.errorhandler(exceptions.DispatchOverloaded)
+        def _handle_overloaded(error):
+            """Reject a callback request over the admission limits"""
+            return str(error), 503, {'Retry-After': str(error.retry_after)}
+
+        @self.server.errorhandler(exceptions.ExpiredValueReference)
+        def _handle_expired_reference(error):
+            """The client must send the request again with the value"""
+            return flask.jsonify({'error': {
+                'type': 'ExpiredValueReference',
+                'message': str(error)
+            }}), 410
+
+        @self.server.errorhandler(exceptions.UnknownValueHash)
+        def _handle_unknown_hash(error):
+            """The client must send the request again with the values"""
+            return flask.jsonify({'error': {
+                'type': 'UnknownValueHash',
+                'message': str(error),
+                'missing': error.missing
+            }}), 409
+
+        @self.server.errorhandler(exceptions.CallbackTimeout)
+        def _handle_timeout(error):
+            """Structured error of a callback over its timeout"""
+            return flask.jsonify({'error': {
+                'type': 'CallbackTimeout',
+                'message': str(error),
+                'callback': error.callback_id,
+                'timeout': error.timeout
+            }}), 504
+
         # static files from the packages
         self.css = Css()
         self.scripts = Scripts()
@@ -215,18 +520,36 @@ class Dash(object):
             '{}_dash-routes'.format(self.config['routes_pathname_prefix']),
             self.serve_routes)
 
+        # The compression levels of the responses, by endpoint.
+        self._compress_routes = {
+            '{}{}'.format(self.config['routes_pathname_prefix'], name): kind
+            for name, kind in (
+                ('_dash-layout', 'layout'),
+                ('_dash-update-component', 'dispatch'),
+                ('_dash-component-suites/<string:package_name>'
+                 '/<path:path_in_package_dist>', 'suites'))
+        }
+
         self._add_url(
             self.config['routes_pathname_prefix'],
-            self.index)
+            self._serve_index)
 
         self._add_url(
             '{}_reload-hash'.format(self.config['routes_pathname_prefix']),
             self.serve_reload_hash)
 
+        self._add_url(
+            '{}_reload-events'.format(self.config['routes_pathname_prefix']),
+            self.serve_reload_events)
+
+        self._add_url(
+            '{}_dash-push'.format(self.config['routes_pathname_prefix']),
+            self.serve_push)
+
         # catch-all for front-end routes, used by dcc.Location
         self._add_url(
             '{}<path:path>'.format(self.config['routes_pathname_prefix']),
-            self.index)
+            self._serve_index)
 
         self._add_url(
             '{}_favicon.ico'.format(self.config['routes_pathname_prefix']),
@@ -236,6 +559,7 @@ class Dash(object):
 
         self._layout = None
         self._cached_layout = None
+        self._package_file_validators = {}
         self._dev_tools = _AttributeDict({
             'serve_dev_bundles': False,
             'hot_reload': False,
@@ -256,6 +580,10 @@ class Dash(object):
         self._lock = threading.RLock()
         self._watch_thread = None
         self._changed_assets = []
+        # The last changes pushed to `_reload-events`, with their ids.
+        self._reload_events = collections.deque(maxlen=100)
+        self._reload_event_id = 0
+        self._reload_condition = threading.Condition(self._lock)
 
         self.logger = logging.getLogger(name)
         self.logger.addHandler(logging.StreamHandler(stream=sys.stdout))
@@ -270,6 +598,31 @@ class Dash(object):
         # record the url in Dash.routes so that it can be accessed later
         # e.g. for adding authentication with flask_login
         self.routes.append(name)
+        self._json_payloads.pop('routes', None)
+
+    def _compress_response(self, response):
+        return self._compressor.compress(
+            response,
+            self._compress_routes.get(flask.request.endpoint, 'default'),
+            flask.request.accept_encodings)
+
+    def _serve_json_payload(self, name, size, build):
+        """
+        Serve the JSON returned by `build` with an ETag, the payload is
+        serialized once and kept until it is dropped from `_json_payloads`
+        or `size` changes.
+        """
+        payload = self._json_payloads.get(name)
+        if payload is None or payload[0] != size:
+            body = build().encode('utf-8')
+            payload = (size, body, hashlib.sha1(body).hexdigest())
+            self._json_payloads[name] = payload
+
+        response = flask.Response(payload[1], mimetype='application/json')
+        response.set_etag(payload[2])
+        # Always revalidate, a new callback changes the payload.
+        response.cache_control.no_cache = True
+        return response.make_conditional(flask.request)
 
     @property
     def layout(self):
@@ -295,6 +648,9 @@ class Dash(object):
         self._layout = value
 
         layout_value = self._layout_value()
+        if isinstance(value, _patch_collections_abc('Callable')):
+            # Each call can use other components, nothing to infer.
+            layout_value = None
         # pylint: disable=protected-access
         self.css._update_layout(layout_value)
         self.scripts._update_layout(layout_value)
@@ -321,50 +677,345 @@ class Dash(object):
 
     def serve_layout(self):
         layout = self._layout_value()
+        headers = {}
+        prerendered = {}
+
+        if self.config.prerender_callbacks:
+            layout, prerendered = self._prerender_callbacks(layout)
+            # The renderers reading it don't need to fire these callbacks.
+            headers['X-Dash-Prerendered'] = json.dumps(list(prerendered))
 
         # TODO - Set browser cache limit - pass hash into frontend
-        return flask.Response(
-            json.dumps(layout,
-                       cls=plotly.utils.PlotlyJSONEncoder),
-            mimetype='application/json'
+        response = flask.Response(
+            self._serializer.dumps(layout),
+            mimetype='application/json',
+            headers=headers
         )
 
+        if prerendered:
+            # The initial requests of the renderers firing all the
+            # callbacks get these responses.
+            client = _generate_hash()
+            for callback_id, (values, updates) in prerendered.items():
+                self._prerendered.put(
+                    _prerender.PrerenderedResponses.key(
+                        client, callback_id,
+                        json.loads(self._serializer.dumps(values))),
+                    self._serializer.dumps(
+                        _callback_response(callback_id, updates)))
+            response.set_cookie(
+                _prerender.COOKIE, client, httponly=True,
+                path=self.config.requests_pathname_prefix)
+        return response
+
+    def _prerender_callbacks(self, layout):
+        """
+        Run the initial callbacks, the callbacks with all their inputs, state
+        and outputs in the layout, and set their outputs in a copy of the
+        layout. The callbacks of a dependency layer run concurrently on the
+        prerender pool, the next layers get their updated values.
+
+        :return: The updated layout and, by id of the callbacks that ran,
+            the values of their inputs and state and their updates.
+        """
+        components = _prerender.components_by_id(layout)
+        updates = collections.OrderedDict()
+        prerendered = collections.OrderedDict()
+
+        def prop_value(prop_id):
+            if prop_id in updates:
+                return updates[prop_id]
+            component_id, component_property = prop_id.split('.', 1)
+            return getattr(components[component_id], component_property, None)
+
+        for layer in self._dependency_graph.layers:
+            tasks = []
+            for callback_id in layer:
+                registration = self.callback_map.get(callback_id, {})
+                input_ids = ['{}.{}'.format(x['id'], x['property'])
+                             for x in registration.get('inputs', [])]
+                state_ids = ['{}.{}'.format(x['id'], x['property'])
+                             for x in registration.get('state', [])]
+                prop_ids = (input_ids + state_ids +
+                            self._dependency_graph.outputs(callback_id))
+                if 'function' not in registration or any(
+                        x.split('.', 1)[0] not in components
+                        for x in prop_ids):
+                    continue
+
+                tasks.append(flask.copy_current_request_context(
+                    functools.partial(
+                        self._prerender_callback, callback_id,
+                        {x: prop_value(x) for x in input_ids},
+                        {x: prop_value(x) for x in state_ids})))
+
+            if len(tasks) > 1:
+                if self._prerender_pool is None:
+                    self._prerender_pool = ThreadPool(
+                        self.config.prerender_workers)
+                results = self._prerender_pool.map(lambda task: task(), tasks)
+            else:
+                results = [task() for task in tasks]
+
+            for callback_id, values, callback_updates in results:
+                if callback_updates is not None:
+                    updates.update(callback_updates)
+                    prerendered[callback_id] = (values, callback_updates)
+
+        return (
+            _prerender.apply_updates(
+                layout, _updates_response(updates.items(), figures=False)),
+            prerendered
+        )
+
+    def _prerender_callback(self, callback_id, input_values, state_values):
+        flask.g.input_values = input_values
+        flask.g.state_values = state_values
+        flask.g.triggered_inputs = []
+
+        registration = self.callback_map[callback_id]
+        args = (
+            [input_values['{}.{}'.format(x['id'], x['property'])]
+             for x in registration['inputs']] +
+            [state_values['{}.{}'.format(x['id'], x['property'])]
+             for x in registration['state']]
+        )
+        values = dict(input_values, **state_values)
+        try:
+            updates = self._callback_updates(
+                callback_id, self._call_callback(
+                    callback_id, registration['function'], args))
+            # An output that can't be serialized fails here, not the layout.
+            self._serializer.dumps([value for _, value in updates])
+            return callback_id, values, updates
+        except exceptions.PreventUpdate:
+            return callback_id, values, None
+        except Exception:  # pylint: disable=broad-except
+            # Left to the renderer, it shows the error as usual.
+            self.logger.exception(
+                'Prerendering the callback for `%s` failed', callback_id)
+            return callback_id, values, None
+
     def _config(self):
         config = {
             'url_base_pathname': self.url_base_pathname,
             'requests_pathname_prefix': self.config['requests_pathname_prefix']
         }
+        # The request bodies can be compressed with these encodings.
+        config['request_encodings'] = _compress.request_encodings()
+        if self.config.enable_push:
+            # The values of `app.push` are streamed there.
+            config['push_url'] = '{}_dash-push'.format(
+                self.config.requests_pathname_prefix)
+        websocket_url = self._websocket_url()
+        if websocket_url:
+            # The callbacks can be sent there instead.
+            config['websocket_url'] = websocket_url
         if self._dev_tools.hot_reload:
             config['hot_reload'] = {
                 'interval': self._dev_tools.hot_reload_interval,
-                'max_retry': self._dev_tools.hot_reload_max_retry
+                'max_retry': self._dev_tools.hot_reload_max_retry,
+                # Pushes the changes, the polling is the fallback.
+                'events_url': '{}_reload-events'.format(
+                    self.config.requests_pathname_prefix)
             }
+        if self.scripts.config.infer_from_layout:
+            # The bundles of the namespaces not in the layout, for the
+            # components returned by the callbacks.
+            config['dynamic_scripts'] = {}
+            self._collect_and_register_resources(
+                self.scripts.get_all_scripts(
+                    dev_bundles=self._dev_tools.serve_dev_bundles),
+                config['dynamic_scripts'])
+        if self.css.config.infer_from_layout:
+            config['dynamic_css'] = {}
+            self._collect_and_register_resources(
+                self.css.get_all_css(), config['dynamic_css'])
         return config
 
     def serve_reload_hash(self):
-        hard = self._hard_reload
-        changed = self._changed_assets
-        self._lock.acquire()
-        self._hard_reload = False
-        self._changed_assets = []
-        self._lock.release()
+        with self._lock:
+            reload_hash = self._reload_hash
+            hard = self._hard_reload
+            changed = self._changed_assets
+            self._hard_reload = False
+            self._changed_assets = []
 
         return flask.jsonify({
-            'reloadHash': self._reload_hash,
+            'reloadHash': reload_hash,
             'hard': hard,
             'packages': list(self.registered_paths.keys()),
             'files': list(changed)
         })
 
+    def _reload_event(self, hard, files):
+        return {
+            'reloadHash': self._reload_hash,
+            'hard': hard,
+            'packages': list(self.registered_paths.keys()),
+            'files': files
+        }
+
+    def serve_reload_events(self):
+        """
+        Server-sent events of the hot reload, an event is pushed for every
+        change instead of polling `_reload-hash`. The first event is the
+        current hash, a reconnection with a `Last-Event-ID` gets the events
+        missed since.
+        """
+        if not self._dev_tools.hot_reload:
+            flask.abort(404)
+
+        try:
+            last_id = int(flask.request.headers.get('Last-Event-ID', -1))
+        except ValueError:
+            last_id = -1
+
+        with self._lock:
+            if self._reload_events and \
+                    self._reload_events[0][0] <= last_id + 1:
+                pending = [e for e in self._reload_events if e[0] > last_id]
+            else:
+                # The current state, for a new client or one that missed
+                # evicted events.
+                pending = [(self._reload_event_id,
+                            self._reload_event(last_id >= 0, []))]
+
+        def events():
+            yield 'retry: {}\n\n'.format(self._dev_tools.hot_reload_interval)
+            event_id = last_id
+            queue = pending
+            while True:
+                for event_id, event in queue:
+                    yield 'id: {}\ndata: {}\n\n'.format(
+                        event_id, json.dumps(event))
+                with self._reload_condition:
+                    if self._reload_event_id <= event_id:
+                        self._reload_condition.wait(15)
+                    queue = [e for e in self._reload_events
+                             if e[0] > event_id]
+                if not queue:
+                    # Keeps the connection of the idle clients open.
+                    yield ': keep-alive\n\n'
+
+        return Response(
+            events(), mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache',
+                     'X-Accel-Buffering': 'no'})
+
+    def push(self, output, value):
+        """
+        Update `output` in all the pages subscribed to `_dash-push`,
+        without a callback request.
+
+        The value is sent as the output of a callback would be. A client
+        that didn't receive the previous value of the output yet only gets
+        this one.
+
+        The values are only sent to the clients connected to this process,
+        an app served by several processes must push them in each one.
+
+        :param output: An `Output` or its `'id.property'`.
+        :param value: The new value of the property.
+        :raises InvalidConfig: if the app wasn't created with
+            `enable_push=True`.
+        """
+        if not self.config.enable_push:
+            raise exceptions.InvalidConfig(
+                '`app.push` needs `Dash(enable_push=True)` or '
+                '`DASH_ENABLE_PUSH`.')
+        output = str(output)
+        self._push.publish(output, self._serializer.dumps(
+            _output_value(output.split('.', 1)[-1], value)))
+
+    def serve_push(self):
+        """
+        Server-sent events of the values of `app.push`, a `multi` response
+        of the updated props in every event. The `outputs` query parameter
+        can restrict them to a comma separated list of `id.property`.
+        """
+        if not self.config.enable_push:
+            flask.abort(404)
+
+        outputs = flask.request.args.get('outputs')
+        subscription = self._push.subscribe(
+            set(outputs.split(',')) if outputs else None)
+
+        def events():
+            try:
+                yield 'retry: 1000\n\n'
+                while True:
+                    updates = subscription.get(15)
+                    if updates:
+                        yield 'data: {}\n\n'.format(
+                            _push.updates_json(updates))
+                    else:
+                        # Keeps the connection of the idle clients open.
+                        yield ': keep-alive\n\n'
+            finally:
+                self._push.unsubscribe(subscription)
+
+        return Response(
+            events(), mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache',
+                     'X-Accel-Buffering': 'no'})
+
+    def _websocket_url(self):
+        if self.config.websocket_url or self._websocket_server is None:
+            return self.config.websocket_url
+        host = self._websocket_server.host
+        return 'ws://{}:{}{}_dash-ws'.format(
+            '[{}]'.format(host) if ':' in host else host,
+            self._websocket_server.port,
+            self.config.requests_pathname_prefix)
+
+    def start_websocket_server(self, host='127.0.0.1', port=8051,
+                               workers=16, allowed_origins=None,
+                               max_in_flight=8):
+        """
+        Serve the callbacks over WebSocket in a background thread, the
+        renderer sends them on one connection instead of a
+        `_dash-update-component` request each. Python 3 only.
+
+        The messages of the connection are dispatched like the POSTs of
+        `_dash-update-component`, with the headers of the upgrade request,
+        the concurrent callbacks are told apart by the request ids.
+
+        The server is single process: it listens on its own port, 8051 by
+        default, and the process starting it runs all the callbacks of the
+        connections. With several worker processes, start it in one of
+        them only, or on a port per process with their `websocket_url`.
+
+        :param host: The address to listen on, set the `websocket_url`
+            config if the pages reach it at another one.
+        :param port: The port, 0 for any free port.
+        :param workers: The threads running the callbacks.
+        :param allowed_origins: The `Origin` of the pages allowed to
+            connect, by default the pages of the same host name.
+        :param max_in_flight: The callbacks of a connection running at
+            once, its next messages aren't read until one completes.
+        :return: The started `WebSocketServer`, `stop()` closes it.
+        """
+        self._websocket_server = _websocket.WebSocketServer(
+            self.server, self._dispatch_request,
+            '{}_dash-update-component'.format(
+                self.config.routes_pathname_prefix),
+            ('{}_dash-ws'.format(self.config.routes_pathname_prefix),
+             '{}_dash-ws'.format(self.config.requests_pathname_prefix)),
+            host, port, workers, self.config.max_request_body_size,
+            allowed_origins, max_in_flight).start()
+        return self._websocket_server
+
     def serve_routes(self):
-        return flask.Response(
-            json.dumps(self.routes,
-                       cls=plotly.utils.PlotlyJSONEncoder),
-            mimetype='application/json'
-        )
+        return self._serve_json_payload(
+            'routes', len(self.routes),
+            lambda: json.dumps(self.routes,
+                               cls=plotly.utils.PlotlyJSONEncoder))
 
-    def _collect_and_register_resources(self, resources):
+    def _collect_and_register_resources(self, resources, dynamic=None):
         # now needs the app context.
+        # `dynamic` collects the urls of the dynamic package resources
+        # by namespace.
         # template in the necessary component suite JS bundles
         # add the version number of the package as a query parameter
         # for cache busting
@@ -401,6 +1052,12 @@ class Dash(object):
                             relative_package_path=rel_path,
                             namespace=resource['namespace']
                         ))
+                    elif dynamic is not None:
+                        dynamic.setdefault(resource['namespace'], []).append(
+                            _relative_url_path(
+                                relative_package_path=rel_path,
+                                namespace=resource['namespace']
+                            ))
             elif 'external_url' in resource:
                 if not is_dynamic_resource:
                     if isinstance(resource['external_url'], str):
@@ -419,10 +1076,26 @@ class Dash(object):
                 srcs.append(static_url)
         return srcs
 
-    def _generate_css_dist_html(self):
-        links = self._external_stylesheets + \
+    def _css_links(self):
+        return self._external_stylesheets + \
             self._collect_and_register_resources(self.css.get_all_css())
 
+    def _index_resources(self):
+        """
+        The stylesheets and scripts of the index, computed once by request
+        for its html and its preload links.
+        """
+        if not flask.has_request_context():
+            return self._css_links(), self._script_srcs()
+        resources = getattr(flask.g, 'dash_index_resources', None)
+        if resources is None:
+            resources = flask.g.dash_index_resources = (
+                self._css_links(), self._script_srcs())
+        return resources
+
+    def _generate_css_dist_html(self):
+        links = self._index_resources()[0]
+
         return '\n'.join([
             _format_tag('link', link, opened=True)
             if isinstance(link, dict)
@@ -430,7 +1103,7 @@ class Dash(object):
             for link in links
         ])
 
-    def _generate_scripts_html(self):
+    def _script_srcs(self):
         # Dash renderer has dependencies like React which need to be rendered
         # before every other script. However, the dash renderer bundle
         # itself needs to be rendered after all of the component's
@@ -449,6 +1122,10 @@ class Dash(object):
                     dash_renderer._js_dist,
                     dev_bundles=self._dev_tools.serve_dev_bundles
                 ))
+        return srcs
+
+    def _generate_scripts_html(self):
+        srcs = self._index_resources()[1]
 
         return '\n'.join([
             _format_tag('script', src)
@@ -511,16 +1188,118 @@ class Dash(object):
             'map': 'application/json'
         })[path_in_package_dist.split('.')[-1]]
 
+        return self._send_package_file(
+            package_name, path_in_package_dist, mimetype)
+
+    def _file_validators(self, package_name, path_in_package, path, data):
+        """
+        The ETag, modification time and size of a package file, hashed once
+        per version of the file.
+        """
+        if path is None:
+            key = (package_name, path_in_package)
+        else:
+            stat = os.stat(path)
+            key = (path, stat.st_mtime, stat.st_size)
+
+        validators = self._package_file_validators.get(key)
+        if validators is None:
+            if data is None:
+                content_hash = hashlib.sha1()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        content_hash.update(chunk)
+                size = key[2]
+            else:
+                content_hash = hashlib.sha1(data)
+                size = len(data)
+            validators = self._package_file_validators[key] = (
+                content_hash.hexdigest(),
+                None if path is None else int(key[1]),
+                size)
+        return validators
+
+    def _send_package_file(self, package_name, path_in_package, mimetype):
         headers = {
             'Cache-Control': 'public, max-age={}'.format(
                 self.config.components_cache_max_age)
         }
 
-        return Response(
-            pkgutil.get_data(package_name, path_in_package_dist),
-            mimetype=mimetype,
-            headers=headers
-        )
+        sendfile = self.config.components_sendfile
+        path = _package_file(package_name, path_in_package)
+        data = None
+        if sendfile == 'memory' or path is None:
+            # Zipped packages have no file to send.
+            data = pkgutil.get_data(package_name, path_in_package)
+
+        etag, modified, size = self._file_validators(
+            package_name, path_in_package, path, data)
+
+        if data is not None:
+            response = Response(data, mimetype=mimetype, headers=headers)
+        elif sendfile == 'x-sendfile':
+            headers['X-Sendfile'] = path
+            response = Response(mimetype=mimetype, headers=headers)
+        elif sendfile == 'x-accel-redirect':
+            headers['X-Accel-Redirect'] = '{}/{}'.format(
+                self.config.components_accel_redirect_prefix.rstrip('/'),
+                path.lstrip('/').replace(os.sep, '/'))
+            response = Response(mimetype=mimetype, headers=headers)
+        else:
+            # The wsgi.file_wrapper of the server sends it, without reading it.
+            response = Response(
+                wrap_file(flask.request.environ, open(path, 'rb')),
+                mimetype=mimetype, headers=headers, direct_passthrough=True)
+            response.content_length = size
+
+        response.set_etag(etag)
+        if modified is not None:
+            response.last_modified = modified
+
+        # The web server handles the ranges of the files it sends.
+        ranges = data is not None or sendfile == 'file'
+        if ranges:
+            response.headers['Accept-Ranges'] = 'bytes'
+        return response.make_conditional(
+            flask.request, accept_ranges=ranges,
+            complete_length=size if ranges else None)
+
+    def _preload_links(self):
+        """The `Link` preload values of the index stylesheets and scripts."""
+        links = []
+        css, scripts = self._index_resources()
+        for kind, attribute, urls in (
+                ('style', 'href', css), ('script', 'src', scripts)):
+            for url in urls:
+                params = ''
+                if isinstance(url, dict):
+                    if url.get('crossorigin'):
+                        params = '; crossorigin={}'.format(
+                            url['crossorigin'])
+                    elif 'crossorigin' in url:
+                        params = '; crossorigin'
+                    url = url.get(attribute)
+                    if not url:
+                        continue
+                links.append(
+                    '<{}>; rel=preload; as={}{}'.format(url, kind, params))
+        return links
+
+    def _serve_index(self, *args, **kwargs):
+        links = []
+        if self.config.preload_headers or self.config.early_hints:
+            links = self._preload_links()
+
+        early_hints = flask.request.environ.get('wsgi.early_hints')
+        if links and self.config.early_hints and early_hints is not None:
+            # A 103 response of the server, the browser fetches the
+            # resources while the page is generated.
+            early_hints([('Link', link) for link in links])
+
+        response = flask.make_response(self.index(*args, **kwargs))
+        if links and self.config.preload_headers:
+            response.headers['Link'] = ', '.join(links)
+        return response
 
     def index(self, *args, **kwargs):  # pylint: disable=unused-argument
         scripts = self._generate_scripts_html()
@@ -616,16 +1395,26 @@ class Dash(object):
                             app_entry=app_entry)
 
     def dependencies(self):
-        return flask.jsonify([
-            {
-                'output': {
-                    'id': k.split('.')[0],
-                    'property': k.split('.')[1]
-                },
+        return self._serve_json_payload(
+            'dependencies', len(self.callback_map),
+            self._dependencies_json)
+
+    def _dependencies_json(self):
+        dependencies = []
+        for k, v in self.callback_map.items():
+            outputs = []
+            for prop_id in self._dependency_graph.outputs(k):
+                output_id, output_property = prop_id.split('.', 1)
+                outputs.append({'id': output_id, 'property': output_property})
+            dependencies.append({
+                # The first output for the renderers without multi outputs.
+                'output': outputs[0],
+                'outputs': outputs,
                 'inputs': v['inputs'],
                 'state': v['state'],
-            } for k, v in self.callback_map.items()
-        ])
+                'layer': self._dependency_graph.layer(k),
+            })
+        return json.dumps(dependencies)
 
     # pylint: disable=unused-argument, no-self-use
     def react(self, *args, **kwargs):
@@ -638,11 +1427,27 @@ class Dash(object):
         # pylint: disable=too-many-branches
         layout = self._cached_layout or self._layout_value()
 
-        for i in inputs:
-            if output == i:
-                raise exceptions.SameInputOutputException(
-                    'Same output and input: {}'.format(output)
-                )
+        outputs = output if isinstance(output, list) else [output]
+        if not outputs:
+            raise exceptions.IncorrectTypeException(
+                'The output argument is an empty list, a callback needs '
+                'at least one `dash.dependencies.Output`.')
+        if isinstance(output, list) and _version_tuple(
+                dash_renderer.__version__) < _multi_outputs_renderer:
+            raise exceptions.CantHaveMultipleOutputs('''
+                A list of outputs needs dash-renderer {} or later to apply
+                the updates, the installed dash-renderer is {}. Use a
+                callback per output.
+            '''.format(
+                '.'.join(str(x) for x in _multi_outputs_renderer),
+                dash_renderer.__version__).replace('    ', ''))
+
+        for o in outputs:
+            for i in inputs:
+                if o == i:
+                    raise exceptions.SameInputOutputException(
+                        'Same output and input: {}'.format(o)
+                    )
 
         if (layout is None and
                 not self.config.first('suppress_callback_exceptions',
@@ -657,7 +1462,7 @@ class Dash(object):
                 `app.config['suppress_callback_exceptions']=True`
             '''.replace('    ', ''))
 
-        for args, obj, name in [([output], Output, 'Output'),
+        for args, obj, name in [(outputs, Output, 'Output'),
                                 (inputs, Input, 'Input'),
                                 (state, State, 'State')]:
 
@@ -746,24 +1551,28 @@ class Dash(object):
                 'elements' if len(state) > 1 else 'element'
             ).replace('    ', ''))
 
-        if '.' in output.component_id:
-            raise exceptions.IDsCantContainPeriods('''The Output element
-            `{}` contains a period in its ID.
-            Periods are not allowed in IDs right now.'''.format(
-                output.component_id
-            ))
+        output_ids = set()
+        for o in outputs:
+            if '.' in o.component_id:
+                raise exceptions.IDsCantContainPeriods('''The Output element
+                `{}` contains a period in its ID.
+                Periods are not allowed in IDs right now.'''.format(
+                    o.component_id
+                ))
 
-        callback_id = '{}.{}'.format(
-            output.component_id, output.component_property)
-        if callback_id in self.callback_map:
-            raise exceptions.CantHaveMultipleOutputs('''
-                You have already assigned a callback to the output
-                with ID "{}" and property "{}". An output can only have
-                a single callback function. Try combining your inputs and
-                callback functions together into one function.
-            '''.format(
-                output.component_id,
-                output.component_property).replace('    ', ''))
+            output_id = '{}.{}'.format(o.component_id, o.component_property)
+            if (output_id in output_ids or
+                    output_id in self.callback_map or
+                    self._dependency_graph.controller(output_id)):
+                raise exceptions.CantHaveMultipleOutputs('''
+                    You have already assigned a callback to the output
+                    with ID "{}" and property "{}". An output can only have
+                    a single callback function. Try combining your inputs and
+                    callback functions together into one function.
+                '''.format(
+                    o.component_id,
+                    o.component_property).replace('    ', ''))
+            output_ids.add(output_id)
 
     def _validate_callback_output(self, output_value, output):
         valid = [str, dict, int, float, type(None), Component]
@@ -879,15 +1688,44 @@ class Dash(object):
     # if a graph depends on a dropdown, the graph is the "observer" and the
     # dropdown is a "controller". In this case the graph's "dependency" is
     # the dropdown.
-    # TODO - Check this map for recursive or other ill-defined non-tree
-    # relationships
     # pylint: disable=dangerous-default-value
-    def callback(self, output, inputs=[], state=[]):
+    def callback(self, output, inputs=[], state=[], timeout=None,
+                 single_flight=False):
+        """
+        Register the decorated function as the callback updating `output`
+        from the values of `inputs` and `state`.
+
+        `output` can be a list of `Output` with dash-renderer 0.20.0 and
+        later, the function is then called once and returns a list or tuple
+        with the values of all the outputs.
+
+        With a `timeout` in seconds, the request fails with a 504 when the
+        function runs longer, `dash.callback_context.cancellation` is then
+        cancelled so the function can stop.
+
+        With `single_flight=True`, the identical requests received while the
+        function runs get its response instead of calling it again, for all
+        the clients. Only for functions whose output doesn't depend on the
+        user, `single_flight` can also be a function called in the request
+        returning the scope of the shared responses, like the user id.
+        """
         self._validate_callback(output, inputs, state)
 
-        callback_id = '{}.{}'.format(
-            output.component_id, output.component_property
-        )
+        multi = isinstance(output, list)
+        outputs = output if multi else [output]
+        output_ids = [
+            '{}.{}'.format(o.component_id, o.component_property)
+            for o in outputs
+        ]
+        callback_id = (
+            _multi_output_id(output_ids) if multi else output_ids[0])
+
+        # Raises on circular dependencies before anything is registered.
+        self._dependency_graph.add_callback(
+            callback_id, output_ids,
+            ['{}.{}'.format(c.component_id, c.component_property)
+             for c in inputs])
+        self._json_payloads.pop('dependencies', None)
         self.callback_map[callback_id] = {
             'inputs': [
                 {'id': c.component_id, 'property': c.component_property}
@@ -896,39 +1734,34 @@ class Dash(object):
             'state': [
                 {'id': c.component_id, 'property': c.component_property}
                 for c in state
-            ]
+            ],
+            'timeout': timeout,
+            'single_flight': single_flight
         }
 
         def wrap_func(func):
-            @wraps(func)
+            @functools.wraps(func)
             def add_context(*args, **kwargs):
 
                 output_value = func(*args, **kwargs)
-                response = {
-                    'response': {
-                        'props': {
-                            output.component_property: output_value
-                        }
-                    }
-                }
+                response = _callback_response(
+                    callback_id,
+                    self._callback_updates(callback_id, output_value))
 
                 try:
-                    jsonResponse = json.dumps(
-                        response,
-                        cls=plotly.utils.PlotlyJSONEncoder
-                    )
+                    jsonResponse = self._serializer.dumps(response)
                 except TypeError:
-                    self._validate_callback_output(output_value, output)
+                    for o, value in zip(outputs, output_value if multi
+                                        else [output_value]):
+                        self._validate_callback_output(value, o)
                     raise exceptions.InvalidCallbackReturnValue('''
-                    The callback for property `{property:s}`
-                    of component `{id:s}` returned a value
+                    The callback for `{}` returned a value
                     which is not JSON serializable.
 
                     In general, Dash properties can only be
                     dash components, strings, dictionaries, numbers, None,
                     or lists of those.
-                    '''.format(property=output.component_property,
-                               id=output.component_id))
+                    '''.format(callback_id))
 
                 return flask.Response(
                     jsonResponse,
@@ -936,18 +1769,164 @@ class Dash(object):
                 )
 
             self.callback_map[callback_id]['callback'] = add_context
+            self.callback_map[callback_id]['function'] = func
 
             return add_context
 
         return wrap_func
 
+    def _callback_updates(self, callback_id, output_value):
+        """The `(prop_id, value)` updates from a callback return value."""
+        output_ids = self._dependency_graph.outputs(callback_id)
+        if not _is_multi_output_id(callback_id):
+            return [(output_ids[0], output_value)]
+
+        if (not isinstance(output_value, (list, tuple)) or
+                len(output_value) != len(output_ids)):
+            raise exceptions.InvalidCallbackReturnValue('''
+                The callback for `{}` has {} outputs but returned
+                `{}`, expected a list or tuple of {} values.
+            '''.format(callback_id, len(output_ids), repr(output_value),
+                       len(output_ids)).replace('    ', ''))
+        return list(zip(output_ids, output_value))
+
+    def _request_json(self):
+        """The JSON body of the request and its decoded size."""
+        encoding = flask.request.headers.get(
+            'Content-Encoding', 'identity').strip().lower()
+        if encoding == 'identity':
+            return (flask.request.get_json(),
+                    flask.request.content_length or 0)
+
+        data = _compress.decompress_body(
+            flask.request.stream, encoding,
+            self.config.max_request_body_size)
+        try:
+            return json.loads(data.decode('utf-8')), len(data)
+        except ValueError:
+            raise BadRequest('Invalid JSON request body.')
+
     def dispatch(self):
-        body = flask.request.get_json()
+        body, body_size = self._request_json()
+        return self._dispatch_request(body, body_size)
+
+    def _dispatch_request(self, body, body_size):
+        """
+        The response of a `_dash-update-component` JSON body, of a POST or
+        a WebSocket message, of `body_size` bytes.
+        """
+        value_hashes = None
+        if self._value_hashes is not None:
+            # Cached by client, the session of the renderer.
+            value_hashes = self._value_hashes.resolve(
+                body.get('inputs', []) + body.get('state', []) +
+                body.get('values', []),
+                body_size,
+                body.get('sessionId'))
+
+        prerendered = self._prerendered_response(body)
+        if prerendered is not None:
+            return flask.Response(prerendered, mimetype='application/json')
+
+        token = None
+        if body.get('sessionId') is not None:
+            try:
+                sequence = int(body.get('sequence', 0))
+            except (TypeError, ValueError):
+                raise BadRequest('Invalid request sequence.')
+            # A newer request for the output of the same client cancels
+            # this one, its result would be discarded by the renderer.
+            token = flask.g.cancellation_token = self._supersede.start(
+                (body['sessionId'],
+                 json.dumps(body['output'], sort_keys=True)),
+                sequence)
+
+        response = self._dispatch_once(body, token)
+
+        if token is not None and token.cancelled:
+            raise exceptions.CallbackCancelled()
+        if value_hashes:
+            # The client can send these hashes instead of the values.
+            response.headers['X-Dash-Value-Hashes'] = json.dumps(
+                value_hashes)
+        return response
+
+    def _prerendered_response(self, body):
+        """The prerendered response of an initial request, if any."""
+        client = flask.request.cookies.get(_prerender.COOKIE)
+        if self._prerendered is None or client is None or \
+                body.get('chain'):
+            return None
+        values = {
+            '{}.{}'.format(x['id'], x['property']): x.get('value')
+            for x in body.get('inputs', []) + body.get('state', [])
+        }
+        return self._prerendered.pop(_prerender.PrerenderedResponses.key(
+            client, self._target_id(body['output']), values))
+
+    def _dispatch_once(self, body, token):
+        single_flight = self.callback_map.get(
+            self._target_id(body['output']), {}).get('single_flight')
+        if not single_flight:
+            return self._dispatch_admitted(body, token)
+        scope = single_flight() if callable(single_flight) else None
+
+        def run():
+            try:
+                response = self._dispatch_admitted(body, token)
+            except exceptions.CallbackCancelled:
+                # Cancelled for this client only, not shared.
+                raise
+            except exceptions.PreventUpdate:
+                return None
+            return (response.get_data(), response.status_code,
+                    response.mimetype)
+
+        result = self._single_flight.run(
+            _single_flight.request_key(body, scope), run)
+        if result is None:
+            raise exceptions.PreventUpdate
+        return flask.Response(
+            result[0], status=result[1], mimetype=result[2])
+
+    def _dispatch_admitted(self, body, token):
+        """Run the request within the admission limits, if any."""
+        if self._admission is None:
+            if token is not None:
+                token.raise_if_cancelled()
+            return self._dispatch(body)
+
+        with self._admission.admit(self._target_id(body['output']), token):
+            # The request may have been superseded while queued.
+            if token is not None:
+                token.raise_if_cancelled()
+            return self._dispatch(body)
+
+    def dispatch_stats(self):
+        """Counters of the callback requests, pushes and WebSocket server."""
+        stats = {}
+        if self._admission is not None:
+            stats['admission'] = self._admission.stats()
+        if self._value_hashes is not None:
+            stats['value_hashes'] = self._value_hashes.stats()
+        with self._lock:
+            stats['timeouts'] = dict(self._callback_timeouts)
+        stats['push'] = self._push.stats()
+        if self._websocket_server is not None:
+            stats['websocket'] = self._websocket_server.stats()
+        return stats
+
+    def _target_id(self, output):
+        if isinstance(output, dict):
+            # The callback updating the prop, with multiple outputs the
+            # renderer can also send the callback id.
+            output = '{}.{}'.format(output['id'], output['property'])
+        return self._dependency_graph.controller(output) or output
+
+    def _dispatch(self, body):
         inputs = body.get('inputs', [])
         state = body.get('state', [])
-        output = body['output']
-
-        target_id = '{}.{}'.format(output['id'], output['property'])
+        target_id = self._target_id(body['output'])
         args = []
 
         flask.g.input_values = input_values = {
@@ -978,7 +1957,144 @@ class Dash(object):
                 c['id'] == component_registration['id']
             ][0])
 
-        return self.callback_map[target_id]['callback'](*args)
+        if body.get('chain'):
+            return self._dispatch_chain(target_id, args, body)
+
+        return self._call_callback(
+            target_id, self.callback_map[target_id]['callback'], args)
+
+    def _call_callback(self, callback_id, func, args):
+        """
+        Call `func` with the stored values of the references in `args`,
+        under the timeout of `callback_id` if it has one.
+        """
+        args = [self.value_store.resolve(arg) for arg in args]
+        timeout = self.callback_map[callback_id].get('timeout')
+        if timeout is None:
+            return func(*args)
+
+        token = getattr(flask.g, 'cancellation_token', None)
+        if token is None:
+            token = flask.g.cancellation_token = (
+                _supersede.CancellationToken())
+        # The pool threads get a new `flask.g`.
+        context = dict(vars(flask.g))
+
+        @flask.copy_current_request_context
+        def run():
+            try:
+                for name, value in context.items():
+                    setattr(flask.g, name, value)
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._timeout_running -= 1
+
+        # A thread is reserved before the call so the timeout starts with
+        # the callback, the timed out callbacks hold theirs until they
+        # return.
+        with self._lock:
+            if self._timeout_running >= self.config.callback_timeout_workers:
+                raise exceptions.DispatchOverloaded(
+                    'All the {} callback timeout workers are busy.'.format(
+                        self.config.callback_timeout_workers))
+            self._timeout_running += 1
+            if self._timeout_pool is None:
+                self._timeout_pool = ThreadPool(
+                    self.config.callback_timeout_workers)
+        try:
+            return self._timeout_pool.apply_async(run).get(timeout)
+        except _PoolTimeoutError:
+            token.cancel()
+            with self._lock:
+                self._callback_timeouts[callback_id] += 1
+            raise exceptions.CallbackTimeout(
+                'The callback for `{}` took more than {} seconds.'.format(
+                    callback_id, timeout),
+                callback_id, timeout)
+
+    def _dispatch_chain(self, target_id, args, body):
+        """
+        Run the triggered callback and then the callbacks downstream of its
+        output, all the updated props are returned in one response.
+
+        The renderer sends the current value of the props in `values`.
+        The response `callbacks` are the callbacks resolved by the chain,
+        PreventUpdate included. The downstream callbacks missing a value
+        and the callbacks depending on their outputs are left to the
+        renderer, so that none runs with a stale value.
+        """
+        values = {
+            '{}.{}'.format(x['id'], x['property']): x.get('value')
+            for x in body.get('values', [])
+        }
+        values.update(flask.g.state_values)
+        values.update(flask.g.input_values)
+
+        # PreventUpdate from the triggered callback is a 204 as usual.
+        updates = collections.OrderedDict(self._callback_updates(
+            target_id, self._call_callback(
+                target_id, self.callback_map[target_id]['function'], args)))
+        values.update(updates)
+        callbacks = [target_id]
+        # The outputs of the callbacks left to the renderer.
+        unresolved = set()
+
+        for callback_id in self._dependency_graph.downstream(list(updates)):
+            registration = self.callback_map[callback_id]
+            input_ids = ['{}.{}'.format(x['id'], x['property'])
+                         for x in registration['inputs']]
+            state_ids = ['{}.{}'.format(x['id'], x['property'])
+                         for x in registration['state']]
+            if any(x in unresolved for x in input_ids + state_ids):
+                unresolved.update(self._dependency_graph.outputs(callback_id))
+                continue
+            triggered = [x for x in input_ids if x in updates]
+            if not triggered:
+                continue
+            if any(x not in values for x in input_ids + state_ids):
+                unresolved.update(self._dependency_graph.outputs(callback_id))
+                continue
+
+            flask.g.input_values = {x: values[x] for x in input_ids}
+            flask.g.state_values = {x: values[x] for x in state_ids}
+            flask.g.triggered_inputs = [
+                {'prop_id': x, 'value': values[x]} for x in triggered
+            ]
+            try:
+                callback_updates = self._callback_updates(
+                    callback_id, self._call_callback(
+                        callback_id, registration['function'],
+                        [values[x] for x in input_ids + state_ids]))
+            except exceptions.PreventUpdate:
+                # Resolved, its outputs keep their current values.
+                callbacks.append(callback_id)
+                continue
+
+            updates.update(callback_updates)
+            values.update(callback_updates)
+            callbacks.append(callback_id)
+
+        try:
+            json_response = self._serializer.dumps({
+                'multi': True,
+                'response': _updates_response(updates.items()),
+                'callbacks': callbacks
+            })
+        except TypeError:
+            for prop_id, value in updates.items():
+                self._validate_callback_output(
+                    value, Output(*prop_id.split('.', 1)))
+            raise exceptions.InvalidCallbackReturnValue('''
+            The callbacks chained from `{}` returned a value
+            which is not JSON serializable.
+
+            In general, Dash properties can only be
+            dash components, strings, dictionaries, numbers, None,
+            or lists of those.
+            '''.format(target_id))
+
+        return flask.Response(json_response, mimetype='application/json')
 
     def _validate_layout(self):
         if self.layout is None:
@@ -1059,13 +2175,7 @@ class Dash(object):
         return err.args[0], 404
 
     def _serve_default_favicon(self):
-        headers = {
-            'Cache-Control': 'public, max-age={}'.format(
-                self.config.components_cache_max_age)
-        }
-        return flask.Response(pkgutil.get_data('dash', 'favicon.ico'),
-                              headers=headers,
-                              content_type='image/x-icon')
+        return self._send_package_file('dash', 'favicon.ico', 'image/x-icon')
 
     def get_asset_url(self, path):
         asset = _get_asset_path(
@@ -1207,17 +2317,20 @@ class Dash(object):
         self._lock.acquire()
         self._hard_reload = True
         self._reload_hash = _generate_hash()
+        files = []
 
         if self._assets_folder in filename:
             asset_path = os.path.relpath(
                 filename, os.path.commonprefix([self._assets_folder, filename])
             ).replace('\\', '/').lstrip('/')
 
-            self._changed_assets.append({
+            changed = {
                 'url': self.get_asset_url(asset_path),
                 'modified': int(modified),
                 'is_css': filename.endswith('css')
-            })
+            }
+            self._changed_assets.append(changed)
+            files = [changed]
 
             if filename not in self._assets_files and not deleted:
                 res = self._add_assets_resource(asset_path, filename)
@@ -1230,22 +2343,27 @@ class Dash(object):
                 if filename in self._assets_files:
                     self._assets_files.remove(filename)
 
+                # pylint: disable=protected-access
                 def delete_resource(resources):
                     to_delete = None
-                    for r in resources:
+                    for r in resources._resources:
                         if r.get('asset_path') == asset_path:
                             to_delete = r
                             break
                     if to_delete:
-                        resources.remove(to_delete)
+                        resources.remove_resource(to_delete)
 
                 if filename.endswith('js'):
                     # pylint: disable=protected-access
-                    delete_resource(self.scripts._resources._resources)
+                    delete_resource(self.scripts._resources)
                 elif filename.endswith('css'):
                     # pylint: disable=protected-access
-                    delete_resource(self.css._resources._resources)
+                    delete_resource(self.css._resources)
 
+        self._reload_event_id += 1
+        self._reload_events.append(
+            (self._reload_event_id, self._reload_event(True, files)))
+        self._reload_condition.notify_all()
         self._lock.release()
 
     def run_server(self,
@@ -1,6 +1,8 @@
 import collections
 import abc
 import inspect
+import itertools
+import json
 import sys
 
 import six
@@ -13,6 +15,14 @@ class ComponentRegistry:
     """Holds a registry of the namespaces used by components."""
 
     registry = set()
+    # Incremented when a namespace is added, for the cached resources.
+    generation = 0
+
+    @classmethod
+    def add(cls, namespace):
+        if namespace not in cls.registry:
+            cls.registry.add(namespace)
+            cls.generation += 1
 
     @classmethod
     def get_resources(cls, resource_name):
@@ -37,11 +47,151 @@ class ComponentMeta(abc.ABCMeta):
             # as it doesn't have the namespace.
             return component
 
-        ComponentRegistry.registry.add(module)
+        ComponentRegistry.add(module)
 
         return component
 
 
+_PlotlyJsonSerializer = collections.namedtuple(
+    '_PlotlyJsonSerializer',
+    ['prop_names', 'wildcards', 'to_plotly_json', 'write_plotly_json',
+     'generation']
+)
+
+_serializers = {}
+_serializer_generations = itertools.count()
+
+# Instance attributes set by the generated components `__init__`,
+# `available_events` by the components generated before dash 0.37.
+_meta_keys = frozenset([
+    '_prop_names', '_type', '_namespace', '_valid_wildcard_attributes',
+    'available_properties', 'available_wildcard_properties',
+    'available_events'
+])
+
+_serializer_template = '''
+def to_plotly_json(self):
+    d = self.__dict__
+    props = {{}}
+{dict_props}
+{dict_wildcards}
+    return {{
+        'props': props,
+        'type': self._type,
+        'namespace': self._namespace
+    }}
+
+
+def write_plotly_json(self, chunks, write_value):
+    d = self.__dict__
+    append = chunks.append
+    sep = ''
+    append('{{"props": {{')
+{write_props}
+{write_wildcards}
+    append('}}, "type": ')
+    append(encode_string(self._type))
+    append(', "namespace": ')
+    append(encode_string(self._namespace))
+    append('}}')
+'''
+
+
+def _compile_serializer(component_class, prop_names, wildcards):
+    """
+    Generate the `to_plotly_json` functions of a component class.
+
+    The lookups of the declared props are unrolled so that a serialization
+    is a single pass over the instance `__dict__`. Props shadowing a class
+    attribute are read with `getattr` to keep the `hasattr` semantics.
+    """
+    dict_props = []
+    write_props = []
+    for prop in prop_names:
+        key = repr(str(prop))
+        if hasattr(component_class, prop):
+            value = 'getattr(self, {})'.format(key)
+            condition = 'True'
+        else:
+            value = 'd[{}]'.format(key)
+            condition = '{} in d'.format(key)
+        dict_props.append(
+            '    if {}:\n        props[{}] = {}'.format(condition, key, value))
+        write_props.append(
+            '    if {condition}:\n'
+            '        v = {value}\n'
+            '        if type(v) in string_types:\n'
+            '            append(sep + {key} + encode_string(v))\n'
+            '        elif v is None:\n'
+            '            append(sep + {key} + \'null\')\n'
+            '        else:\n'
+            '            append(sep + {key})\n'
+            '            write_value(v, chunks)\n'
+            '        sep = \', \''.format(
+                condition=condition,
+                key=repr(json.dumps(prop) + ': '),
+                value=value))
+
+    dict_wildcards = write_wildcards = ''
+    if wildcards:
+        # Most instances have no extra attribute, checking it first
+        # spares the `startswith` calls on the declared props.
+        dict_wildcards = (
+            '    if not known_keys.issuperset(d):\n'
+            '        for k in d:\n'
+            '            if k not in known_keys and k.startswith(wildcards):\n'
+            '                props[k] = d[k]'
+        )
+        write_wildcards = (
+            '    if not known_keys.issuperset(d):\n'
+            '        for k in d:\n'
+            '            if k in known_keys or not k.startswith(wildcards):\n'
+            '                continue\n'
+            '            append(sep + encode_string(k) + \': \')\n'
+            '            write_value(d[k], chunks)\n'
+            '            sep = \', \''
+        )
+
+    source = _serializer_template.format(
+        dict_props='\n'.join(dict_props),
+        dict_wildcards=dict_wildcards,
+        write_props='\n'.join(write_props),
+        write_wildcards=write_wildcards
+    )
+    namespace = {
+        'wildcards': tuple(wildcards),
+        'known_keys': _meta_keys.union(prop_names),
+        'string_types': six.string_types,
+        'encode_string': json.encoder.encode_basestring_ascii
+    }
+    # pylint: disable=exec-used
+    exec(compile(source, '<{} serializer>'.format(
+        component_class.__name__), 'exec'), namespace)
+
+    return _PlotlyJsonSerializer(
+        prop_names, wildcards,
+        namespace['to_plotly_json'], namespace['write_plotly_json'],
+        next(_serializer_generations))
+
+
+# pylint: disable=protected-access
+def _get_serializer(component):
+    component_class = type(component)
+    prop_names = component._prop_names
+    wildcards = component._valid_wildcard_attributes
+    serializer = _serializers.get(component_class)
+    # The instances share the class lists, compared by identity first.
+    if (serializer is None or
+            serializer.prop_names is not prop_names and
+            serializer.prop_names != prop_names or
+            serializer.wildcards is not wildcards and
+            serializer.wildcards != wildcards):
+        serializer = _compile_serializer(
+            component_class, prop_names, wildcards)
+        _serializers[component_class] = serializer
+    return serializer
+
+
 def is_number(s):
     try:
         float(s)
@@ -98,26 +248,9 @@ class Component(patch_collections_abc('MutableMapping')):
             setattr(self, k, v)
 
     def to_plotly_json(self):
-        # Add normal properties
-        props = {
-            p: getattr(self, p)
-            for p in self._prop_names  # pylint: disable=no-member
-            if hasattr(self, p)
-        }
-        # Add the wildcard properties data-* and aria-*
-        props.update({
-            k: getattr(self, k)
-            for k in self.__dict__
-            if any(k.startswith(w) for w in
-                   self._valid_wildcard_attributes)  # pylint:disable=no-member
-        })
-        as_json = {
-            'props': props,
-            'type': self._type,  # pylint: disable=no-member
-            'namespace': self._namespace  # pylint: disable=no-member
-        }
-
-        return as_json
+        # The normal properties and the wildcard properties data-* and aria-*
+        # are collected by a serializer compiled once per component class.
+        return _get_serializer(self).to_plotly_json(self)
 
     # pylint: disable=too-many-branches, too-many-return-statements
     # pylint: disable=redefined-builtin, inconsistent-return-statements
@@ -37,7 +37,7 @@ def load_components(metadata_path,
     """
 
     # Register the component lib for index include.
-    ComponentRegistry.registry.add(namespace)
+    ComponentRegistry.add(namespace)
     components = []
 
     data = _get_metadata(metadata_path)
@@ -46,10 +46,35 @@ class CantHaveMultipleOutputs(CallbackException):
     pass
 
 
+class CircularDependencyException(CallbackException):
+    pass
+
+
 class PreventUpdate(CallbackException):
     pass
 
 
+class CallbackCancelled(PreventUpdate):
+    pass
+
+
+class ExpiredValueReference(CallbackException):
+    pass
+
+
+class UnknownValueHash(CallbackException):
+    def __init__(self, message, missing):
+        super(UnknownValueHash, self).__init__(message)
+        self.missing = missing
+
+
+class CallbackTimeout(CallbackException):
+    def __init__(self, message, callback_id, timeout):
+        super(CallbackTimeout, self).__init__(message)
+        self.callback_id = callback_id
+        self.timeout = timeout
+
+
 class DuplicateIdError(DashException):
     pass
 
@@ -58,10 +83,22 @@ class InvalidCallbackReturnValue(CallbackException):
     pass
 
 
+class DispatchOverloaded(DashException):
+    def __init__(self, message, retry_after=1):
+        super(DispatchOverloaded, self).__init__(message)
+        self.retry_after = retry_after
+
+
 class InvalidConfig(DashException):
     pass
 
 
+class WebSocketProtocolError(DashException):
+    def __init__(self, message, code=1002):
+        super(WebSocketProtocolError, self).__init__(message)
+        self.code = code
+
+
 class InvalidResourceError(DashException):
     pass
 
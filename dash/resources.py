@@ -1,19 +1,70 @@
 import json
 import warnings
 import os
+import sys
 
-from .development.base_component import ComponentRegistry
+from .development.base_component import Component, ComponentRegistry
 from . import exceptions
 
 
+def _layout_namespaces(layout):
+    """The namespaces of the components in `layout`."""
+    namespaces = {layout._namespace}  # pylint: disable=protected-access
+    for item in layout.traverse():
+        if isinstance(item, Component):
+            namespaces.add(item._namespace)  # pylint: disable=protected-access
+    return namespaces
+
+
+def _assets_unchanged(assets):
+    # The cache busting `ts` of the assets must follow their changes.
+    for filepath, mtime in assets:
+        try:
+            if os.stat(filepath).st_mtime != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _dist_fingerprint(resource_name):
+    """
+    The identity and length of the `_js_dist` or `_css_dist` lists of the
+    registered libraries, a replaced or extended list changes it.
+    """
+    fingerprint = []
+    for module_name in ComponentRegistry.registry:
+        dist = getattr(sys.modules[module_name], resource_name, None)
+        fingerprint.append((module_name, id(dist), len(dist or ())))
+    return tuple(fingerprint)
+
+
 class Resources:
     def __init__(self, resource_name, layout):
         self._resources = []
         self.resource_name = resource_name
         self.layout = layout
+        # The filtered resources by `dev_bundles` and config, valid for a
+        # registry generation, the libraries dists and a version of the
+        # resources and layout.
+        self._version = 0
+        self._cache = {}
+        self._cache_version = None
+
+    def _invalidate(self):
+        self._version += 1
 
     def append_resource(self, resource):
         self._resources.append(resource)
+        self._invalidate()
+
+    def remove_resource(self, resource):
+        self._resources.remove(resource)
+        self._invalidate()
+
+    def _update_layout(self, layout):
+        self.layout = layout
+        self._invalidate()
 
     def _filter_resources(self, all_resources, dev_bundles=False):
         filtered_resources = []
@@ -59,11 +110,42 @@ class Resources:
 
         return filtered_resources
 
-    def get_all_resources(self, dev_bundles=False):
-        lib_resources = ComponentRegistry.get_resources(self.resource_name)
-        all_resources = lib_resources + self._resources
+    def _infer_resources(self, lib_resources):
+        """
+        Mark the resources of the namespaces not in the layout `dynamic`,
+        they are loaded when a callback returns one of their components.
+        """
+        if not self.config.infer_from_layout or self.layout is None:
+            return lib_resources
+
+        used = _layout_namespaces(self.layout)
+        resources = []
+        for s in lib_resources:
+            if 'namespace' in s and s['namespace'] not in used:
+                s = dict(s, dynamic=True)
+            resources.append(s)
+        return resources
 
-        return self._filter_resources(all_resources, dev_bundles)
+    def get_all_resources(self, dev_bundles=False):
+        version = (ComponentRegistry.generation, self._version,
+                   _dist_fingerprint(self.resource_name))
+        if version != self._cache_version:
+            self._cache = {}
+            self._cache_version = version
+
+        key = (dev_bundles, self.config.serve_locally,
+               self.config.infer_from_layout)
+        cached = self._cache.get(key)
+        if cached is None or not _assets_unchanged(cached[1]):
+            lib_resources = self._infer_resources(
+                ComponentRegistry.get_resources(self.resource_name))
+            all_resources = lib_resources + self._resources
+            assets = [(s['filepath'], os.stat(s['filepath']).st_mtime)
+                      for s in all_resources if 'asset_path' in s]
+            cached = self._cache[key] = (
+                self._filter_resources(all_resources, dev_bundles), assets)
+
+        return list(cached[0])
 
 
 class Css:
@@ -72,7 +154,8 @@ class Css:
         self._resources.config = self.config
 
     def _update_layout(self, layout):
-        self._resources.layout = layout
+        # pylint: disable=protected-access
+        self._resources._update_layout(layout)
 
     def append_css(self, stylesheet):
         self._resources.append_resource(stylesheet)
@@ -82,7 +165,7 @@ class Css:
 
     # pylint: disable=no-init, too-few-public-methods
     class config:
-        infer_from_layout = True
+        infer_from_layout = False
         serve_locally = False
 
 
@@ -92,7 +175,8 @@ class Scripts:
         self._resources.config = self.config
 
     def _update_layout(self, layout):
-        self._resources.layout = layout
+        # pylint: disable=protected-access
+        self._resources._update_layout(layout)
 
     def append_script(self, script):
         self._resources.append_resource(script)
@@ -102,5 +186,5 @@ class Scripts:
 
     # pylint: disable=no-init, too-few-public-methods
     class config:
-        infer_from_layout = True
+        infer_from_layout = False
         serve_locally = False
@@ -18,7 +18,6 @@ setup(
     long_description_content_type='text/markdown',
     install_requires=[
         'Flask>=0.12',
-        'flask-compress',
         'plotly',
         'dash_renderer==0.18.0',
         'dash-core-components==0.43.1',
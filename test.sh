@@ -5,6 +5,24 @@ python -m unittest tests.development.test_component_loader || EXIT_STATE=$?
 python -m unittest tests.test_integration || EXIT_STATE=$?
 python -m unittest tests.test_resources || EXIT_STATE=$?
 python -m unittest tests.test_configs || EXIT_STATE=$?
+python -m unittest tests.test_serialization || EXIT_STATE=$?
+python -m unittest tests.test_dependency_graph || EXIT_STATE=$?
+python -m unittest tests.test_chain_dispatch || EXIT_STATE=$?
+python -m unittest tests.test_multi_outputs || EXIT_STATE=$?
+python -m unittest tests.test_prerender || EXIT_STATE=$?
+python -m unittest tests.test_single_flight || EXIT_STATE=$?
+python -m unittest tests.test_supersede || EXIT_STATE=$?
+python -m unittest tests.test_admission || EXIT_STATE=$?
+python -m unittest tests.test_callback_timeout || EXIT_STATE=$?
+python -m unittest tests.test_value_store || EXIT_STATE=$?
+python -m unittest tests.test_value_hashes || EXIT_STATE=$?
+python -m unittest tests.test_compress || EXIT_STATE=$?
+python -m unittest tests.test_component_suites || EXIT_STATE=$?
+python -m unittest tests.test_index_preload || EXIT_STATE=$?
+python -m unittest tests.test_reload_events || EXIT_STATE=$?
+python -m unittest tests.test_dispatch || EXIT_STATE=$?
+python -m unittest tests.test_push || EXIT_STATE=$?
+python -m unittest tests.test_websocket || EXIT_STATE=$?
 
 pylint dash setup.py --rcfile=$PYLINTRC || EXIT_STATE=$?
 pylint tests -d all -e C0410,C0411,C0412,C0413,W0109 || EXIT_STATE=$?
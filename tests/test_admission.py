@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output
+from dash import exceptions
+from dash._admission import AdmissionController
+from dash._supersede import CancellationToken
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    def hold(self, admission, callback_id):
+        """Keep a slot of `callback_id` until the returned event is set."""
+        admitted = threading.Event()
+        release = threading.Event()
+
+        def run():
+            with admission.admit(callback_id):
+                admitted.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.assertTrue(admitted.wait(5))
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        return release
+
+    def test_reject_without_queue(self):
+        admission = AdmissionController(max_in_flight=1)
+        self.hold(admission, 'a')
+
+        with self.assertRaises(exceptions.DispatchOverloaded) as cm:
+            with admission.admit('b'):
+                pass
+        self.assertEqual(cm.exception.retry_after, 1)
+        self.assertEqual(admission.stats()['rejected'], {'b': 1})
+        self.assertEqual(admission.stats()['in_flight'], 1)
+
+    def test_queued_until_slot_released(self):
+        admission = AdmissionController(
+            max_in_flight=1, max_queue=1, queue_timeout=5)
+        release = self.hold(admission, 'a')
+        threading.Timer(0.1, release.set).start()
+
+        with admission.admit('b'):
+            stats = admission.stats()
+        self.assertEqual(stats['admitted'], 2)
+        self.assertGreater(stats['max_queue_time'], 0)
+
+    def test_queue_timeout(self):
+        admission = AdmissionController(
+            max_in_flight=1, max_queue=1, queue_timeout=0.1)
+        self.hold(admission, 'a')
+
+        started = time.time()
+        with self.assertRaises(exceptions.DispatchOverloaded):
+            with admission.admit('b'):
+                pass
+        self.assertGreaterEqual(time.time() - started, 0.1)
+        self.assertEqual(admission.stats()['queued'], 0)
+
+    def test_per_callback_limit(self):
+        admission = AdmissionController(
+            max_in_flight=4, max_per_callback=1, max_queue=4,
+            queue_timeout=0.2)
+        self.hold(admission, 'slow')
+
+        def admit_slow():
+            try:
+                with admission.admit('slow'):
+                    pass
+            except exceptions.DispatchOverloaded:
+                pass
+
+        # A second `slow` request waits in the queue.
+        queued = threading.Thread(target=admit_slow)
+        queued.start()
+        time.sleep(0.05)
+
+        # The queue of `slow` is full, the other callbacks still run.
+        with self.assertRaises(exceptions.DispatchOverloaded):
+            with admission.admit('slow'):
+                pass
+        with admission.admit('fast'):
+            pass
+        queued.join()
+        self.assertEqual(admission.stats()['rejected'], {'slow': 2})
+
+    def test_cancelled_while_queued(self):
+        admission = AdmissionController(
+            max_in_flight=1, max_queue=1, queue_timeout=5)
+        self.hold(admission, 'a')
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        started = time.time()
+        with self.assertRaises(exceptions.CallbackCancelled):
+            with admission.admit('a', token):
+                pass
+        # The queue slot is released at once, not at the timeout.
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(admission.stats()['queued'], 0)
+        self.assertEqual(admission.stats()['rejected'], {})
+
+
+class TestAdmission(unittest.TestCase):
+    def test_overloaded_dispatch(self):
+        app = dash.Dash('my-app', max_dispatches=1)
+        app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+        started = threading.Event()
+        release = threading.Event()
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'value')])
+        def update(value):
+            started.set()
+            release.wait(5)
+            return value
+
+        def dispatch():
+            return app.server.test_client().post(
+                '/_dash-update-component',
+                data=json.dumps({
+                    'output': {'id': 'output', 'property': 'children'},
+                    'inputs': [{'id': 'input', 'property': 'value',
+                                'value': 'x'}]
+                }),
+                content_type='application/json')
+
+        running = threading.Thread(target=dispatch)
+        running.start()
+        self.assertTrue(started.wait(5))
+        try:
+            response = dispatch()
+        finally:
+            release.set()
+            running.join()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertEqual(
+            app.dispatch_stats()['admission']['rejected'],
+            {'output.children': 1})
@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output
+
+
+class TestCallbackTimeout(unittest.TestCase):
+    def test_timeout(self):
+        app = dash.Dash('my-app')
+        app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+        stopped = threading.Event()
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'value')], timeout=0.2)
+        def update(value):
+            if value == 'fast':
+                return [value, dash.callback_context.inputs]
+            while not dash.callback_context.cancellation.cancelled:
+                time.sleep(0.01)
+            stopped.set()
+
+        def dispatch(value):
+            return app.server.test_client().post(
+                '/_dash-update-component',
+                data=json.dumps({
+                    'output': {'id': 'output', 'property': 'children'},
+                    'inputs': [{'id': 'input', 'property': 'value',
+                                'value': value}]
+                }),
+                content_type='application/json')
+
+        response = dispatch('fast')
+        self.assertEqual(json.loads(response.data), {'response': {'props': {
+            'children': ['fast', {'input.value': 'fast'}]}}})
+
+        response = dispatch('slow')
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(json.loads(response.data), {'error': {
+            'type': 'CallbackTimeout',
+            'message': 'The callback for `output.children` took more '
+                       'than 0.2 seconds.',
+            'callback': 'output.children',
+            'timeout': 0.2
+        }})
+        self.assertTrue(stopped.wait(5))
+        self.assertEqual(app.dispatch_stats()['timeouts'],
+                         {'output.children': 1})
+
+    def test_busy_workers(self):
+        app = dash.Dash('my-app', callback_timeout_workers=1)
+        app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+        release = threading.Event()
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'value')], timeout=0.1)
+        def update(value):
+            if value == 'stuck':
+                # Ignores the cancellation, it keeps its worker.
+                release.wait(5)
+            return value
+
+        def dispatch(value):
+            return app.server.test_client().post(
+                '/_dash-update-component',
+                data=json.dumps({
+                    'output': {'id': 'output', 'property': 'children'},
+                    'inputs': [{'id': 'input', 'property': 'value',
+                                'value': value}]
+                }),
+                content_type='application/json')
+
+        self.assertEqual(dispatch('stuck').status_code, 504)
+        # Rejected at once instead of timing out in the pool queue.
+        response = dispatch('fast')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+        release.set()
+        for _ in range(100):
+            if dispatch('fast').status_code == 200:
+                break
+            time.sleep(0.01)
+        else:
+            self.fail('The worker was not released.')
@@ -0,0 +1,115 @@
+import json
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output, State
+from dash import exceptions
+
+
+class TestChainDispatch(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app')
+        self.app.layout = Div([
+            dcc.Input(id='a', value='a'),
+            dcc.Input(id='b'),
+            dcc.Input(id='c'),
+            dcc.Input(id='d'),
+            dcc.Input(id='s', value='s'),
+            Div(id='out'),
+            Div(id='b-c')
+        ])
+        self.calls = []
+
+        @self.app.callback(Output('b', 'value'), [Input('a', 'value')])
+        def b(a):
+            self.calls.append('b')
+            return a + 'b'
+
+        @self.app.callback(Output('c', 'value'), [Input('b', 'value')],
+                           [State('s', 'value')])
+        def c(b, s):
+            self.calls.append('c')
+            return b + 'c' + s
+
+        @self.app.callback(Output('d', 'value'), [Input('c', 'value')])
+        def d(c):
+            self.calls.append('d')
+            raise exceptions.PreventUpdate
+
+        @self.app.callback(Output('out', 'children'),
+                           [Input('d', 'value'), Input('c', 'value')])
+        def out(d, c):
+            self.calls.append('out')
+            return [d, c, dash.callback_context.triggered]
+
+        self.client = self.app.server.test_client()
+
+    def dispatch(self, body):
+        return self.client.post(
+            '/_dash-update-component',
+            data=json.dumps(body), content_type='application/json')
+
+    def test_chain_in_one_response(self):
+        response = self.dispatch({
+            'output': {'id': 'b', 'property': 'value'},
+            'inputs': [{'id': 'a', 'property': 'value', 'value': 'x'}],
+            'state': [],
+            'changedPropIds': ['a.value'],
+            'chain': True,
+            'values': [
+                {'id': 'd', 'property': 'value', 'value': 'old-d'},
+                {'id': 's', 'property': 'value', 'value': 's'},
+            ]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {
+            'multi': True,
+            'response': {
+                'b': {'value': 'xb'},
+                'c': {'value': 'xbcs'},
+                'out': {'children': [
+                    'old-d', 'xbcs',
+                    [{'prop_id': 'c.value', 'value': 'xbcs'}]
+                ]}
+            },
+            # The callback d raised PreventUpdate.
+            'callbacks': ['b.value', 'c.value', 'd.value', 'out.children']
+        })
+        self.assertEqual(self.calls, ['b', 'c', 'd', 'out'])
+
+    def test_missing_values_are_left_to_the_renderer(self):
+        response = self.dispatch({
+            'output': {'id': 'b', 'property': 'value'},
+            'inputs': [{'id': 'a', 'property': 'value', 'value': 'x'}],
+            'chain': True
+        })
+        self.assertEqual(json.loads(response.data)['callbacks'], ['b.value'])
+        self.assertEqual(self.calls, ['b'])
+
+    def test_unresolved_outputs_are_left_to_the_renderer(self):
+        @self.app.callback(Output('b-c', 'children'),
+                           [Input('b', 'value')], [State('c', 'value')])
+        def b_c(b, c):
+            self.calls.append('b-c')
+            return b + c
+
+        # c misses the value of s, b-c would read its stale output.
+        response = self.dispatch({
+            'output': {'id': 'b', 'property': 'value'},
+            'inputs': [{'id': 'a', 'property': 'value', 'value': 'x'}],
+            'chain': True,
+            'values': [{'id': 'c', 'property': 'value', 'value': 'old-c'}]
+        })
+        self.assertEqual(json.loads(response.data)['callbacks'], ['b.value'])
+        self.assertEqual(self.calls, ['b'])
+
+    def test_without_chain(self):
+        response = self.dispatch({
+            'output': {'id': 'b', 'property': 'value'},
+            'inputs': [{'id': 'a', 'property': 'value', 'value': 'x'}]
+        })
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'value': 'xb'}}})
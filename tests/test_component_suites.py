@@ -0,0 +1,93 @@
+import pkgutil
+import unittest
+
+from dash_html_components import Div
+import dash_renderer
+
+import dash
+from dash import exceptions
+
+
+class TestComponentSuitesFiles(unittest.TestCase):
+    path = dash_renderer._js_dist[0]['relative_package_path']
+
+    def get(self, sendfile):
+        app = dash.Dash('my-app', components_sendfile=sendfile)
+        app.layout = Div()
+        app.registered_paths['dash_renderer'].add(self.path)
+        response = app.server.test_client().get(
+            '/_dash-component-suites/dash_renderer/' + self.path)
+        self.addCleanup(response.close)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers['Cache-Control'], 'public, max-age=2678400')
+        return response
+
+    def test_file(self):
+        data = pkgutil.get_data('dash_renderer', self.path)
+        for sendfile in ('file', 'memory'):
+            self.assertEqual(self.get(sendfile).data, data)
+
+    def test_headers(self):
+        response = self.get('x-sendfile')
+        self.assertEqual(response.data, b'')
+        filename = response.headers['X-Sendfile']
+        with open(filename, 'rb') as f:
+            self.assertEqual(
+                f.read(), pkgutil.get_data('dash_renderer', self.path))
+
+        response = self.get('x-accel-redirect')
+        self.assertEqual(
+            response.headers['X-Accel-Redirect'],
+            '/_dash-files/' + filename.lstrip('/'))
+
+    def test_invalid(self):
+        with self.assertRaises(exceptions.InvalidConfig):
+            dash.Dash('my-app', components_sendfile='mmap')
+
+    def test_conditional_get(self):
+        url = '/_dash-component-suites/dash_renderer/' + self.path
+        data = pkgutil.get_data('dash_renderer', self.path)
+        for sendfile in ('file', 'memory'):
+            app = dash.Dash('my-app', components_sendfile=sendfile)
+            app.layout = Div()
+            app.registered_paths['dash_renderer'].add(self.path)
+            client = app.server.test_client()
+
+            response = client.get(url)
+            response.close()
+            self.assertEqual(response.headers['Accept-Ranges'], 'bytes')
+            etag = response.headers['ETag']
+            modified = response.headers['Last-Modified']
+
+            for headers in ({'If-None-Match': etag},
+                            {'If-Modified-Since': modified}):
+                response = client.get(url, headers=headers)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.data, b'')
+
+            response = client.get(url, headers={'If-None-Match': '"other"'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, data)
+
+            response = client.get(url, headers={'Range': 'bytes=10-19'})
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response.data, data[10:20])
+            self.assertEqual(
+                response.headers['Content-Range'],
+                'bytes 10-19/{}'.format(len(data)))
+            response.close()
+
+    def test_favicon(self):
+        app = dash.Dash('my-app')
+        app.layout = Div()
+        client = app.server.test_client()
+
+        response = client.get('/_favicon.ico')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data, pkgutil.get_data('dash', 'favicon.ico'))
+        response = client.get(
+            '/_favicon.ico',
+            headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,197 @@
+import gzip
+import io
+import json
+import unittest
+import zlib
+
+from flask import Response
+from werkzeug.exceptions import (
+    BadRequest, RequestEntityTooLarge, UnsupportedMediaType)
+from werkzeug.http import parse_accept_header
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output
+from dash import _compress
+from dash._compress import Compressor
+
+
+def accept(value):
+    return parse_accept_header(value)
+
+
+class CompressorTest(unittest.TestCase):
+    data = b'{"a": [' + b', '.join([b'1234'] * 1000) + b']}'
+
+    def response(self, data=None, etag=None):
+        response = Response(data or self.data, mimetype='application/json')
+        if etag:
+            response.set_etag(etag)
+        return response
+
+    def test_gzip(self):
+        compressor = Compressor()
+        response = compressor.compress(
+            self.response(), 'default', accept('gzip, deflate'))
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.GzipFile(
+            fileobj=io.BytesIO(response.get_data())).read(), self.data)
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+
+    def test_brotli(self):
+        if _compress.brotli is None:
+            self.skipTest('brotli is not installed')
+        compressor = Compressor()
+        response = compressor.compress(
+            self.response(), 'default', accept('gzip, br'))
+
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(
+            _compress.brotli.decompress(response.get_data()), self.data)
+
+        response = compressor.compress(
+            self.response(), 'default', accept('gzip, br;q=0'))
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+    def test_not_compressed(self):
+        compressor = Compressor(min_size=1024)
+        small = compressor.compress(
+            self.response(b'{"a": 1}'), 'dispatch', accept('gzip'))
+        self.assertNotIn('Content-Encoding', small.headers)
+
+        identity = compressor.compress(
+            self.response(), 'default', accept('identity'))
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertEqual(identity.get_data(), self.data)
+
+        image = self.response()
+        image.mimetype = 'image/png'
+        self.assertNotIn(
+            'Content-Encoding',
+            compressor.compress(image, 'default', accept('gzip')).headers)
+
+    def test_cached_by_etag(self):
+        compressor = Compressor()
+        first = compressor.compress(
+            self.response(etag='abc'), 'layout', accept('gzip'))
+        self.assertEqual(first.headers['ETag'], 'W/"abc"')
+
+        # Another body with the same ETag gets the cached bytes.
+        second = compressor.compress(
+            self.response(b'x' * 2048, etag='abc'), 'layout', accept('gzip'))
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(compressor.stats()['hits'], 1)
+
+    def test_cached_by_content(self):
+        compressor = Compressor()
+        for _ in range(3):
+            compressor.compress(self.response(), 'layout', accept('gzip'))
+        self.assertEqual(compressor.stats()['hits'], 2)
+
+        for _ in range(3):
+            compressor.compress(self.response(), 'dispatch', accept('gzip'))
+        self.assertEqual(compressor.stats()['hits'], 2)
+
+    def test_file_wrapper_left_to_server(self):
+        compressor = Compressor()
+        response = Response(
+            iter([self.data]), mimetype='application/javascript',
+            direct_passthrough=True)
+        response = compressor.compress(response, 'suites', accept('gzip'))
+
+        self.assertTrue(response.direct_passthrough)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(b''.join(response.response), self.data)
+
+    def test_levels(self):
+        compressor = Compressor(levels={'dispatch': 9, 'custom': {'gzip': 2}})
+        self.assertEqual(compressor.levels['dispatch'], {'br': 9, 'gzip': 9})
+        self.assertEqual(compressor.levels['custom']['gzip'], 2)
+        self.assertEqual(compressor.levels['layout']['gzip'], 6)
+
+
+class DecompressBodyTest(unittest.TestCase):
+    data = b'{"state": [' + b', '.join([b'"value"'] * 10000) + b']}'
+
+    def decompress(self, body, encoding, max_size=1024 * 1024):
+        return _compress.decompress_body(
+            io.BytesIO(body), encoding, max_size, chunk_size=1024)
+
+    def test_encodings(self):
+        bodies = {
+            'gzip': _compress._gzip(self.data, 6),
+            'deflate': zlib.compress(self.data),
+        }
+        if _compress.brotli is not None:
+            bodies['br'] = _compress.brotli.compress(self.data)
+        self.assertEqual(sorted(bodies), _compress.request_encodings())
+
+        for encoding, body in bodies.items():
+            self.assertEqual(self.decompress(body, encoding), self.data)
+
+    def test_too_large(self):
+        body = _compress._gzip(b'0' * (1024 * 1024 + 1), 9)
+        with self.assertRaises(RequestEntityTooLarge):
+            self.decompress(body, 'gzip')
+        self.assertEqual(len(self.decompress(body, 'gzip', 2 * 1024 * 1024)),
+                         1024 * 1024 + 1)
+
+    def test_invalid(self):
+        with self.assertRaises(BadRequest):
+            self.decompress(self.data, 'gzip')
+        # Truncated
+        with self.assertRaises(BadRequest):
+            self.decompress(zlib.compress(self.data)[:-10], 'deflate')
+        with self.assertRaises(UnsupportedMediaType):
+            self.decompress(self.data, 'compress')
+
+    def test_ended_without_eof(self):
+        class Python2Decompressor(object):
+            # No `eof` attribute.
+            def __init__(self, decompressor):
+                self.copy = decompressor.copy
+
+        compressed = zlib.compress(self.data)
+        for data, ended in ((compressed, True), (compressed[:-4], False),
+                            (compressed[:-10], False)):
+            decompressor = zlib.decompressobj()
+            decompressor.decompress(data)
+            self.assertEqual(_compress._zlib_ended(
+                Python2Decompressor(decompressor)), ended)
+
+
+class TestCompressedRequests(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app', max_request_body_size=64 * 1024)
+        self.app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+
+        @self.app.callback(Output('output', 'children'),
+                           [Input('input', 'value')])
+        def output(value):
+            return len(value)
+
+        self.client = self.app.server.test_client()
+
+    def dispatch(self, value):
+        body = json.dumps({
+            'output': {'id': 'output', 'property': 'children'},
+            'inputs': [{'id': 'input', 'property': 'value', 'value': value}]
+        }).encode('utf-8')
+        return self.client.post(
+            '/_dash-update-component',
+            data=zlib.compress(body),
+            headers={'Content-Encoding': 'deflate'},
+            content_type='application/json')
+
+    def test_deflate_body(self):
+        response = self.dispatch('x' * 10000)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': 10000}}})
+
+        self.assertEqual(self.dispatch('x' * 100000).status_code, 413)
+
+    def test_advertised(self):
+        self.assertIn('gzip', self.app._config()['request_encodings'])
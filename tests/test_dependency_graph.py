@@ -0,0 +1,45 @@
+import unittest
+
+from dash import exceptions
+from dash._dependency_graph import DependencyGraph
+
+
+class DependencyGraphTest(unittest.TestCase):
+    def setUp(self):
+        # a.value -> b.value -> c.value -> e.value
+        #         \-> d.value ----------/
+        self.graph = DependencyGraph()
+        self.graph.add_callback('b.value', ['b.value'], ['a.value'])
+        self.graph.add_callback('c.value', ['c.value'], ['b.value'])
+        self.graph.add_callback('d.value', ['d.value'], ['a.value'])
+        self.graph.add_callback(
+            'e.value', ['e.value'], ['c.value', 'd.value', 'x.value'])
+
+    def test_layers(self):
+        self.assertEqual(
+            self.graph.layers,
+            [['b.value', 'd.value'], ['c.value'], ['e.value']])
+        self.assertEqual(self.graph.layer('e.value'), 2)
+
+        self.graph.add_callback('f.value', ['f.value'], ['e.value'])
+        self.assertEqual(self.graph.layer('f.value'), 3)
+
+    def test_downstream(self):
+        self.assertEqual(
+            self.graph.downstream(['a.value']),
+            ['b.value', 'd.value', 'c.value', 'e.value'])
+        self.assertEqual(
+            self.graph.downstream(['b.value']), ['c.value', 'e.value'])
+        self.assertEqual(self.graph.downstream(['x.value']), ['e.value'])
+        self.assertEqual(self.graph.downstream(['e.value']), [])
+
+    def test_cycle_detection(self):
+        with self.assertRaises(exceptions.CircularDependencyException) as cm:
+            self.graph.add_callback('a.value', ['a.value'], ['e.value'])
+        self.assertIn('a.value -> d.value -> e.value',
+                      str(cm.exception))
+
+        # The graph is left unchanged.
+        self.assertNotIn('a.value', self.graph)
+        self.assertEqual(len(self.graph), 4)
+        self.assertEqual(self.graph.downstream(['e.value']), [])
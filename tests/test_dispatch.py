@@ -0,0 +1,61 @@
+import json
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output, State
+
+
+class TestJsonPayloads(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app')
+        self.app.layout = Div([
+            dcc.Input(id='input'),
+            Div(id='output-1'),
+            Div(id='output-2')
+        ])
+        self.app.callback(
+            Output('output-1', 'children'),
+            [Input('input', 'value')])(lambda value: value)
+        self.client = self.app.server.test_client()
+
+    def test_dependencies_conditional_get(self):
+        response = self.client.get('/_dash-dependencies')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), [{
+            'output': {'id': 'output-1', 'property': 'children'},
+            'outputs': [{'id': 'output-1', 'property': 'children'}],
+            'inputs': [{'id': 'input', 'property': 'value'}],
+            'state': [],
+            'layer': 0
+        }])
+        etag = response.headers['ETag']
+
+        response = self.client.get(
+            '/_dash-dependencies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        self.app.callback(
+            Output('output-2', 'children'),
+            [Input('input', 'value')],
+            [State('output-1', 'children')])(lambda value, state: value)
+
+        response = self.client.get(
+            '/_dash-dependencies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(
+            sorted(d['layer'] for d in json.loads(response.data)), [0, 0])
+
+    def test_routes_conditional_get(self):
+        response = self.client.get('/_dash-routes')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), self.app.routes)
+
+        response = self.client.get(
+            '/_dash-routes',
+            headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,61 @@
+import unittest
+
+import mock
+from dash_html_components import Div
+
+import dash
+
+
+class TestIndexPreload(unittest.TestCase):
+    def create_app(self, **kwargs):
+        app = dash.Dash(
+            'my-app',
+            external_scripts=[
+                'https://a.com/a.js',
+                {'src': 'https://b.com/b.js', 'crossorigin': 'anonymous'}],
+            external_stylesheets=['https://a.com/a.css'],
+            **kwargs)
+        app.layout = Div()
+        return app
+
+    def test_link_header(self):
+        app = self.create_app()
+        response = app.server.test_client().get('/')
+        self.assertEqual(response.status_code, 200)
+        links = response.headers['Link'].split(', ')
+
+        self.assertEqual(
+            links[0], '<https://a.com/a.css>; rel=preload; as=style')
+        self.assertIn('<https://a.com/a.js>; rel=preload; as=script', links)
+        self.assertIn(
+            '<https://b.com/b.js>; rel=preload; as=script; '
+            'crossorigin=anonymous', links)
+        # The renderer bundle is last, like in the page.
+        self.assertIn('dash_renderer', links[-1])
+        self.assertEqual(
+            len(links), response.data.count(b'<script src=') + 1)
+
+    def test_early_hints(self):
+        hints = []
+        app = self.create_app(preload_headers=False, early_hints=True)
+        response = app.server.test_client().get(
+            '/', environ_base={'wsgi.early_hints': hints.append})
+
+        self.assertNotIn('Link', response.headers)
+        self.assertEqual(len(hints), 1)
+        self.assertEqual(
+            hints[0][0], ('Link', '<https://a.com/a.css>; rel=preload; '
+                                  'as=style'))
+
+        # Without the hook of the server
+        response = app.server.test_client().get('/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_resources_computed_once(self):
+        app = self.create_app(early_hints=True)
+        with mock.patch.object(app, '_script_srcs',
+                               wraps=app._script_srcs) as script_srcs:
+            response = app.server.test_client().get(
+                '/', environ_base={'wsgi.early_hints': lambda headers: None})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(script_srcs.call_count, 1)
@@ -0,0 +1,114 @@
+import json
+import unittest
+
+import mock
+from dash_html_components import Div
+import dash_core_components as dcc
+import dash_renderer
+
+import dash
+from dash.dependencies import Input, Output
+from dash import exceptions
+
+
+class TestMultiOutputs(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(dash_renderer, '__version__', '0.20.0')
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.app = dash.Dash('my-app')
+        self.app.layout = Div([
+            dcc.Input(id='input', value='x'),
+            Div(id='output-1'),
+            Div(id='output-2'),
+            Div(id='output-3')
+        ])
+        self.calls = []
+
+        @self.app.callback(
+            [Output('output-1', 'children'), Output('output-2', 'title')],
+            [Input('input', 'value')])
+        def update(value):
+            self.calls.append(value)
+            return value + '1', value + '2'
+
+        @self.app.callback(
+            Output('output-3', 'children'), [Input('output-2', 'title')])
+        def update_3(title):
+            return title + '3'
+
+        self.client = self.app.server.test_client()
+
+    def dispatch(self, output, **body):
+        body.update({
+            'output': output,
+            'inputs': [{'id': 'input', 'property': 'value', 'value': 'y'}]
+        })
+        return json.loads(self.client.post(
+            '/_dash-update-component',
+            data=json.dumps(body), content_type='application/json').data)
+
+    def test_all_outputs_in_one_response(self):
+        multi_id = '..output-1.children...output-2.title..'
+        self.assertIn(multi_id, self.app.callback_map)
+
+        expected = {
+            'multi': True,
+            'response': {
+                'output-1': {'children': 'y1'},
+                'output-2': {'title': 'y2'}
+            }
+        }
+        self.assertEqual(self.dispatch(multi_id), expected)
+        # A renderer without multi outputs sends the first output.
+        self.assertEqual(
+            self.dispatch({'id': 'output-1', 'property': 'children'}),
+            expected)
+        self.assertEqual(self.calls, ['y', 'y'])
+
+    def test_chained_from_multi_outputs(self):
+        response = self.dispatch(
+            {'id': 'output-1', 'property': 'children'}, chain=True)
+        self.assertEqual(response['response']['output-3'],
+                         {'children': 'y23'})
+
+    def test_dependencies(self):
+        dependencies = json.loads(
+            self.client.get('/_dash-dependencies').data)
+        self.assertEqual(
+            [d['outputs'] for d in dependencies if d['layer'] == 0], [[
+                {'id': 'output-1', 'property': 'children'},
+                {'id': 'output-2', 'property': 'title'}
+            ]])
+
+    def test_output_already_assigned(self):
+        self.assertRaises(
+            exceptions.CantHaveMultipleOutputs,
+            self.app.callback,
+            [Output('output-3', 'title'), Output('output-2', 'title')],
+            [Input('input', 'value')])
+        self.assertRaises(
+            exceptions.CantHaveMultipleOutputs,
+            self.app.callback,
+            [Output('output-3', 'title'), Output('output-3', 'title')],
+            [Input('input', 'value')])
+
+    def test_wrong_number_of_values(self):
+        @self.app.callback(
+            [Output('output-3', 'title'), Output('output-3', 'className')],
+            [Input('input', 'value')])
+        def wrong(value):
+            return [value]
+
+        with self.assertRaises(exceptions.InvalidCallbackReturnValue):
+            wrong('z')
+
+    def test_renderer_without_multi_outputs(self):
+        with mock.patch.object(dash_renderer, '__version__', '0.18.0'):
+            self.assertRaises(
+                exceptions.CantHaveMultipleOutputs,
+                self.app.callback,
+                [Output('output-3', 'title'),
+                 Output('output-3', 'className')],
+                [Input('input', 'value')])
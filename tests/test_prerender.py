@@ -0,0 +1,124 @@
+import json
+import unittest
+
+import plotly
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output, State
+from dash import exceptions
+
+
+class TestPrerenderCallbacks(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app', prerender_callbacks=True,
+                             suppress_callback_exceptions=True)
+        self.app.layout = Div([
+            dcc.Input(id='input', value='x'),
+            Div(Div(id='output-1'), id='wrapper'),
+            Div(id='output-2'),
+            Div(id='output-3'),
+            Div(id='output-4'),
+            Div(id='output-5')
+        ], id='root')
+        self.calls = []
+
+        @self.app.callback(Output('output-1', 'children'),
+                           [Input('input', 'value')])
+        def update_1(value):
+            self.calls.append(value)
+            return value + '1'
+
+        @self.app.callback(Output('output-2', 'children'),
+                           [Input('input', 'value')])
+        def update_2(value):
+            return [Div(value + '2', id='nested')]
+
+        @self.app.callback(Output('output-3', 'children'),
+                           [Input('output-1', 'children')],
+                           [State('input', 'value')])
+        def update_3(children, value):
+            return [children, value, dash.callback_context.inputs]
+
+        @self.app.callback(Output('output-4', 'children'),
+                           [Input('input', 'value')])
+        def update_4(value):
+            raise exceptions.PreventUpdate
+
+        @self.app.callback(Output('output-5', 'children'),
+                           [Input('input', 'value')])
+        def update_5(value):
+            return object()
+
+        @self.app.callback(Output('not-in-layout', 'children'),
+                           [Input('input', 'value')])
+        def update_missing(value):
+            raise AssertionError('Not an initial callback')
+
+        self.client = self.app.server.test_client()
+
+    def test_initial_outputs_in_layout(self):
+        response = self.client.get('/_dash-layout')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.headers['X-Dash-Prerendered']),
+            ['output-1.children', 'output-2.children', 'output-3.children'])
+
+        expected = Div([
+            dcc.Input(id='input', value='x'),
+            Div(Div('x1', id='output-1'), id='wrapper'),
+            Div([Div('x2', id='nested')], id='output-2'),
+            Div(['x1', 'x', {'output-1.children': 'x1'}], id='output-3'),
+            Div(id='output-4'),
+            # Not serializable, left to the renderer.
+            Div(id='output-5')
+        ], id='root')
+        self.assertEqual(
+            json.loads(response.data),
+            json.loads(json.dumps(expected, cls=plotly.utils.PlotlyJSONEncoder)))
+
+        # The app layout is not modified.
+        self.assertIsNone(self.app.layout['output-1'].children)
+        self.assertIsNone(self.app.layout['output-2'].children)
+
+    def dispatch(self, output, inputs, state=()):
+        def values(prop_values):
+            return [{'id': prop_id.split('.')[0],
+                     'property': prop_id.split('.')[1], 'value': value}
+                    for prop_id, value in prop_values]
+
+        output_id, output_property = output.split('.')
+        return json.loads(self.client.post(
+            '/_dash-update-component',
+            data=json.dumps({
+                'output': {'id': output_id, 'property': output_property},
+                'inputs': values(inputs), 'state': values(state)}),
+            content_type='application/json').data)
+
+    def test_initial_requests_get_the_prerendered_responses(self):
+        self.client.get('/_dash-layout')
+        self.assertEqual(self.calls, ['x'])
+
+        # The initial requests of a renderer firing all the callbacks.
+        self.assertEqual(
+            self.dispatch('output-1.children', [('input.value', 'x')]),
+            {'response': {'props': {'children': 'x1'}}})
+        self.assertEqual(
+            self.dispatch('output-3.children',
+                          [('output-1.children', 'x1')],
+                          [('input.value', 'x')]),
+            {'response': {'props': {
+                'children': ['x1', 'x', {'output-1.children': 'x1'}]}}})
+        self.assertEqual(self.calls, ['x'])
+
+        # Each response is used once, the other values run the callback.
+        self.dispatch('output-1.children', [('input.value', 'x')])
+        self.dispatch('output-1.children', [('input.value', 'y')])
+        self.assertEqual(self.calls, ['x', 'x', 'y'])
+
+    def test_other_clients_run_the_callbacks(self):
+        self.client.get('/_dash-layout')
+        self.client = self.app.server.test_client()
+        self.dispatch('output-1.children', [('input.value', 'x')])
+        self.assertEqual(self.calls, ['x', 'x'])
@@ -0,0 +1,123 @@
+import json
+import threading
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Output
+from dash import exceptions
+from dash._push import PushChannel, Subscription, updates_json
+
+
+class SubscriptionTest(unittest.TestCase):
+    def test_latest_values(self):
+        subscription = Subscription()
+        subscription.put('a.children', '1')
+        subscription.put('b.value', '2')
+        subscription.put('a.children', '3')
+
+        self.assertEqual(subscription.get(0),
+                         [('b.value', '2'), ('a.children', '3')])
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual(subscription.get(0), [])
+
+    def test_bounded(self):
+        subscription = Subscription(max_size=2)
+        for i in range(4):
+            subscription.put('p{}.value'.format(i), str(i))
+
+        self.assertEqual(subscription.get(0),
+                         [('p2.value', '2'), ('p3.value', '3')])
+        self.assertEqual(subscription.dropped, 2)
+
+    def test_filtered(self):
+        subscription = Subscription({'a.children'})
+        subscription.put('b.value', '1')
+        subscription.put('a.children', '2')
+        self.assertEqual(subscription.get(0), [('a.children', '2')])
+
+    def test_wait(self):
+        subscription = Subscription()
+        timer = threading.Timer(
+            0.05, subscription.put, ('a.children', '1'))
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertEqual(subscription.get(5), [('a.children', '1')])
+
+
+class PushChannelTest(unittest.TestCase):
+    def test_publish(self):
+        channel = PushChannel(max_queue=10)
+        first = channel.subscribe()
+        second = channel.subscribe({'b.value'})
+
+        channel.publish('a.children', '"x"')
+        channel.publish('a.children', '"y"')
+        channel.publish('b.value', '2')
+        channel.unsubscribe(second)
+        channel.publish('b.value', '3')
+
+        self.assertEqual(first.get(0),
+                         [('a.children', '"y"'), ('b.value', '3')])
+        self.assertEqual(second.get(0), [('b.value', '2')])
+        self.assertEqual(channel.stats(), {
+            'subscribers': 1, 'published': 4, 'dropped': 2})
+
+    def test_updates_json(self):
+        updates = [('a.children', '[1, 2]'), ('b.value', '"x"'),
+                   ('a.title', 'null')]
+        self.assertEqual(json.loads(updates_json(updates)), {
+            'multi': True,
+            'response': {
+                'a': {'children': [1, 2], 'title': None},
+                'b': {'value': 'x'},
+            }
+        })
+
+
+class TestPush(unittest.TestCase):
+    def test_pushed_values(self):
+        app = dash.Dash('my-app', enable_push=True)
+        app.layout = Div([Div(id='a'), dcc.Input(id='b')])
+        client = app.server.test_client()
+
+        response = client.get(
+            '/_dash-push?outputs=a.children,b.value', buffered=False)
+        self.addCleanup(response.close)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = iter(response.response)
+        self.assertEqual(next(events), b'retry: 1000\n\n')
+
+        app.push(Output('a', 'children'), Div('first'))
+        app.push(Output('a', 'children'), Div('second'))
+        app.push('b.value', 3)
+        app.push('c.value', 4)
+
+        event = next(events).decode('utf-8')
+        self.assertTrue(event.startswith('data: '))
+        self.assertEqual(json.loads(event[len('data: '):]), {
+            'multi': True,
+            'response': {
+                'a': {'children': json.loads(
+                    app._serializer.dumps(Div('second')))},
+                'b': {'value': 3},
+            }
+        })
+        self.assertEqual(app.dispatch_stats()['push'], {
+            'subscribers': 1, 'published': 4, 'dropped': 1})
+
+        response.close()
+        self.assertEqual(app.dispatch_stats()['push']['subscribers'], 0)
+        self.assertEqual(app._config()['push_url'], '/_dash-push')
+
+    def test_disabled(self):
+        app = dash.Dash('my-app')
+        app.layout = Div(id='a')
+
+        self.assertEqual(
+            app.server.test_client().get('/_dash-push').status_code, 404)
+        self.assertNotIn('push_url', app._config())
+        with self.assertRaises(exceptions.InvalidConfig):
+            app.push('a.children', 'x')
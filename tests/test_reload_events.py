@@ -0,0 +1,57 @@
+import json
+import os
+import unittest
+
+from dash_html_components import Div
+
+import dash
+
+
+class TestReloadEvents(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app', assets_folder='tests/assets')
+        self.app.layout = Div()
+        self.app._dev_tools.hot_reload = True
+        self.app._reload_hash = 'initial'
+        self.client = self.app.server.test_client()
+
+    def events(self, headers=None):
+        response = self.client.get(
+            '/_reload-events', headers=headers, buffered=False)
+        self.addCleanup(response.close)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        return iter(response.response)
+
+    def read(self, events):
+        event = next(events).decode('utf-8')
+        lines = event.strip().split('\n')
+        return (int(lines[0][len('id: '):]),
+                json.loads(lines[1][len('data: '):]))
+
+    def test_pushed_changes(self):
+        events = self.events()
+        self.assertEqual(next(events), b'retry: 3000\n\n')
+        event_id, event = self.read(events)
+        self.assertEqual(event['reloadHash'], 'initial')
+        self.assertFalse(event['hard'])
+
+        filename = os.path.join(self.app._assets_folder, 'reset.css')
+        self.app._on_assets_change(filename, 1, False)
+        self.assertEqual(self.read(events)[0], event_id + 1)
+
+        self.app._on_assets_change(filename, 2, False)
+        new_id, event = self.read(events)
+        self.assertTrue(event['hard'])
+        self.assertNotEqual(event['reloadHash'], 'initial')
+        self.assertEqual(event['files'][0]['modified'], 2)
+        self.assertTrue(event['files'][0]['is_css'])
+
+        # Reconnected after missing the last change.
+        events = self.events({'Last-Event-ID': str(new_id - 1)})
+        next(events)
+        self.assertEqual(self.read(events), (new_id, event))
+
+    def test_disabled(self):
+        self.app._dev_tools.hot_reload = False
+        self.assertEqual(
+            self.client.get('/_reload-events').status_code, 404)
@@ -3,6 +3,7 @@ import mock
 import dash_core_components as dcc
 
 import dash
+from dash.development.base_component import Component, ComponentRegistry
 
 _monkey_patched_js_dist = [
     {
@@ -38,6 +39,17 @@ class StatMock(object):
     st_mtime = 1
 
 
+class Container(Component):
+    # A component without resources.
+    _namespace = 'test_resources'
+    _type = 'Container'
+    _prop_names = ['children']
+    _valid_wildcard_attributes = []
+
+    def __init__(self, children=None):
+        super(Container, self).__init__(children=children)
+
+
 class Tests(unittest.TestCase):
 
     def test_external(self):
@@ -92,3 +104,81 @@ class Tests(unittest.TestCase):
                 app.registered_paths['dash_core_components']
             )
         )
+
+    def test_infer_from_layout(self):
+        app = dash.Dash(
+            __name__,
+            assets_folder='tests/assets',
+            assets_ignore='load_after.+.js'
+        )
+        app.layout = Container(Container('no dcc'))
+        app.scripts.config.serve_locally = True
+        app.scripts.config.infer_from_layout = True
+        self.addCleanup(
+            setattr, app.scripts.config, 'infer_from_layout', False)
+
+        with mock.patch('dash.dash.os.stat', return_value=StatMock()):
+            with mock.patch('dash.dash.importlib.import_module',
+                            return_value=dcc):
+                resource = app._collect_and_register_resources(
+                    app.scripts.get_all_scripts()
+                )
+                config = app._config()
+
+        self.assertFalse([
+            src for src in resource if 'dash_core_components' in src])
+        self.assertEqual(
+            config['dynamic_scripts']['dash_core_components'][2],
+            '/_dash-component-suites/'
+            'dash_core_components/fake_dcc.js?v=1&m=1')
+        self.assertIn(
+            'fake_dcc.js', app.registered_paths['dash_core_components'])
+
+        app.layout = Container(dcc.Markdown())
+        with mock.patch('dash.dash.os.stat', return_value=StatMock()):
+            with mock.patch('dash.dash.importlib.import_module',
+                            return_value=dcc):
+                resource = app._collect_and_register_resources(
+                    app.scripts.get_all_scripts()
+                )
+        self.assertIn(
+            '/_dash-component-suites/'
+            'dash_core_components/fake_dcc.js?v=1&m=1', resource)
+
+    def test_cached_resources(self):
+        app = dash.Dash(
+            __name__,
+            assets_folder='tests/assets',
+            assets_ignore='load_after.+.js'
+        )
+        app.layout = dcc.Markdown()
+        app.scripts.config.serve_locally = False
+
+        with mock.patch.object(
+                ComponentRegistry, 'get_resources',
+                wraps=ComponentRegistry.get_resources) as get_resources:
+            scripts = app.scripts.get_all_scripts()
+            self.assertEqual(app.scripts.get_all_scripts(), scripts)
+            self.assertEqual(get_resources.call_count, 1)
+
+            app.scripts.get_all_scripts(dev_bundles=True)
+            self.assertEqual(get_resources.call_count, 2)
+
+            app.scripts.append_script({'external_url': 'https://a.js'})
+            self.assertEqual(
+                app.scripts.get_all_scripts(),
+                scripts + [{'external_url': 'https://a.js'}])
+            self.assertEqual(get_resources.call_count, 3)
+
+            ComponentRegistry.generation += 1
+            app.scripts.get_all_scripts()
+            self.assertEqual(get_resources.call_count, 4)
+
+            # The dist of a library replaced after its registration.
+            with mock.patch.object(dcc, '_js_dist', dcc._js_dist + [
+                    {'external_url': 'https://b.js',
+                     'namespace': 'dash_core_components'}]):
+                self.assertIn({'external_url': 'https://b.js',
+                               'namespace': 'dash_core_components'},
+                              app.scripts.get_all_scripts())
+            self.assertEqual(get_resources.call_count, 5)
@@ -0,0 +1,323 @@
+import base64
+import json
+import unittest
+
+import mock
+import plotly
+import dash_html_components as html
+import dash_core_components as dcc
+
+import dash
+from dash import _serialization, exceptions
+
+
+def plotly_dumps(obj):
+    return json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+class CustomJson(html.Div):
+    def to_plotly_json(self):
+        return {'custom': self.id}
+
+
+class SerializationTest(unittest.TestCase):
+    def test_same_output_as_plotly_encoder(self):
+        layout = html.Div([
+            html.H1('Title', id='title', style={'color': 'red'}),
+            dcc.Input(id='input', value=3),
+            html.Div(
+                html.Span(['text', html.B('bold'), 4, None]),
+                **{'data-value': 'x', 'aria-label': 'label'}
+            ),
+            dcc.Graph(id='graph', figure={
+                'data': [{'x': [1, 2, 3], 'y': [1.5, float('nan'), 2]}]
+            }),
+            html.Ul(tuple(html.Li(str(i)) for i in range(3))),
+            html.Div(u'unicodé')
+        ], id='root')
+
+        self.assertEqual(plotly_dumps(layout), _serialization.dumps(layout))
+
+    def test_nan_coerced_to_null(self):
+        encoded = _serialization.dumps(
+            html.Div(id='a', style={'width': float('inf')},
+                     children=[float('nan')]))
+        self.assertEqual(
+            json.loads(encoded)['props'],
+            {'id': 'a', 'style': {'width': None}, 'children': [None]})
+
+    def test_components_nested_in_values(self):
+        value = {'response': {'props': {'children': html.Div(id='x')}}}
+        self.assertEqual(plotly_dumps(value), _serialization.dumps(value))
+
+    def test_overridden_to_plotly_json(self):
+        value = html.Div([CustomJson(id='custom')])
+        self.assertEqual(
+            json.loads(_serialization.dumps(value))['props']['children'],
+            [{'custom': 'custom'}])
+
+    def test_serializer_follows_prop_names_changes(self):
+        c = html.Div('b', id='a')
+        self.assertEqual(
+            c.to_plotly_json()['props'], {'id': 'a', 'children': 'b'})
+
+        c._prop_names = ['id']
+        self.assertEqual(c.to_plotly_json()['props'], {'id': 'a'})
+        self.assertEqual(
+            json.loads(_serialization.dumps(c))['props'], {'id': 'a'})
+
+    def test_unserializable_value_raises(self):
+        with self.assertRaises(TypeError):
+            _serialization.dumps(html.Div(children=object()))
+
+
+class FragmentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = _serialization.FragmentCache(
+            1024 * 1024, min_fragment_size=0)
+        self.serializer = _serialization.Serializer(self.cache)
+
+    def layout(self, title='Title'):
+        return html.Div([
+            html.H1(title, id='title'),
+            dcc.Graph(id='graph', figure={
+                'data': [{'x': list(range(200)), 'y': [1.5, float('nan')]}]
+            }),
+            {'nested': html.Span('span', **{'data-x': 'x'})}
+        ], id='root')
+
+    def test_same_output_as_uncached(self):
+        for _ in range(2):
+            self.assertEqual(
+                _serialization.dumps(self.layout()),
+                self.serializer.dumps(self.layout()))
+
+    def test_unchanged_components_are_reused(self):
+        self.serializer.dumps(self.layout())
+        self.assertEqual(self.cache.hits, 0)
+        # Only the graph holds a large value.
+        self.assertEqual(len(self.cache), 1)
+
+        encoded = self.serializer.dumps(self.layout('Other'))
+        self.assertEqual(encoded, _serialization.dumps(self.layout('Other')))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(len(self.cache), 1)
+
+        graph = dcc.Graph(id='graph', figure={'data': [{'x': [0] * 200}]})
+        self.serializer.dumps(graph)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_small_components_are_not_keyed(self):
+        table = html.Table([
+            html.Tr([html.Td(str(c), style={'color': 'red'})
+                     for c in range(200)])
+        ])
+
+        def key(component):
+            return _serialization._fragment_key(
+                component.to_plotly_json(), 0)
+
+        self.assertEqual(key(table), None)
+        self.assertEqual(key(table.children[0].children[0]), None)
+        self.assertNotEqual(
+            key(dcc.Store(id='store', data={'rows': [[1]] * 100})), None)
+
+        self.serializer.dumps(table)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_prop_names_changes_invalidate(self):
+        def store():
+            return dcc.Store(id='a', data=list(range(200)))
+
+        self.assertEqual(
+            sorted(json.loads(self.serializer.dumps(store()))['props']),
+            ['data', 'id'])
+
+        c = store()
+        c._prop_names = ['id']
+        self.assertEqual(
+            json.loads(self.serializer.dumps(c))['props'], {'id': 'a'})
+
+    def test_small_subtrees_are_not_cached(self):
+        self.cache.min_fragment_size = 1024 * 1024
+        self.serializer.dumps(self.layout())
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_evicted(self):
+        cache = _serialization.FragmentCache(10)
+        cache.put('a', '12345')
+        cache.put('b', '12345')
+        cache.get('a')
+        cache.put('c', '12345')
+        cache.put('d', '12345678901')
+
+        self.assertEqual(cache.size, 10)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), '12345')
+        self.assertEqual(cache.get('c'), '12345')
+        self.assertEqual(cache.get('d'), None)
+
+
+class BinaryArraysTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        self.numpy = numpy
+        self.serializer = _serialization.Serializer(binary_arrays=True)
+
+    def decode(self, encoded):
+        shape = encoded.get('shape')
+        array = self.numpy.frombuffer(
+            base64.b64decode(encoded['bdata']),
+            dtype='<' + encoded['dtype'])
+        if shape:
+            array = array.reshape([int(d) for d in shape.split(', ')])
+        return array
+
+    def test_typed_arrays(self):
+        numpy = self.numpy
+        x = numpy.linspace(0, 1, 100)
+        z = numpy.arange(12, dtype='>i2').reshape(3, 4)
+        graph = dcc.Graph(id='graph', figure={
+            'data': [{'x': x, 'z': z, 'y': numpy.arange(5)}]
+        })
+        trace = json.loads(
+            self.serializer.dumps(graph))['props']['figure']['data'][0]
+
+        self.assertEqual(trace['x']['dtype'], 'f8')
+        self.assertTrue((self.decode(trace['x']) == x).all())
+        self.assertEqual(trace['z']['shape'], '3, 4')
+        self.assertTrue((self.decode(trace['z']) == z).all())
+        # int64 values fitting int32
+        self.assertEqual(trace['y']['dtype'], 'i4')
+
+    def test_plotly_js_version(self):
+        with mock.patch.object(dcc, '_js_dist', [
+                {'relative_package_path': 'plotly-1.44.3.min.js'}]):
+            with self.assertRaises(exceptions.InvalidConfig):
+                dash.Dash('my-app', binary_arrays=True)
+            dash.Dash('my-app')
+
+        with mock.patch.object(dcc, '_js_dist', [
+                {'relative_package_path': 'plotly-2.28.0.min.js'}]):
+            app = dash.Dash('my-app', binary_arrays=True)
+        self.assertTrue(app.config.binary_arrays)
+
+    def test_list_fallback(self):
+        numpy = self.numpy
+        for array in (numpy.array(['a', 'b']),
+                      numpy.array([2 ** 40]),
+                      numpy.array([True, False])):
+            figure = {'data': [{'x': array}]}
+            self.assertEqual(
+                json.loads(self.serializer.dumps(
+                    _serialization.Figure(figure))),
+                {'data': [{'x': array.tolist()}]})
+
+    def test_figure_data_only(self):
+        numpy = self.numpy
+        x = numpy.arange(3.0)
+        # The other props and the layout of the figures keep lists.
+        graph = dcc.Graph(id='graph', figure={
+            'data': [{'x': x}], 'layout': {'xaxis': {'range': x}}})
+        store = dcc.Store(id='store', data=x)
+        props = [c['props'] for c in json.loads(
+            self.serializer.dumps([graph, store]))]
+
+        self.assertEqual(props[0]['figure']['data'][0]['x']['dtype'], 'f8')
+        self.assertEqual(props[0]['figure']['layout'],
+                         {'xaxis': {'range': [0.0, 1.0, 2.0]}})
+        self.assertEqual(props[1]['data'], [0.0, 1.0, 2.0])
+        self.assertEqual(
+            json.loads(self.serializer.dumps([{'figure': {'data': x}}])),
+            [{'figure': {'data': [0.0, 1.0, 2.0]}}])
+
+        # The callbacks outputs are marked by the dispatch.
+        response = json.loads(self.serializer.dumps({'response': {'props': {
+            'figure': _serialization.Figure({'data': [{'x': x}]})}}}))
+        self.assertEqual(
+            self.decode(response['response']['props']['figure']['data'][0]
+                        ['x']).tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(
+            json.loads(_serialization.Serializer().dumps(
+                _serialization.Figure({'data': [{'x': x}]}))),
+            {'data': [{'x': [0.0, 1.0, 2.0]}]})
+
+
+class DataFrameTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            import pandas
+        except ImportError:
+            self.skipTest('pandas is not installed')
+        self.pandas = pandas
+        self.serializer = _serialization.Serializer()
+
+    def test_records(self):
+        df = self.pandas.DataFrame({
+            'a': [1, 2, 3], 'b': [0.5, None, 1.25], 'c': ['x', 'y', 'z']})
+        records = json.loads(self.serializer.dumps(df))
+
+        self.assertEqual(records, [
+            {'a': 1, 'b': 0.5, 'c': 'x'},
+            {'a': 2, 'b': None, 'c': 'y'},
+            {'a': 3, 'b': 1.25, 'c': 'z'},
+        ])
+
+    def test_same_as_records(self):
+        pandas = self.pandas
+        for df in (
+                pandas.DataFrame({
+                    'a': [1, 2], 'b': [0.1, float('nan')], '%s': [-0.0, 1e300],
+                    'c': pandas.Series(['x', None], dtype=object),
+                    'd': [True, False], 'e': pandas.Series([2 ** 63, 1],
+                                                           dtype='uint64')}),
+                # Written as records.
+                pandas.DataFrame({'a': ['x', 1.5]}),
+                pandas.DataFrame({'a': pandas.to_datetime(['2019-03-01'])}),
+                pandas.DataFrame({1: [1]}),
+                pandas.DataFrame({'a': []}),
+                pandas.DataFrame()):
+            self.assertEqual(self.serializer.dumps(df),
+                             self.serializer.dumps(df.to_dict('records')))
+
+    def test_nested(self):
+        df = self.pandas.DataFrame({'a': [0.1, 2.0]})
+        table = dcc.Store(id='store', data={'rows': df, 'count': 2})
+        props = json.loads(self.serializer.dumps([table]))[0]['props']
+
+        self.assertEqual(props['data'], {
+            'rows': df.to_dict('records'), 'count': 2})
+
+    def test_precision(self):
+        df = self.pandas.DataFrame({'a': [0.1 + 0.2, 1 / 3.0]})
+        self.assertEqual(json.loads(self.serializer.dumps(df)),
+                         [{'a': 0.1 + 0.2}, {'a': 1 / 3.0}])
+        # 15 significant digits with the pandas writer.
+        fast = _serialization.Serializer(fast_data_frames=True)
+        self.assertEqual(json.loads(fast.dumps(df)),
+                         [{'a': 0.3}, {'a': 0.333333333333333}])
+
+    def test_dates(self):
+        pandas = self.pandas
+        df = pandas.DataFrame({
+            'naive': pandas.to_datetime(['2019-03-01 10:30', None]),
+            'utc': pandas.to_datetime(
+                ['2019-03-01 10:30', None]).tz_localize('UTC')})
+        for serializer, expected in (
+                (self.serializer, ['2019-03-01T10:30:00',
+                                   '2019-03-01T10:30:00+00:00']),
+                (_serialization.Serializer(fast_data_frames=True),
+                 ['2019-03-01T10:30:00.000', '2019-03-01T10:30:00.000Z'])):
+            self.assertEqual(json.loads(serializer.dumps(df)), [
+                {'naive': expected[0], 'utc': expected[1]},
+                {'naive': None, 'utc': None}])
+
+    def test_duplicate_columns(self):
+        df = self.pandas.DataFrame([[1, 2]], columns=['a', 'a'])
+        for fast in (False, True):
+            with self.assertRaises(exceptions.InvalidCallbackReturnValue):
+                _serialization.Serializer(fast_data_frames=fast).dumps(df)
@@ -0,0 +1,171 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import flask
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output
+from dash._single_flight import SingleFlight, request_key
+
+
+class SingleFlightTest(unittest.TestCase):
+    def run_concurrently(self, single_flights, func, count=5):
+        results = []
+
+        def run(single_flight):
+            try:
+                results.append(single_flight.run('key', func))
+            except ValueError:
+                pass
+
+        threads = [
+            threading.Thread(
+                target=run, args=(single_flights[i % len(single_flights)],))
+            for i in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        return results
+
+    def slow_call(self, calls, result='result'):
+        def func():
+            calls.append(None)
+            time.sleep(0.2)
+            return result
+        return func
+
+    def test_concurrent_calls_share_the_result(self):
+        single_flight = SingleFlight()
+        calls = []
+        results = self.run_concurrently([single_flight], self.slow_call(calls))
+
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.shared, 4)
+
+        # Completed results are not reused.
+        self.assertEqual(
+            single_flight.run('key', self.slow_call(calls)), 'result')
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_calls_are_not_shared(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def func():
+            calls.append(None)
+            time.sleep(0.1)
+            if len(calls) == 1:
+                raise ValueError('failed')
+            return 'result'
+
+        results = self.run_concurrently([single_flight], func, count=3)
+        self.assertEqual(results, ['result', 'result'])
+        self.assertEqual(len(calls), 3)
+
+    def test_lock_dir_shared_between_processes(self):
+        lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_dir)
+
+        # Each SingleFlight stands for the process of a worker.
+        single_flights = [SingleFlight(lock_dir), SingleFlight(lock_dir)]
+        calls = []
+        response = (b'{"response": 1}', 200, 'application/json')
+        results = self.run_concurrently(
+            single_flights, self.slow_call(calls, response), count=4)
+
+        self.assertEqual(results, [response] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sum(s.shared for s in single_flights), 3)
+
+    def test_request_key(self):
+        self.assertEqual(
+            request_key({'output': 'a', 'inputs': [1]}),
+            request_key({'inputs': [1], 'output': 'a'}))
+        self.assertNotEqual(
+            request_key({'output': 'a', 'inputs': [1]}),
+            request_key({'output': 'a', 'inputs': [2]}))
+        self.assertNotEqual(
+            request_key({'output': 'a', 'inputs': [1]}, 'alice'),
+            request_key({'output': 'a', 'inputs': [1]}, 'bob'))
+
+    def test_result_files(self):
+        lock_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_dir)
+        single_flight = SingleFlight(lock_dir)
+        path = os.path.join(lock_dir, 'key')
+
+        for result in (None, (b'\x00data\n', 200, 'application/json')):
+            single_flight._write_result(path, result)
+            self.assertEqual(
+                single_flight._read_result(path, 0), (True, result))
+
+        # Not a result file, read as no result.
+        with open(path + '.result', 'wb') as f:
+            f.write(b'\x80\x04garbage')
+        self.assertEqual(single_flight._read_result(path, 0), (False, None))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app')
+        self.app.layout = Div([
+            dcc.Input(id='input'), Div(id='shared'), Div(id='per-user')])
+        self.calls = []
+        self.release = threading.Event()
+
+        def update(value):
+            self.calls.append(value)
+            self.release.wait(5)
+            return '{} {}'.format(
+                value, flask.request.cookies.get('user'))
+
+        self.app.callback(
+            Output('shared', 'children'), [Input('input', 'value')],
+            single_flight=True)(update)
+        self.app.callback(
+            Output('per-user', 'children'), [Input('input', 'value')],
+            single_flight=lambda: flask.request.cookies.get('user'))(update)
+
+    def dispatch_concurrently(self, output, users):
+        responses = {}
+
+        def post(i, user):
+            client = self.app.server.test_client()
+            client.set_cookie('localhost', 'user', user)
+            response = client.post('/_dash-update-component', data=json.dumps({
+                'output': {'id': output, 'property': 'children'},
+                'inputs': [{'id': 'input', 'property': 'value', 'value': 'x'}]
+            }), content_type='application/json')
+            responses[i] = json.loads(
+                response.data)['response']['props']['children']
+
+        threads = [threading.Thread(target=post, args=(i, user))
+                   for i, user in enumerate(users)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return [responses[i] for i in range(len(users))]
+
+    def test_shared(self):
+        responses = self.dispatch_concurrently('shared', ['a', 'b'])
+        self.assertEqual(responses, ['x a', 'x a'])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_scoped(self):
+        responses = self.dispatch_concurrently('per-user', ['a', 'b', 'a'])
+        self.assertEqual(responses, ['x a', 'x b', 'x a'])
+        self.assertEqual(len(self.calls), 2)
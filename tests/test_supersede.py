@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output
+from dash import exceptions
+from dash._supersede import Supersede
+
+
+class SupersedeTest(unittest.TestCase):
+    def test_newer_request_cancels_older(self):
+        supersede = Supersede()
+        first = supersede.start(('session', 'output'), 1)
+        other = supersede.start(('other-session', 'output'), 1)
+        self.assertFalse(first.cancelled)
+
+        second = supersede.start(('session', 'output'), 2)
+        self.assertTrue(first.cancelled)
+        self.assertFalse(second.cancelled)
+        self.assertFalse(other.cancelled)
+
+        with self.assertRaises(exceptions.CallbackCancelled):
+            first.raise_if_cancelled()
+        second.raise_if_cancelled()
+
+    def test_late_older_request_cancelled(self):
+        supersede = Supersede()
+        latest = supersede.start(('session', 'output'), 3)
+        late = supersede.start(('session', 'output'), 2)
+        self.assertTrue(late.cancelled)
+        self.assertFalse(latest.cancelled)
+
+    def test_max_keys(self):
+        supersede = Supersede(max_keys=2)
+        for output in ('a', 'b', 'c'):
+            supersede.start(('session', output), 5)
+        # The oldest key was evicted, its sequence is not known anymore.
+        self.assertFalse(supersede.start(('session', 'a'), 1).cancelled)
+        self.assertTrue(supersede.start(('session', 'c'), 1).cancelled)
+
+
+class TestSupersededRequests(unittest.TestCase):
+    def setUp(self):
+        self.app = dash.Dash('my-app')
+        self.app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+        self.started = threading.Event()
+        self.calls = []
+
+        @self.app.callback(Output('output', 'children'),
+                           [Input('input', 'value')])
+        def update(value):
+            self.calls.append(value)
+            if value == 'slow':
+                self.started.set()
+                while not dash.callback_context.cancellation.cancelled:
+                    time.sleep(0.01)
+                dash.callback_context.cancellation.raise_if_cancelled()
+            return value
+
+        self.client = self.app.server.test_client()
+
+    def dispatch(self, value, sequence):
+        return self.app.server.test_client().post(
+            '/_dash-update-component',
+            data=json.dumps({
+                'output': {'id': 'output', 'property': 'children'},
+                'inputs': [{'id': 'input', 'property': 'value',
+                            'value': value}],
+                'sessionId': 'session',
+                'sequence': sequence
+            }),
+            content_type='application/json')
+
+    def test_newer_request_cancels_running_one(self):
+        responses = {}
+        slow = threading.Thread(target=lambda: responses.update(
+            slow=self.dispatch('slow', 1)))
+        slow.start()
+        self.assertTrue(self.started.wait(5))
+
+        response = self.dispatch('fast', 2)
+        slow.join(5)
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': 'fast'}}})
+        self.assertEqual(responses['slow'].status_code, 204)
+
+        # An older request arriving late doesn't run.
+        self.assertEqual(self.dispatch('late', 1).status_code, 204)
+        self.assertEqual(self.calls, ['slow', 'fast'])
+
+    def test_invalid_sequence(self):
+        self.assertEqual(self.dispatch('a', '3').status_code, 200)
+        self.assertEqual(self.dispatch('b', 'x').status_code, 400)
+        self.assertEqual(self.dispatch('c', [1]).status_code, 400)
+        self.assertEqual(self.calls, ['a'])
@@ -0,0 +1,77 @@
+import json
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output, State
+
+
+class TestValueHashes(unittest.TestCase):
+    def test_hashes_instead_of_values(self):
+        app = dash.Dash('my-app', value_hashes_size=1024 * 1024)
+        app.layout = Div([
+            dcc.Input(id='input'), Div(id='data'), Div(id='output')])
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'value')],
+                      [State('data', 'title')])
+        def output(value, data):
+            return [value, len(data)]
+
+        def dispatch(data, session='a'):
+            return app.server.test_client().post(
+                '/_dash-update-component',
+                data=json.dumps({
+                    'sessionId': session,
+                    'output': {'id': 'output', 'property': 'children'},
+                    'inputs': [{'id': 'input', 'property': 'value',
+                                'value': 'x'}],
+                    'state': [{'id': 'data', 'property': 'title',
+                               'value': data}]
+                }),
+                content_type='application/json')
+
+        data = ['value {}'.format(i) for i in range(5000)]
+        response = dispatch(data)
+        hashes = json.loads(response.headers['X-Dash-Value-Hashes'])
+        self.assertEqual(list(hashes), ['data.title'])
+
+        response = dispatch({'_dash_hash': hashes['data.title']})
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': ['x', 5000]}}})
+
+        response = dispatch({'_dash_hash': '0' * 40})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.data)['error']['missing'],
+                         ['data.title'])
+        self.assertEqual(
+            app.dispatch_stats()['value_hashes']['hits'], 1)
+
+        # The values of a client aren't sent to the others.
+        for session in ('b', None):
+            response = dispatch(
+                {'_dash_hash': hashes['data.title']}, session)
+            self.assertEqual(response.status_code, 409)
+
+    def test_no_hashes_without_session(self):
+        app = dash.Dash('my-app', value_hashes_size=1024 * 1024)
+        app.layout = Div([dcc.Input(id='input'), Div(id='output')])
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'value')])
+        def output(value):
+            return len(value)
+
+        response = app.server.test_client().post(
+            '/_dash-update-component',
+            data=json.dumps({
+                'output': {'id': 'output', 'property': 'children'},
+                'inputs': [{'id': 'input', 'property': 'value',
+                            'value': 'x' * 20000}]
+            }),
+            content_type='application/json')
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': 20000}}})
+        self.assertNotIn('X-Dash-Value-Hashes', response.headers)
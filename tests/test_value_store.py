@@ -0,0 +1,160 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from dash_html_components import Div
+import dash_core_components as dcc
+
+import dash
+from dash.dependencies import Input, Output, State
+from dash import exceptions
+from dash._value_store import ValueStore
+
+
+class ValueStoreTest(unittest.TestCase):
+    def test_put_and_resolve(self):
+        store = ValueStore()
+        value = {'data': list(range(100))}
+        reference = store.put(value)
+
+        self.assertEqual(list(reference), ['_dash_ref'])
+        self.assertEqual(store.resolve(reference), value)
+        self.assertIsNot(store.resolve(reference), value)
+        self.assertEqual(store.put(dict(value)), reference)
+        self.assertEqual(len(store), 1)
+
+        for not_reference in ('a', {'_dash_ref': 'a', 'b': 1}, None,
+                              {'_dash_ref': 'a'}, {'_dash_ref': [1]}):
+            self.assertEqual(store.resolve(not_reference), not_reference)
+
+    def test_lru_eviction(self):
+        store = ValueStore(max_size=2500)
+        first = store.put('a' * 1000)
+        second = store.put('b' * 1000)
+        store.resolve(first)
+        store.put('c' * 1000)
+
+        self.assertEqual(store.resolve(first), 'a' * 1000)
+        with self.assertRaises(exceptions.ExpiredValueReference):
+            store.resolve(second)
+
+    def test_unsigned_reference(self):
+        store = ValueStore()
+        key = store.put('a')['_dash_ref'].split('.')[0]
+        for value in ({'_dash_ref': '../../etc/passwd'},
+                      {'_dash_ref': key},
+                      {'_dash_ref': '{}.{}'.format(key, '0' * 64)}):
+            self.assertEqual(store.resolve(value), value)
+            with self.assertRaises(exceptions.ExpiredValueReference):
+                store.get(value)
+
+    def test_directory_shared_and_bounded(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        store = ValueStore(max_size=0, directory=directory,
+                           max_disk_size=2500, secret='secret')
+        reference = store.put('a' * 1000)
+        # Another process of the app.
+        other = ValueStore(directory=directory, secret=u'secret')
+        self.assertEqual(other.resolve(reference), 'a' * 1000)
+
+        store.put('b' * 1000)
+        store.put('c' * 1000)
+        self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_secret(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        store = ValueStore(max_size=0, directory=directory, secret='secret')
+        reference = store.put('a')
+        # The keys depend on the secret, not only on the value.
+        self.assertNotEqual(ValueStore().put('a'), reference)
+        # Not signed with the other secret.
+        self.assertEqual(
+            ValueStore(directory=directory, secret='other').resolve(reference),
+            reference)
+
+        # A file not written by the app isn't unpickled.
+        key = reference['_dash_ref'].split('.')[0]
+        with open(os.path.join(directory, key), 'wb') as f:
+            f.write(b'cos\nsystem\n(S"exit 1"\ntR.')
+        with self.assertRaises(exceptions.ExpiredValueReference):
+            store.resolve(reference)
+
+    def test_secret_function(self):
+        secret = {}
+        store = ValueStore(secret=lambda: secret.get('key'))
+        unset = store.put('a')
+        secret['key'] = 'secret'
+        reference = store.put('a')
+
+        self.assertNotEqual(unset, reference)
+        self.assertEqual(ValueStore(secret='secret').put('a'), reference)
+        self.assertEqual(store.resolve(reference), 'a')
+
+
+class TestValueStore(unittest.TestCase):
+    def test_references_resolved_in_dispatch(self):
+        app = dash.Dash('my-app')
+        app.layout = Div([
+            dcc.Input(id='input'), Div(id='store'), Div(id='output')])
+
+        @app.callback(Output('store', 'title'), [Input('input', 'value')])
+        def store(value):
+            return app.value_store.put([value] * 1000)
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'n_submit')],
+                      [State('store', 'title')])
+        def output(n_submit, data):
+            return len(data)
+
+        def dispatch(output, inputs, state=()):
+            return app.server.test_client().post(
+                '/_dash-update-component',
+                data=json.dumps({
+                    'output': output, 'inputs': inputs, 'state': state
+                }),
+                content_type='application/json')
+
+        response = dispatch(
+            {'id': 'store', 'property': 'title'},
+            [{'id': 'input', 'property': 'value', 'value': 'x'}])
+        reference = json.loads(response.data)['response']['props']['title']
+        self.assertEqual(list(reference), ['_dash_ref'])
+
+        response = dispatch(
+            {'id': 'output', 'property': 'children'},
+            [{'id': 'input', 'property': 'n_submit', 'value': 1}],
+            [{'id': 'store', 'property': 'title', 'value': reference}])
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': 1000}}})
+
+        # Not a reference of the store, a value like any other.
+        response = dispatch(
+            {'id': 'output', 'property': 'children'},
+            [{'id': 'input', 'property': 'n_submit', 'value': 1}],
+            [{'id': 'store', 'property': 'title',
+              'value': {'_dash_ref': '0' * 40}}])
+        self.assertEqual(json.loads(response.data),
+                         {'response': {'props': {'children': 1}}})
+
+        app.value_store._values.clear()
+        response = dispatch(
+            {'id': 'output', 'property': 'children'},
+            [{'id': 'input', 'property': 'n_submit', 'value': 1}],
+            [{'id': 'store', 'property': 'title', 'value': reference}])
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(
+            json.loads(response.data)['error']['type'],
+            'ExpiredValueReference')
+
+    def test_secret_key_read_when_used(self):
+        app = dash.Dash('my-app')
+        app.server.secret_key = 'secret'
+        reference = app.value_store.put('a')
+        self.assertEqual(ValueStore(secret='secret').put('a'), reference)
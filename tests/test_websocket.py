@@ -0,0 +1,285 @@
+import json
+import os
+import socket
+import struct
+import threading
+import time
+import unittest
+
+import flask
+import mock
+from dash_html_components import Div
+
+import dash
+from dash import exceptions
+from dash._websocket import (
+    FrameParser, accept_key, asyncio, encode_frame, response_message,
+    OP_BINARY, OP_CLOSE, OP_CONTINUATION, OP_PING, OP_TEXT)
+from dash.dependencies import Input, Output
+
+MASK = b'\x01\x02\x03\x04'
+
+
+def frame(opcode, payload, fin=True):
+    data = bytearray(encode_frame(opcode, payload, MASK))
+    if not fin:
+        data[0] &= 0x7F
+    return bytes(data)
+
+
+@unittest.skipIf(asyncio is None, 'Python 3 only')
+class FrameParserTest(unittest.TestCase):
+    def test_accept_key(self):
+        # The example of RFC 6455
+        self.assertEqual(accept_key('dGhlIHNhbXBsZSBub25jZQ=='),
+                         's3pPLMBiTxaQ9kYGzzhZRbK+xOo=')
+
+    def test_messages(self):
+        parser = FrameParser(1024 * 1024)
+        large = os.urandom(70000)
+        data = (frame(OP_TEXT, b'hello') + frame(OP_BINARY, large) +
+                frame(OP_TEXT, b'x' * 300))
+        messages = []
+        # Received in any chunks.
+        for i in range(0, len(data), 7):
+            messages.extend(parser.feed(data[i:i + 7]))
+        self.assertEqual(messages, [
+            (OP_TEXT, b'hello'), (OP_BINARY, large), (OP_TEXT, b'x' * 300)])
+
+    def test_fragmented(self):
+        parser = FrameParser(1024)
+        self.assertEqual(parser.feed(
+            frame(OP_TEXT, b'ab', fin=False) + frame(OP_PING, b'p') +
+            frame(OP_CONTINUATION, b'cd', fin=False) +
+            frame(OP_CONTINUATION, b'ef')
+        ), [(OP_PING, b'p'), (OP_TEXT, b'abcdef')])
+
+    def test_invalid(self):
+        with self.assertRaises(exceptions.WebSocketProtocolError) as cm:
+            FrameParser(1024).feed(encode_frame(OP_TEXT, b'unmasked'))
+        self.assertEqual(cm.exception.code, 1002)
+
+        with self.assertRaises(exceptions.WebSocketProtocolError) as cm:
+            FrameParser(1024).feed(frame(OP_CONTINUATION, b'a'))
+        self.assertEqual(cm.exception.code, 1002)
+
+        # Rejected from the header, before the payload is received.
+        with self.assertRaises(exceptions.WebSocketProtocolError) as cm:
+            FrameParser(1024).feed(frame(OP_TEXT, b'a' * 1025)[:8])
+        self.assertEqual(cm.exception.code, 1009)
+
+        parser = FrameParser(1024)
+        parser.feed(frame(OP_TEXT, b'a' * 1000, fin=False))
+        with self.assertRaises(exceptions.WebSocketProtocolError) as cm:
+            parser.feed(frame(OP_CONTINUATION, b'a' * 100))
+        self.assertEqual(cm.exception.code, 1009)
+
+    def test_response_message(self):
+        message = response_message(
+            3, 200,
+            [('Content-Type', 'application/json'), ('Content-Length', '9'),
+             ('X-Dash-Value-Hashes', '{}')],
+            b'{"a": 1}')
+        self.assertEqual(json.loads(message), {
+            'id': 3, 'status': 200, 'headers': {'X-Dash-Value-Hashes': '{}'},
+            'response': {'a': 1}})
+
+        self.assertEqual(json.loads(response_message(
+            'x', 503, [('Content-Type', 'text/html')], b'Overloaded')),
+            {'id': 'x', 'status': 503, 'headers': {},
+             'response': 'Overloaded'})
+        self.assertIsNone(
+            json.loads(response_message(4, 204, [], b''))['response'])
+
+
+class Client(object):
+    def __init__(self, port, path='/_dash-ws', headers=''):
+        self.sock = socket.create_connection(('127.0.0.1', port), 5)
+        self.sock.sendall((
+            'GET {} HTTP/1.1\r\n'
+            'Host: 127.0.0.1:{}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            'Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n'
+            'Sec-WebSocket-Version: 13\r\n'
+            '{}\r\n').format(path, port, headers).encode('latin-1'))
+        self.buffer = b''
+        head = self.read_until(b'\r\n\r\n').decode('latin-1')
+        self.status = int(head.split(' ')[1])
+
+    def read(self, size):
+        while len(self.buffer) < size:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError()
+            self.buffer += data
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def read_until(self, separator):
+        while separator not in self.buffer:
+            self.buffer += self.sock.recv(65536)
+        head, self.buffer = self.buffer.split(separator, 1)
+        return head
+
+    def receive(self):
+        opcode, length = bytearray(self.read(2))
+        length &= 0x7F
+        if length == 126:
+            length, = struct.unpack('!H', self.read(2))
+        elif length == 127:
+            length, = struct.unpack('!Q', self.read(8))
+        return opcode & 0x0F, self.read(length)
+
+    def request(self, request_id, body):
+        self.sock.sendall(frame(OP_TEXT, json.dumps(
+            {'id': request_id, 'request': body}).encode('utf-8')))
+
+    def response(self):
+        _, payload = self.receive()
+        return json.loads(payload.decode('utf-8'))
+
+    def close(self):
+        self.sock.close()
+
+
+def callback_body(output, value):
+    return {
+        'output': {'id': output, 'property': 'children'},
+        'inputs': [
+            {'id': 'input', 'property': 'n_clicks', 'value': value}],
+    }
+
+
+@unittest.skipIf(asyncio is None, 'Python 3 only')
+class WebSocketServerTest(unittest.TestCase):
+    def setUp(self):
+        app = dash.Dash(__name__)
+        app.layout = Div([Div(id='input'), Div(id='slow'), Div(id='fast')])
+        released = threading.Event()
+
+        @app.callback(Output('slow', 'children'),
+                      [Input('input', 'n_clicks')])
+        def slow(value):
+            released.wait(5)
+            return 'slow {}'.format(value)
+
+        @app.callback(Output('fast', 'children'),
+                      [Input('input', 'n_clicks')])
+        def fast(value):
+            if value is None:
+                raise exceptions.PreventUpdate()
+            released.set()
+            return '{} {}'.format(value, flask.request.cookies.get('user'))
+
+        self.app = app
+        self.server = app.start_websocket_server(port=0)
+        self.addCleanup(self.server.stop)
+
+    def test_dispatch(self):
+        client = Client(self.server.port, headers='Cookie: user=alice\r\n')
+        self.addCleanup(client.close)
+        self.assertEqual(client.status, 101)
+
+        client.request(1, callback_body('slow', 'a'))
+        client.request('two', callback_body('fast', 'b'))
+        client.request(3, callback_body('fast', None))
+
+        # The fast callback completes first.
+        responses = [client.response() for _ in range(3)]
+        self.assertEqual(sorted(r['status'] for r in responses),
+                         [200, 200, 204])
+        by_id = {r['id']: r for r in responses}
+        self.assertEqual(by_id['two']['response'],
+                         {'response': {'props': {'children': 'b alice'}}})
+        self.assertEqual(by_id[1]['response'],
+                         {'response': {'props': {'children': 'slow a'}}})
+        self.assertIsNone(by_id[3]['response'])
+        self.assertLess(
+            [r['id'] for r in responses].index('two'),
+            [r['id'] for r in responses].index(1))
+
+        client.sock.sendall(frame(OP_PING, b'ping'))
+        self.assertEqual(client.receive(), (0xA, b'ping'))
+        client.sock.sendall(frame(OP_TEXT, b'not json'))
+        self.assertEqual(client.response()['status'], 400)
+
+        self.assertEqual(self.app.dispatch_stats()['websocket'], {
+            'connections': 1, 'messages': 3, 'errors': 0})
+        self.assertEqual(
+            self.app._config()['websocket_url'],
+            'ws://127.0.0.1:{}/_dash-ws'.format(self.server.port))
+
+        client.sock.sendall(frame(OP_CLOSE, struct.pack('!H', 1000)))
+        self.assertEqual(client.receive(),
+                         (OP_CLOSE, struct.pack('!H', 1000)))
+
+    def test_without_wsgi_app(self):
+        client = Client(self.server.port)
+        self.addCleanup(client.close)
+
+        with mock.patch.object(self.app.server, 'wsgi_app',
+                               side_effect=AssertionError):
+            client.request(1, callback_body('fast', 'a'))
+            self.assertEqual(client.response()['response'],
+                             {'response': {'props': {'children': 'a None'}}})
+
+            # The HTTP errors of the dispatch.
+            client.request(2, dict(callback_body('fast', 'a'),
+                                   sessionId='s', sequence='x'))
+            self.assertEqual(client.response()['status'], 400)
+            client.request(3, ['not', 'an', 'object'])
+            self.assertEqual(client.response()['status'], 400)
+
+    def test_rejected(self):
+        for path, headers, status in (
+                ('/_dash-ws', 'Origin: http://127.0.0.1:8050\r\n', 101),
+                ('/_dash-ws', 'Origin: http://evil.com\r\n', 403),
+                ('/other', '', 404)):
+            client = Client(self.server.port, path, headers)
+            self.addCleanup(client.close)
+            self.assertEqual(client.status, status)
+
+    def test_websocket_url(self):
+        self.app.config.websocket_url = 'wss://example.com/_dash-ws'
+        self.assertEqual(self.app._config()['websocket_url'],
+                         'wss://example.com/_dash-ws')
+
+
+@unittest.skipIf(asyncio is None, 'Python 3 only')
+class InFlightTest(unittest.TestCase):
+    def test_max_in_flight(self):
+        app = dash.Dash(__name__)
+        app.layout = Div([Div(id='input'), Div(id='output')])
+        lock = threading.Lock()
+        running = []
+        concurrency = []
+
+        @app.callback(Output('output', 'children'),
+                      [Input('input', 'n_clicks')])
+        def update(value):
+            with lock:
+                running.append(value)
+                concurrency.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(value)
+            return value
+
+        server = app.start_websocket_server(port=0, max_in_flight=2)
+        self.addCleanup(server.stop)
+        client = Client(server.port)
+        self.addCleanup(client.close)
+
+        # Sent at once, the connection isn't read over 2 running requests.
+        client.sock.sendall(b''.join(
+            frame(OP_TEXT, json.dumps({
+                'id': i, 'request': callback_body('output', i)
+            }).encode('utf-8'))
+            for i in range(6)))
+        responses = [client.response() for _ in range(6)]
+
+        self.assertEqual(sorted(r['id'] for r in responses), list(range(6)))
+        self.assertEqual(max(concurrency), 2)
+        self.assertEqual(
+            server.stats(), {'connections': 1, 'messages': 6, 'errors': 0})